@@ -1,41 +1,53 @@
+import argparse
 import sys
+from pathlib import Path
 
-stats = {
-    16: {'s': 0, 'r': 0, 'd': 0}, 
-    32: {'s': 0, 'r': 0, 'd': 0}, 
-    512: {'s': 0, 'r': 0, 'd': 0}, 
-    'total': {'s': 0, 'r': 0, 'd': 0}
-}
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from traffic.io.ns2_trace import DROP, ENQUEUE, RECEIVE
+from traffic.ns2_analytics import analyze_ns2_trace
+
+parser = argparse.ArgumentParser(
+    description="Per-flow sent/received/dropped counts for an ns-2 trace."
+)
+parser.add_argument("trace", nargs="?", default="udp.tr", help="ns-2 trace file.")
+parser.add_argument("--type", default="cbr", help="Packet type to count.")
+parser.add_argument(
+    "--sources", type=int, nargs="+", default=[0, 1, 2], help="Nodes whose enqueues count as sent."
+)
+parser.add_argument(
+    "--sink", type=int, nargs="+", default=[5], help="Nodes whose receives count as received."
+)
+parser.add_argument(
+    "--flows",
+    type=int,
+    nargs="+",
+    default=[16, 32, 512],
+    help="Flow ids to report, even when a count is zero. The total covers every flow of --type.",
+)
+args = parser.parse_args()
 
 try:
-    with open('udp.tr', 'r') as f:
-        for line in f:
-            p = line.split()
-            if len(p) < 8 or p[4] != 'cbr': 
-                continue
-            
-            ev = p[0]
-            src = p[2]
-            dst = p[3]
-            fid = int(p[7]) 
-            
-            if ev == '+' and src in ['0', '1', '2']: 
-                if fid in stats: stats[fid]['s'] += 1
-                stats['total']['s'] += 1
-            elif ev == 'r' and dst == '5': 
-                if fid in stats: stats[fid]['r'] += 1
-                stats['total']['r'] += 1
-            elif ev == 'd': 
-                if fid in stats: stats[fid]['d'] += 1
-                stats['total']['d'] += 1
+    analytics = analyze_ns2_trace(Path(args.trace))
 except FileNotFoundError:
-    print("Error: udp.tr not found. Run the ns simulation first.")
+    print(f"Error: {args.trace} not found. Run the ns simulation first.")
     sys.exit(1)
 
-for k in [16, 32, 512, 'total']:
-    s = stats[k]['s']
-    r = stats[k]['r']
-    d = stats[k]['d']
+if args.type in analytics.packet_types:
+    table = analytics.flow_links.where(packet_type=analytics.packet_type_code(args.type))
+else:
+    table = analytics.flow_links.where(packet_type=[])
+sent = table.where(from_node=args.sources).group_by("flow_id")
+received = table.where(to_node=args.sink).group_by("flow_id")
+dropped = table.group_by("flow_id")
+
+for k in args.flows + ['total']:
+    if k == 'total':
+        s, r, d = sent.total(ENQUEUE), received.total(RECEIVE), dropped.total(DROP)
+    else:
+        s = sent.counts(k)['enqueue']
+        r = received.counts(k)['receive']
+        d = dropped.counts(k)['drop']
     ratio = (r / s) if s > 0 else 0.0
-    name = f"cbr_{k}" if k != 'total' else "cbr_total"
-    print(f"{name} s:{s} r:{r}, r/s Ratio:{ratio:.4f}, d:{d}")
\ No newline at end of file
+    name = f"{args.type}_{k}"
+    print(f"{name} s:{s} r:{r}, r/s Ratio:{ratio:.4f}, d:{d}")
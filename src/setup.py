@@ -15,4 +15,9 @@ setup(
         "matplotlib",
     ],
     python_requires=">=3.8",
+    entry_points={
+        "console_scripts": [
+            "traffic=traffic.cli:main",
+        ],
+    },
 )
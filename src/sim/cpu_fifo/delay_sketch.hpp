@@ -0,0 +1,128 @@
+#pragma once
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <limits>
+#include <stdexcept>
+#include <vector>
+
+namespace sim::cpu_fifo
+{
+
+    // Fixed-memory, mergeable quantile sketch over non-negative integer delays. Same bucket
+    // layout as traffic.sim.sketch.QuantileSketch: values below 2^significant_bits are exact,
+    // above that each power of two is split into 2^(significant_bits - 1) buckets, so a
+    // reported quantile is within 2^-significant_bits of the true value.
+    class DelaySketch
+    {
+    public:
+        explicit DelaySketch(int significant_bits = 7)
+            : significant_bits_(checked_significant_bits(significant_bits)),
+              exact_limit_(std::int64_t{1} << significant_bits_),
+              half_(exact_limit_ >> 1),
+              counts_(static_cast<std::size_t>(exact_limit_ + (63 - significant_bits_) * half_), 0)
+        {
+        }
+
+        void record(std::int64_t value)
+        {
+            if (value < 0)
+            {
+                throw std::invalid_argument("DelaySketch only records values >= 0");
+            }
+            ++counts_[bucket_index(value)];
+            ++count_;
+            min_ = std::min(min_, value);
+            max_ = std::max(max_, value);
+        }
+
+        void merge(const DelaySketch &other)
+        {
+            if (other.significant_bits_ != significant_bits_)
+            {
+                throw std::invalid_argument("Cannot merge sketches with different significant_bits");
+            }
+            for (std::size_t i = 0; i < counts_.size(); ++i)
+            {
+                counts_[i] += other.counts_[i];
+            }
+            count_ += other.count_;
+            min_ = std::min(min_, other.min_);
+            max_ = std::max(max_, other.max_);
+        }
+
+        // Nearest-rank quantile, q in [0, 1]; 0 for an empty sketch.
+        double quantile(double q) const
+        {
+            if (count_ == 0)
+            {
+                return 0.0;
+            }
+            const auto rank = std::max<std::uint64_t>(
+                1, static_cast<std::uint64_t>(std::ceil(q * static_cast<double>(count_))));
+            std::uint64_t seen = 0;
+            for (std::size_t i = 0; i < counts_.size(); ++i)
+            {
+                seen += counts_[i];
+                if (seen >= rank)
+                {
+                    const double midpoint = bucket_midpoint(static_cast<std::int64_t>(i));
+                    return std::clamp(midpoint, static_cast<double>(min_), static_cast<double>(max_));
+                }
+            }
+            return static_cast<double>(max_);
+        }
+
+        std::uint64_t count() const { return count_; }
+
+    private:
+        // Runs first in the initializer list, before any shift uses the value.
+        static int checked_significant_bits(int significant_bits)
+        {
+            if (significant_bits < 1 || significant_bits > 16)
+            {
+                throw std::invalid_argument("significant_bits must be between 1 and 16");
+            }
+            return significant_bits;
+        }
+
+        std::size_t bucket_index(std::int64_t value) const
+        {
+            if (value < exact_limit_)
+            {
+                return static_cast<std::size_t>(value);
+            }
+            int bit_length = 0;
+            for (auto v = static_cast<std::uint64_t>(value); v != 0; v >>= 1)
+            {
+                ++bit_length;
+            }
+            const int shift = bit_length - significant_bits_;
+            const std::int64_t sub_bucket = value >> shift;
+            return static_cast<std::size_t>(exact_limit_ + (shift - 1) * half_ + (sub_bucket - half_));
+        }
+
+        double bucket_midpoint(std::int64_t index) const
+        {
+            if (index < exact_limit_)
+            {
+                return static_cast<double>(index);
+            }
+            const std::int64_t log_index = index - exact_limit_;
+            const int shift = static_cast<int>(log_index / half_) + 1;
+            const double low = static_cast<double>((half_ + log_index % half_) << shift);
+            const double width = static_cast<double>(std::int64_t{1} << shift);
+            return low + (width - 1.0) / 2.0;
+        }
+
+        int significant_bits_;
+        std::int64_t exact_limit_;
+        std::int64_t half_;
+        std::vector<std::uint64_t> counts_;
+        std::uint64_t count_ = 0;
+        std::int64_t min_ = std::numeric_limits<std::int64_t>::max();
+        std::int64_t max_ = std::numeric_limits<std::int64_t>::min();
+    };
+
+} // namespace sim::cpu_fifo
@@ -0,0 +1,179 @@
+#include "trace_bin.hpp"
+
+#include <array>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace sim::cpu_fifo::trace_bin
+{
+
+    namespace
+    {
+
+        constexpr char kMagic[8] = {'T', 'R', 'F', 'T', 'R', 'A', 'C', 'E'};
+        constexpr std::uint16_t kVersion = 1;
+        constexpr std::size_t kHeaderSize = 56;
+        constexpr std::size_t kColumnEntrySize = 44;
+        constexpr std::size_t kColumnNameSize = 32;
+        constexpr std::size_t kColumnDtypeSize = 4;
+
+        struct ColumnSpec
+        {
+            const char *name;
+            const char *dtype;
+        };
+
+        constexpr std::array<ColumnSpec, 7> kExpectedColumns = {{
+            {"packet_start_us", "<i8"},
+            {"wave_id", "<u4"},
+            {"sender_id", "<u4"},
+            {"packet_index_for_sender", "<u4"},
+            {"packet_size_bytes", "<u4"},
+            {"traffic_class", "|u1"},
+            {"priority_tag", "|u1"},
+        }};
+
+        template <typename T>
+        T read_le(const unsigned char *bytes)
+        {
+            T value = 0;
+            for (std::size_t i = 0; i < sizeof(T); ++i)
+            {
+                value |= static_cast<T>(bytes[i]) << (8 * i);
+            }
+            return value;
+        }
+
+        std::string trim_nul(const unsigned char *bytes, std::size_t size)
+        {
+            std::size_t length = 0;
+            while (length < size && bytes[length] != '\0')
+            {
+                ++length;
+            }
+            return std::string(reinterpret_cast<const char *>(bytes), length);
+        }
+
+        template <typename T>
+        std::vector<T> read_column(std::ifstream &file, std::uint64_t offset, std::uint64_t rows)
+        {
+            std::vector<unsigned char> raw(rows * sizeof(T));
+            file.seekg(static_cast<std::streamoff>(offset));
+            file.read(reinterpret_cast<char *>(raw.data()), static_cast<std::streamsize>(raw.size()));
+            if (!file)
+            {
+                throw std::runtime_error("Truncated binary trace column data");
+            }
+            std::vector<T> column(rows);
+            for (std::uint64_t i = 0; i < rows; ++i)
+            {
+                column[i] = read_le<T>(raw.data() + i * sizeof(T));
+            }
+            return column;
+        }
+
+    } // namespace
+
+    trace_csv::TraceReadResult read_trace_bin(const std::string &path, bool enforce_sorted_timestamps)
+    {
+        std::ifstream file(path, std::ios::binary);
+        if (!file.is_open())
+        {
+            throw std::runtime_error("Failed to open binary trace: " + path);
+        }
+
+        std::array<unsigned char, kHeaderSize> header{};
+        file.read(reinterpret_cast<char *>(header.data()), header.size());
+        if (!file)
+        {
+            throw std::runtime_error("Truncated binary trace header: " + path);
+        }
+        if (std::memcmp(header.data(), kMagic, sizeof(kMagic)) != 0)
+        {
+            throw std::runtime_error("Not a binary traffic trace (bad magic): " + path);
+        }
+        const auto version = read_le<std::uint16_t>(header.data() + 8);
+        if (version != kVersion)
+        {
+            throw std::runtime_error(
+                "Unsupported binary trace version " + std::to_string(version) +
+                "; expected " + std::to_string(kVersion));
+        }
+        const auto column_count = read_le<std::uint16_t>(header.data() + 10);
+        const auto rows = read_le<std::uint64_t>(header.data() + 16);
+        if (column_count != kExpectedColumns.size())
+        {
+            throw std::runtime_error(
+                "Invalid binary trace column count. Expected " +
+                std::to_string(kExpectedColumns.size()) + ", got " + std::to_string(column_count));
+        }
+
+        std::vector<unsigned char> table(kColumnEntrySize * column_count);
+        file.read(reinterpret_cast<char *>(table.data()), static_cast<std::streamsize>(table.size()));
+        if (!file)
+        {
+            throw std::runtime_error("Truncated binary trace column table: " + path);
+        }
+
+        std::array<std::uint64_t, kExpectedColumns.size()> offsets{};
+        for (std::size_t i = 0; i < kExpectedColumns.size(); ++i)
+        {
+            const unsigned char *entry = table.data() + i * kColumnEntrySize;
+            const std::string name = trim_nul(entry, kColumnNameSize);
+            const std::string dtype = trim_nul(entry + kColumnNameSize, kColumnDtypeSize);
+            if (name != kExpectedColumns[i].name || dtype != kExpectedColumns[i].dtype)
+            {
+                throw std::runtime_error(
+                    "Invalid binary trace column at index " + std::to_string(i) +
+                    ". Expected '" + std::string(kExpectedColumns[i].name) + "' " +
+                    kExpectedColumns[i].dtype + ", got '" + name + "' " + dtype);
+            }
+            offsets[i] = read_le<std::uint64_t>(entry + kColumnNameSize + kColumnDtypeSize);
+        }
+
+        const auto packet_start_us = read_column<std::uint64_t>(file, offsets[0], rows);
+        const auto wave_id = read_column<std::uint32_t>(file, offsets[1], rows);
+        const auto sender_id = read_column<std::uint32_t>(file, offsets[2], rows);
+        const auto packet_index_for_sender = read_column<std::uint32_t>(file, offsets[3], rows);
+        const auto packet_size_bytes = read_column<std::uint32_t>(file, offsets[4], rows);
+        const auto traffic_class = read_column<std::uint8_t>(file, offsets[5], rows);
+        const auto priority_tag = read_column<std::uint8_t>(file, offsets[6], rows);
+
+        trace_csv::TraceReadResult result{};
+        result.packets.resize(rows);
+        for (std::uint64_t i = 0; i < rows; ++i)
+        {
+            Packet &packet = result.packets[i];
+            packet.packet_start_us = static_cast<std::int64_t>(packet_start_us[i]);
+            packet.wave_id = wave_id[i];
+            packet.sender_id = sender_id[i];
+            packet.packet_index_for_sender = packet_index_for_sender[i];
+            packet.packet_size_bytes = packet_size_bytes[i];
+            if (traffic_class[i] > static_cast<std::uint8_t>(TrafficClass::Control))
+            {
+                throw std::runtime_error(
+                    "Invalid traffic_class code at row " + std::to_string(i) + ": " +
+                    std::to_string(traffic_class[i]));
+            }
+            packet.traffic_class = static_cast<TrafficClass>(traffic_class[i]);
+            packet.priority_tag = priority_tag[i];
+
+            if (enforce_sorted_timestamps && i > 0 &&
+                packet.packet_start_us < result.packets[i - 1].packet_start_us)
+            {
+                throw std::runtime_error(
+                    "packet_start_us is not non-decreasing at row " + std::to_string(i) +
+                    ". Previous=" + std::to_string(result.packets[i - 1].packet_start_us) +
+                    ", current=" + std::to_string(packet.packet_start_us));
+            }
+        }
+        result.row_count = rows;
+
+        return result;
+    }
+
+} // namespace sim::cpu_fifo::trace_bin
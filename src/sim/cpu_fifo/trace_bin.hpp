@@ -0,0 +1,16 @@
+#pragma once
+
+#include <string>
+
+#include "trace_csv.hpp"
+
+namespace sim::cpu_fifo::trace_bin
+{
+
+    // Reads the fixed-width little-endian format written by traffic.io.binary_trace.
+    // Columns are read in bulk; no per-field text parsing is involved.
+    trace_csv::TraceReadResult read_trace_bin(
+        const std::string &path,
+        bool enforce_sorted_timestamps = true);
+
+} // namespace sim::cpu_fifo::trace_bin
@@ -1,7 +1,8 @@
 #pragma once // Prevents multiple inclusions of the same header file. Modern version of #ifndef/#define/#endif
 
 #include <cstdint> // fixed-width integer types with guaranteed sizes.
-#include <vector>
+
+#include "delay_sketch.hpp"
 
 namespace sim::cpu_fifo
 {
@@ -33,9 +34,10 @@ namespace sim::cpu_fifo
         std::uint64_t dropped_bytes = 0;
         std::uint64_t transmitted_bytes = 0;
 
-        std::vector<std::int64_t> queue_delay_us_all;
-        std::vector<std::int64_t> queue_delay_us_control;
-        std::vector<std::int64_t> queue_delay_us_bulk;
+        // Fixed-size sketches instead of one entry per packet; see delay_sketch.hpp.
+        DelaySketch queue_delay_us_all;
+        DelaySketch queue_delay_us_control;
+        DelaySketch queue_delay_us_bulk;
     };
 
 } // namespace sim::cpu_fifo
@@ -0,0 +1,143 @@
+"""Per-wave summaries and offered-load pyramids of generated traffic, cached as .npz files."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from .columnar import TrafficLike, as_batch
+from .config import TrafficConfig, config_fingerprint
+from .generator import GENERATOR_VERSION, generate_traffic_batch
+from .load_pyramid import LoadPyramid, build_load_pyramid
+
+
+DEFAULT_SUMMARY_DIR = Path("src/data/summaries")
+# Bump when TrafficSummary gains or changes arrays so older cached summaries are rebuilt.
+SUMMARY_VERSION = "2"
+
+TIMELINE_ZOOM_WAVES = 3
+
+
+@dataclass(frozen=True, eq=False)
+class TrafficSummary:
+    """
+    Everything the sanity plots need, computed once from a trace.
+
+    wave_packet_counts / wave_control_counts are indexed by wave_id. first_packet_* hold one
+    entry per (wave, sender) first packet, with offsets relative to the earliest sender of
+    the same wave. load_* is the finest level of the trace's LoadPyramid (see load_pyramid()),
+    so timelines can be drawn for any window at a resolution that suits it.
+    """
+
+    wave_packet_counts: np.ndarray
+    wave_control_counts: np.ndarray
+    first_packet_wave_ids: np.ndarray
+    first_packet_offsets_us: np.ndarray
+    load_origin_us: np.ndarray
+    load_bin_widths_us: np.ndarray
+    load_packets: np.ndarray
+    load_bytes: np.ndarray
+
+    def load_pyramid(self) -> LoadPyramid:
+        return LoadPyramid.from_finest(
+            self.load_origin_us, self.load_bin_widths_us, self.load_packets, self.load_bytes
+        )
+
+    def control_ratio_by_wave(self) -> np.ndarray:
+        return np.divide(
+            self.wave_control_counts,
+            self.wave_packet_counts,
+            out=np.zeros(self.wave_packet_counts.shape, dtype=float),
+            where=self.wave_packet_counts > 0,
+        )
+
+
+def summarize_traffic(events: TrafficLike, config: TrafficConfig) -> TrafficSummary:
+    """Reduce a trace to a TrafficSummary with bincount passes over its columns."""
+    batch = as_batch(events)
+    wave_ids = batch.wave_id.astype(np.int64)
+    packet_start_us = batch.packet_start_us
+
+    wave_packet_counts = np.bincount(wave_ids, minlength=config.number_of_waves)
+    wave_control_counts = np.bincount(
+        wave_ids[batch.is_control()], minlength=config.number_of_waves
+    )
+
+    is_first_packet = batch.packet_index_for_sender == 0
+    first_packet_wave_ids = wave_ids[is_first_packet]
+    first_packet_start_us = packet_start_us[is_first_packet]
+    wave_base_start = np.full(
+        wave_packet_counts.shape[0], np.iinfo(np.int64).max, dtype=np.int64
+    )
+    np.minimum.at(wave_base_start, first_packet_wave_ids, first_packet_start_us)
+    first_packet_offsets_us = first_packet_start_us - wave_base_start[first_packet_wave_ids]
+
+    pyramid = build_load_pyramid(batch, config)
+
+    return TrafficSummary(
+        wave_packet_counts=wave_packet_counts,
+        wave_control_counts=wave_control_counts,
+        first_packet_wave_ids=first_packet_wave_ids,
+        first_packet_offsets_us=first_packet_offsets_us,
+        load_origin_us=np.int64(pyramid.origin_us),
+        load_bin_widths_us=np.asarray(pyramid.bin_widths_us, dtype=np.int64),
+        load_packets=pyramid.packets[0],
+        load_bytes=pyramid.bytes[0],
+    )
+
+
+def summary_path(config: TrafficConfig, summary_dir: Path = DEFAULT_SUMMARY_DIR) -> Path:
+    payload = f"{config_fingerprint(config)}:{GENERATOR_VERSION}:{SUMMARY_VERSION}"
+    return summary_dir / f"{hashlib.sha256(payload.encode('utf-8')).hexdigest()}.npz"
+
+
+def save_summary(summary: TrafficSummary, path: Path) -> Path:
+    """Write atomically so a concurrent reader never loads a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".tmp-", suffix=".npz", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            # Compressed: the load arrays are mostly empty bins between bursts.
+            np.savez_compressed(
+                tmp_file, **{field.name: getattr(summary, field.name) for field in fields(summary)}
+            )
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def load_summary(path: Path) -> TrafficSummary:
+    with np.load(path) as data:
+        return TrafficSummary(**{field.name: data[field.name] for field in fields(TrafficSummary)})
+
+
+def load_or_build_summary(
+    config: TrafficConfig,
+    *,
+    summary_dir: Optional[Path] = DEFAULT_SUMMARY_DIR,
+    events: Optional[TrafficLike] = None,
+) -> TrafficSummary:
+    """
+    Return the cached summary for config, generating and summarizing the trace on a miss.
+
+    The cache is keyed by config alone, so explicitly passed events are always summarized
+    and neither looked up nor stored. summary_dir=None disables the on-disk cache.
+    """
+    if events is not None:
+        return summarize_traffic(events, config)
+    path = summary_path(config, summary_dir) if summary_dir is not None else None
+    if path is not None and path.exists():
+        return load_summary(path)
+
+    summary = summarize_traffic(generate_traffic_batch(config), config)
+    if path is not None:
+        save_summary(summary, path)
+    return summary
@@ -0,0 +1,343 @@
+"""Benchmarks for each generation, validation and export stage, with baseline regression checks.
+
+Every (scenario, stage) pair runs in a fresh spawned process so peak RSS is not inherited from
+earlier stages. Inside it the stage inputs are built first, then the stage runs `repeats`
+times for wall time, and once more under tracemalloc for allocation figures. The report is
+plain JSON; compare_to_baseline flags any metric that grew past its threshold ratio.
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+import gc
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Mapping, Optional, Sequence
+
+from .config import SCENARIOS, TrafficConfig, normal_traffic
+from .generator import generate_traffic, generate_traffic_batch, wave_schedule_kwargs
+from .io.csv_export import export_events_to_csv
+from .models.classifier import classify_packets
+from .models.incast_wave import generate_wave_starts
+from .models.packetizer import packetize_wave_starts
+from .profiling import peak_rss_bytes, reset_peak_rss
+from .validate import validate_generated_traffic
+
+
+BENCH_REPORT_VERSION = 1
+BENCH_STAGES = (
+    "generate_wave_starts",
+    "packetize_wave_starts",
+    "classify_packets",
+    "generate_traffic",
+    "validate_generated_traffic",
+    "export_events_to_csv",
+)
+SCALED_SCENARIO = "normal_traffic_x4"
+DEFAULT_BASELINE_PATH = Path(__file__).with_name("bench_baseline.json")
+# A metric regresses when current / baseline exceeds its ratio.
+DEFAULT_THRESHOLDS = {
+    "wall_s_min": 1.25,
+    "peak_rss_bytes": 1.20,
+    "alloc_peak_bytes": 1.10,
+}
+# Timings below this are dominated by noise and never count as regressions.
+MIN_COMPARABLE_WALL_S = 0.05
+
+
+def bench_scenarios() -> dict[str, TrafficConfig]:
+    """The built-in scenarios plus normal_traffic with four times the senders."""
+    scenarios = {name.value: factory() for name, factory in SCENARIOS.items()}
+    scenarios[SCALED_SCENARIO] = replace(normal_traffic(), senders_per_wave=128)
+    return scenarios
+
+
+def _check_stage(stage: str) -> None:
+    if stage not in BENCH_STAGES:
+        raise ValueError(
+            f"Unknown benchmark stage '{stage}'. Choose one of: {', '.join(BENCH_STAGES)}"
+        )
+
+
+def _prepare_stage(
+    stage: str, config: TrafficConfig, work_dir: Path
+) -> tuple[Callable[[], object], int]:
+    """Build the stage's inputs; return (run the stage, number of events it handles)."""
+    _check_stage(stage)
+
+    def schedule():
+        return generate_wave_starts(**wave_schedule_kwargs(config))
+
+    def packetize(wave_starts):
+        return packetize_wave_starts(
+            wave_starts=wave_starts,
+            bytes_per_sender_per_wave=config.bytes_per_sender_per_wave,
+            packet_size_bytes=config.packet_size_bytes,
+        )
+
+    if stage == "generate_wave_starts":
+        return schedule, config.senders_per_wave * config.number_of_waves
+    if stage == "packetize_wave_starts":
+        wave_starts = schedule()
+        packets_per_sender = -(-config.bytes_per_sender_per_wave // config.packet_size_bytes)
+        return (lambda: packetize(wave_starts)), packets_per_sender * len(wave_starts)
+    if stage == "classify_packets":
+        packet_events = packetize(schedule())
+        return (
+            lambda: classify_packets(
+                packet_events=packet_events,
+                control_packet_every_n=config.control_packet_every_n,
+                control_priority_tag=config.control_priority_tag,
+                bulk_priority_tag=config.bulk_priority_tag,
+            )
+        ), len(packet_events)
+    if stage == "generate_traffic":
+        number_of_events = len(generate_traffic_batch(config))
+        return (lambda: generate_traffic(config)), number_of_events
+    if stage == "validate_generated_traffic":
+        batch = generate_traffic_batch(config)
+        return (lambda: validate_generated_traffic(batch, config)), len(batch)
+    batch = generate_traffic_batch(config)
+    return (lambda: export_events_to_csv(batch, work_dir / "bench.csv")), len(batch)
+
+
+def _measure_here(
+    stage: str, config: TrafficConfig, repeats: int, track_allocations: bool
+) -> dict:
+    with tempfile.TemporaryDirectory() as work_dir:
+        run, number_of_events = _prepare_stage(stage, config, Path(work_dir))
+        gc.collect()
+        peak_rss_resettable = reset_peak_rss()
+        input_rss_bytes = peak_rss_bytes()
+
+        wall_times = []
+        blocks_before = sys.getallocatedblocks()
+        for repeat in range(repeats):
+            started = time.perf_counter()
+            result = run()
+            wall_times.append(time.perf_counter() - started)
+            del result
+            if repeat == 0:
+                # Blocks the stage leaks or caches, not the blocks of its own result.
+                retained_blocks = sys.getallocatedblocks() - blocks_before
+        stage_peak_rss_bytes = peak_rss_bytes()
+
+        alloc_peak_bytes = None
+        if track_allocations:
+            gc.collect()
+            tracemalloc.start()
+            result = run()
+            _, alloc_peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del result
+
+    wall_s_min = min(wall_times)
+    return {
+        "events": number_of_events,
+        "repeats": repeats,
+        "wall_s_min": wall_s_min,
+        "wall_s_median": statistics.median(wall_times),
+        "events_per_s": number_of_events / wall_s_min if wall_s_min > 0 else None,
+        "input_rss_bytes": input_rss_bytes,
+        "peak_rss_bytes": stage_peak_rss_bytes,
+        "peak_rss_is_stage_local": peak_rss_resettable,
+        "alloc_peak_bytes": alloc_peak_bytes,
+        "alloc_retained_blocks": retained_blocks,
+    }
+
+
+def measure_stage(
+    stage: str,
+    config: TrafficConfig,
+    *,
+    repeats: int = 3,
+    track_allocations: bool = True,
+    isolate: bool = True,
+) -> dict:
+    """Benchmark one stage; isolate=True runs it in a fresh spawned interpreter."""
+    _check_stage(stage)
+    if repeats <= 0:
+        raise ValueError("repeats must be > 0")
+    if not isolate:
+        return _measure_here(stage, config, repeats, track_allocations)
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        return pool.submit(_measure_here, stage, config, repeats, track_allocations).result()
+
+
+def run_benchmarks(
+    scenarios: Mapping[str, TrafficConfig],
+    stages: Sequence[str] = BENCH_STAGES,
+    *,
+    repeats: int = 3,
+    track_allocations: bool = True,
+    isolate: bool = True,
+    progress: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Benchmark every (scenario, stage) pair and return a JSON-serializable report."""
+    results = []
+    for scenario, config in scenarios.items():
+        for stage in stages:
+            measurement = measure_stage(
+                stage,
+                config,
+                repeats=repeats,
+                track_allocations=track_allocations,
+                isolate=isolate,
+            )
+            results.append({"scenario": scenario, "stage": stage, **measurement})
+            if progress is not None:
+                progress(
+                    f"{scenario:>24} {stage:<28} {measurement['wall_s_min']:9.4f} s "
+                    f"{measurement['peak_rss_bytes'] / 2**20:9.1f} MiB"
+                )
+    return {
+        "version": BENCH_REPORT_VERSION,
+        "created_unix": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+@dataclass(frozen=True)
+class Regression:
+    scenario: str
+    stage: str
+    metric: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+    def __str__(self) -> str:
+        return (
+            f"{self.scenario}/{self.stage} {self.metric}: {self.baseline:.6g} -> "
+            f"{self.current:.6g} ({self.ratio:.2f}x, limit {self.threshold:.2f}x)"
+        )
+
+
+def compare_to_baseline(
+    report: dict, baseline: dict, thresholds: Mapping[str, float] = DEFAULT_THRESHOLDS
+) -> list[Regression]:
+    """
+    Metrics that grew past their threshold ratio.
+
+    Pairs missing from the baseline are skipped, as are timings under MIN_COMPARABLE_WALL_S.
+    """
+    baseline_results = {
+        (result["scenario"], result["stage"]): result for result in baseline["results"]
+    }
+    regressions = []
+    for result in report["results"]:
+        previous = baseline_results.get((result["scenario"], result["stage"]))
+        if previous is None:
+            continue
+        for metric, threshold in thresholds.items():
+            current_value, baseline_value = result.get(metric), previous.get(metric)
+            if current_value is None or not baseline_value:
+                continue
+            if metric.startswith("wall_s") and baseline_value < MIN_COMPARABLE_WALL_S:
+                continue
+            if current_value / baseline_value > threshold:
+                regressions.append(
+                    Regression(
+                        scenario=result["scenario"],
+                        stage=result["stage"],
+                        metric=metric,
+                        baseline=baseline_value,
+                        current=current_value,
+                        threshold=threshold,
+                    )
+                )
+    return regressions
+
+
+def load_report(path: Path) -> dict:
+    report = json.loads(path.read_text())
+    if report.get("version") != BENCH_REPORT_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark report version {report.get('version')}; "
+            f"expected {BENCH_REPORT_VERSION}"
+        )
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None) -> int:
+    scenarios = bench_scenarios()
+    parser = argparse.ArgumentParser(prog=prog, description="Benchmark traffic pipeline stages.")
+    parser.add_argument(
+        "--scenario",
+        choices=sorted(scenarios),
+        action="append",
+        help="Scenario to benchmark (repeatable). Defaults to all, including the scaled one.",
+    )
+    parser.add_argument(
+        "--stage",
+        choices=BENCH_STAGES,
+        action="append",
+        help="Stage to benchmark (repeatable). Defaults to all.",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage.")
+    parser.add_argument(
+        "--no-alloc",
+        action="store_true",
+        help="Skip the tracemalloc run (it is the slowest part of the suite).",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE_PATH,
+        help="Report to compare against; regressions make the exit status 1.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing.",
+    )
+    args = parser.parse_args(argv)
+
+    selected = {name: scenarios[name] for name in args.scenario or scenarios}
+    report = run_benchmarks(
+        selected,
+        args.stage or BENCH_STAGES,
+        repeats=args.repeats,
+        track_allocations=not args.no_alloc,
+        progress=print,
+    )
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    regressions = compare_to_baseline(report, load_report(args.baseline))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
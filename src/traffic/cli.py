@@ -0,0 +1,288 @@
+"""The `traffic` command: one entry point for every traffic tool.
+
+Only argparse is imported up front. generate, export and validate parse their arguments here
+and import the pipeline (NumPy and the generator) only once they run, so `--help` and usage
+errors are instant and `traffic export` never loads matplotlib. plot, bench and sweep hand
+their arguments to the main() of their own module, imported only for that command.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+from pathlib import Path
+import sys
+from typing import Optional, Sequence
+
+
+# name -> (module whose main(argv, prog) runs the command, one-line help)
+DELEGATED_COMMANDS = {
+    "plot": ("traffic.plot", "Render input-sanity plots for one or more scenarios."),
+    "bench": ("traffic.bench", "Benchmark pipeline stages against the stored baseline."),
+    "sweep": ("traffic.sweep", "Sweep traffic and link parameters through the FIFO simulator."),
+}
+GENERATE_PIPELINES = ("batch", "fused", "staged")
+EXPORT_FORMATS = ("csv", "binary")
+VALIDATION_MODES = ("full", "schedule")
+DEFAULT_SCENARIO = "normal_traffic"
+
+
+def _add_scenario_argument(parser: argparse.ArgumentParser) -> None:
+    # Checked after parsing: listing the choices here would mean importing traffic.config.
+    parser.add_argument(
+        "--scenario",
+        default=DEFAULT_SCENARIO,
+        help=f"Scenario name (default {DEFAULT_SCENARIO}).",
+    )
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time, events, events/s and peak RSS for every pipeline stage.",
+    )
+    parser.add_argument(
+        "--profile-json", type=Path, help="Also write the stage profile to this JSON file."
+    )
+
+
+def _scenario(parser: argparse.ArgumentParser, value: str):
+    from traffic.config import ScenarioName
+
+    try:
+        return ScenarioName(value)
+    except ValueError:
+        allowed = ", ".join(item.value for item in ScenarioName)
+        parser.error(f"Invalid scenario '{value}'. Choose one of: {allowed}")
+
+
+def _profiler(args: argparse.Namespace):
+    if not (args.profile or args.profile_json):
+        return None
+    from traffic.profiling import StageProfiler
+
+    return StageProfiler()
+
+
+def _emit_profile(profiler, args: argparse.Namespace) -> None:
+    if profiler is None:
+        return
+    import json
+
+    report = profiler.report()
+    if args.profile:
+        print(report.format_table())
+    if args.profile_json is not None:
+        args.profile_json.write_text(json.dumps(report.to_dict(), indent=2) + "\n")
+
+
+def _generate(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    scenario = _scenario(parser, args.scenario)
+
+    import numpy as np
+
+    from traffic.columnar import TrafficBatch
+    from traffic.config import get_scenario
+    from traffic.generator import (
+        generate_traffic,
+        generate_traffic_batch,
+        generate_traffic_staged,
+    )
+
+    config = get_scenario(scenario)
+    profiler = _profiler(args)
+    if args.pipeline == "batch":
+        batch = generate_traffic_batch(config, profiler=profiler)
+    else:
+        generate = generate_traffic if args.pipeline == "fused" else generate_traffic_staged
+        batch = TrafficBatch.from_events(generate(config, profiler=profiler))
+
+    summary = (
+        f"{scenario.value}: {len(batch)} packets, "
+        f"{int(batch.packet_size_bytes.sum(dtype=np.int64))} bytes, "
+        f"{int(np.count_nonzero(batch.is_control()))} CONTROL"
+    )
+    if len(batch):
+        summary += f", packet_start_us {batch.packet_start_us[0]}..{batch.packet_start_us[-1]}"
+    print(summary)
+    _emit_profile(profiler, args)
+    return 0
+
+
+def _export(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    if args.stream and args.format != "csv":
+        parser.error("--stream only supports --format csv")
+    if args.stream and args.validate_mode != "full":
+        parser.error("--stream only supports --validate-mode full")
+    scenario = _scenario(parser, args.scenario)
+
+    from traffic.config import get_scenario
+    from traffic.generator import DEFAULT_CHUNK_SIZE
+    from traffic.io.csv_export import DEFAULT_TRACE_DIR, generate_and_export_csv
+
+    config = get_scenario(scenario)
+    output_dir = args.output_dir or DEFAULT_TRACE_DIR
+    profiler = _profiler(args)
+    cache = None
+    if not (args.no_cache or args.stream):
+        from traffic.io.trace_cache import TraceCache
+
+        cache = TraceCache(output_dir / "cache")
+    if args.format == "binary":
+        from traffic.io.binary_trace import generate_and_export_binary
+
+        output_path = generate_and_export_binary(
+            config=config,
+            scenario_name=scenario,
+            output_dir=output_dir,
+            validate=not args.no_validate,
+            validation_mode=args.validate_mode,
+            profiler=profiler,
+            cache=cache,
+        )
+    else:
+        output_path = generate_and_export_csv(
+            config=config,
+            scenario_name=scenario,
+            output_dir=output_dir,
+            validate=not args.no_validate,
+            validation_mode=args.validate_mode,
+            stream=args.stream,
+            chunk_size=args.chunk_size or DEFAULT_CHUNK_SIZE,
+            profiler=profiler,
+            cache=cache,
+        )
+    if cache is not None:
+        print(cache.report())
+    print(f"Wrote {output_path}")
+    _emit_profile(profiler, args)
+    return 0
+
+
+def _validate(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    scenario = _scenario(parser, args.scenario)
+
+    from traffic.config import config_fingerprint, get_scenario
+    from traffic.generator import generate_traffic_batch
+    from traffic.io.binary_trace import BINARY_TRACE_SUFFIX, read_binary_trace
+    from traffic.io.csv_export import read_trace_csv
+    from traffic.validate import validate_generated_traffic
+
+    config = get_scenario(scenario)
+    if args.trace is None:
+        label = f"generated {scenario.value}"
+        batch = generate_traffic_batch(config)
+    elif args.trace.suffix == BINARY_TRACE_SUFFIX:
+        label = str(args.trace)
+        trace = read_binary_trace(args.trace)
+        if trace.config_fingerprint not in (None, config_fingerprint(config)):
+            print(f"{label}: trace was generated from a different config", file=sys.stderr)
+            return 1
+        batch = trace.events
+    else:
+        label = str(args.trace)
+        batch = read_trace_csv(args.trace)
+
+    try:
+        validate_generated_traffic(batch, config, args.tolerance)
+    except ValueError as error:
+        print(f"{label}: {error}", file=sys.stderr)
+        return 1
+    print(f"{label}: {len(batch)} events match {scenario.value}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="traffic",
+        description="Incast traffic generation, export, validation and analysis.",
+        epilog="Run 'traffic <command> --help' for the options of one command.",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="<command>", required=True)
+
+    generate = commands.add_parser(
+        "generate",
+        help="Generate a scenario in memory and summarize it.",
+        description="Generate a scenario in memory and summarize it.",
+    )
+    _add_scenario_argument(generate)
+    generate.add_argument(
+        "--pipeline",
+        choices=GENERATE_PIPELINES,
+        default="batch",
+        help="batch: columnar arrays; fused: one TrafficEvent per packet in a single pass; "
+        "staged: the reference pipeline that materializes every stage.",
+    )
+    _add_profile_arguments(generate)
+    generate.set_defaults(run=_generate, command_parser=generate)
+
+    export = commands.add_parser(
+        "export",
+        help="Generate, validate and write a CSV or binary trace.",
+        description="Generate, validate and write one scenario trace.",
+    )
+    _add_scenario_argument(export)
+    export.add_argument(
+        "--output-dir", type=Path, help="Trace directory (default src/data/traces)."
+    )
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export.add_argument(
+        "--stream",
+        action="store_true",
+        help="Generate, validate and write chunk by chunk (CSV only; bypasses the cache).",
+    )
+    export.add_argument(
+        "--chunk-size", type=int, help="Events per chunk with --stream (default 65536)."
+    )
+    export.add_argument("--no-validate", action="store_true", help="Skip validation.")
+    export.add_argument(
+        "--validate-mode",
+        choices=VALIDATION_MODES,
+        default="full",
+        help="full: check every packet. schedule: check the wave schedule in closed form plus "
+        "a packet sample (not with --stream).",
+    )
+    export.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always regenerate instead of copying from the trace cache in <output-dir>/cache.",
+    )
+    _add_profile_arguments(export)
+    export.set_defaults(run=_export, command_parser=export)
+
+    validate = commands.add_parser(
+        "validate",
+        help="Validate a trace, or generated traffic, against a scenario.",
+        description="Validate a trace, or freshly generated traffic, against a scenario.",
+    )
+    validate.add_argument(
+        "trace",
+        type=Path,
+        nargs="?",
+        help="CSV or binary (.trbin) trace. Omit it to generate the scenario and check that.",
+    )
+    _add_scenario_argument(validate)
+    validate.add_argument(
+        "--tolerance", type=float, default=0.01, help="Allowed control-ratio deviation."
+    )
+    validate.set_defaults(run=_validate, command_parser=validate)
+
+    for name, (_, help_text) in DELEGATED_COMMANDS.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] in DELEGATED_COMMANDS:
+        command, command_argv = argv[0], argv[1:]
+        module = importlib.import_module(DELEGATED_COMMANDS[command][0])
+        return module.main(command_argv, prog=f"traffic {command}") or 0
+
+    args = build_parser().parse_args(argv)
+    return args.run(args, args.command_parser)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""Columnar (struct-of-arrays) traffic representation built with vectorized NumPy."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from .models.classifier import TrafficClass
+from .models.incast_wave import (
+    _MASK64,
+    JitterScheme,
+    iter_start_offsets,
+    resolve_wave_range,
+    validate_wave_schedule_args,
+)
+from .schema import TrafficEvent, TrafficEvents
+
+
+# Codes match sim::cpu_fifo::TrafficClass (Bulk = 0, Control = 1).
+TRAFFIC_CLASS_CODES = {
+    TrafficClass.BULK: 0,
+    TrafficClass.CONTROL: 1,
+}
+TRAFFIC_CLASS_BY_CODE = (TrafficClass.BULK, TrafficClass.CONTROL)
+BULK_CODE = TRAFFIC_CLASS_CODES[TrafficClass.BULK]
+CONTROL_CODE = TRAFFIC_CLASS_CODES[TrafficClass.CONTROL]
+
+COLUMN_DTYPES = {
+    "packet_start_us": np.int64,
+    "wave_id": np.uint32,
+    "sender_id": np.uint32,
+    "packet_index_for_sender": np.uint32,
+    "packet_size_bytes": np.uint32,
+    "traffic_class": np.uint8,
+    "priority_tag": np.uint8,
+}
+
+
+@dataclass(frozen=True, eq=False)
+class TrafficBatch:
+    """Struct-of-arrays view of generated traffic; row i is one TrafficEvent."""
+
+    packet_start_us: np.ndarray
+    wave_id: np.ndarray
+    sender_id: np.ndarray
+    packet_index_for_sender: np.ndarray
+    packet_size_bytes: np.ndarray
+    traffic_class: np.ndarray
+    priority_tag: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.packet_start_us.shape[0])
+
+    def __getitem__(self, index: slice) -> "TrafficBatch":
+        return TrafficBatch(**{name: column[index] for name, column in self.columns().items()})
+
+    def columns(self) -> dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in COLUMN_DTYPES}
+
+    def is_control(self) -> np.ndarray:
+        return self.traffic_class == CONTROL_CODE
+
+    def to_events(self) -> TrafficEvents:
+        traffic_classes = [TRAFFIC_CLASS_BY_CODE[code] for code in self.traffic_class.tolist()]
+        return [
+            TrafficEvent(
+                wave_id=wave_id,
+                sender_id=sender_id,
+                packet_index_for_sender=packet_index_for_sender,
+                packet_start_us=packet_start_us,
+                packet_size_bytes=packet_size_bytes,
+                traffic_class=traffic_class,
+                priority_tag=priority_tag,
+            )
+            for (
+                wave_id,
+                sender_id,
+                packet_index_for_sender,
+                packet_start_us,
+                packet_size_bytes,
+                traffic_class,
+                priority_tag,
+            ) in zip(
+                self.wave_id.tolist(),
+                self.sender_id.tolist(),
+                self.packet_index_for_sender.tolist(),
+                self.packet_start_us.tolist(),
+                self.packet_size_bytes.tolist(),
+                traffic_classes,
+                self.priority_tag.tolist(),
+            )
+        ]
+
+    @classmethod
+    def empty(cls) -> "TrafficBatch":
+        return cls(**{name: np.empty(0, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()})
+
+    @classmethod
+    def from_events(cls, events: Iterable) -> "TrafficBatch":
+        """Build a batch from any iterable of event objects with TrafficEvent's fields."""
+        events = list(events)
+        columns = {
+            name: np.fromiter(
+                (getattr(event, name) for event in events), dtype=dtype, count=len(events)
+            )
+            for name, dtype in COLUMN_DTYPES.items()
+            if name != "traffic_class"
+        }
+        columns["traffic_class"] = np.fromiter(
+            (TRAFFIC_CLASS_CODES[event.traffic_class] for event in events),
+            dtype=COLUMN_DTYPES["traffic_class"],
+            count=len(events),
+        )
+        return cls(**columns)
+
+
+TrafficLike = Union[TrafficEvents, TrafficBatch]
+
+
+def as_batch(events: TrafficLike) -> TrafficBatch:
+    if isinstance(events, TrafficBatch):
+        return events
+    return TrafficBatch.from_events(events)
+
+
+def concat_batches(batches: Iterable[TrafficBatch]) -> TrafficBatch:
+    batches = list(batches)
+    if not batches:
+        return TrafficBatch.empty()
+    return TrafficBatch(
+        **{
+            name: np.concatenate([getattr(batch, name) for batch in batches])
+            for name in COLUMN_DTYPES
+        }
+    )
+
+
+def _splitmix64_columns(values: np.ndarray) -> np.ndarray:
+    # uint64 array arithmetic wraps modulo 2**64, matching incast_wave._splitmix64.
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def counter_start_offset_columns(
+    *,
+    seed: int,
+    wave_ids: np.ndarray,
+    sender_ids: np.ndarray,
+    max_start_offset_us: int,
+) -> np.ndarray:
+    """Vectorized counter_start_offset; element-for-element identical to the scalar form."""
+    seed_key = np.array([seed & _MASK64], dtype=np.uint64)
+    wave_seeds = _splitmix64_columns(_splitmix64_columns(seed_key) + wave_ids.astype(np.uint64))
+    hashed = _splitmix64_columns(wave_seeds + sender_ids.astype(np.uint64))
+    return (hashed % np.uint64(max_start_offset_us + 1)).astype(np.int64)
+
+
+def wave_start_columns(
+    *,
+    senders_per_wave: int,
+    number_of_waves: int,
+    first_wave_start_us: int,
+    wave_interval_us: int,
+    max_start_offset_us: int = 0,
+    seed: int = 0,
+    jitter_scheme: JitterScheme = JitterScheme.SEQUENTIAL,
+    wave_range: Optional[range] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Columnar generate_wave_starts: (wave_id, sender_id, sender_start_us) in schedule order."""
+    validate_wave_schedule_args(
+        senders_per_wave=senders_per_wave,
+        number_of_waves=number_of_waves,
+        first_wave_start_us=first_wave_start_us,
+        wave_interval_us=wave_interval_us,
+        max_start_offset_us=max_start_offset_us,
+    )
+
+    waves = resolve_wave_range(number_of_waves, wave_range)
+    wave_ids = np.repeat(np.arange(waves.start, waves.stop, dtype=np.uint32), senders_per_wave)
+    sender_ids = np.tile(np.arange(senders_per_wave, dtype=np.uint32), len(waves))
+    if jitter_scheme is JitterScheme.COUNTER:
+        start_offsets_us = counter_start_offset_columns(
+            seed=seed,
+            wave_ids=wave_ids,
+            sender_ids=sender_ids,
+            max_start_offset_us=max_start_offset_us,
+        )
+    else:
+        start_offsets_us = np.fromiter(
+            iter_start_offsets(
+                senders_per_wave=senders_per_wave,
+                number_of_waves=number_of_waves,
+                max_start_offset_us=max_start_offset_us,
+                seed=seed,
+                jitter_scheme=jitter_scheme,
+                wave_range=waves,
+            ),
+            dtype=np.int64,
+            count=len(waves) * senders_per_wave,
+        )
+    sender_start_us = (
+        first_wave_start_us + wave_ids.astype(np.int64) * wave_interval_us + start_offsets_us
+    )
+
+    # Same order as generate_wave_starts: (sender_start_us, wave_id, sender_id).
+    order = np.lexsort((sender_ids, wave_ids, sender_start_us))
+    return wave_ids[order], sender_ids[order], sender_start_us[order]
+
+
+def packetize_columns(
+    *,
+    wave_ids: np.ndarray,
+    sender_ids: np.ndarray,
+    sender_start_us: np.ndarray,
+    bytes_per_sender_per_wave: int,
+    packet_size_bytes: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Columnar packetize_wave_starts: repeats each wave start once per packet."""
+    if bytes_per_sender_per_wave < 0:
+        raise ValueError("bytes_per_sender_per_wave must be >= 0")
+    if packet_size_bytes <= 0:
+        raise ValueError("packet_size_bytes must be > 0")
+
+    full_packets, last_packet_remainder = divmod(bytes_per_sender_per_wave, packet_size_bytes)
+    packets_per_sender = full_packets + (1 if last_packet_remainder > 0 else 0)
+    number_of_starts = int(wave_ids.shape[0])
+
+    packet_index_for_sender = np.tile(
+        np.arange(packets_per_sender, dtype=np.uint32), number_of_starts
+    )
+    packet_sizes = np.full(
+        number_of_starts * packets_per_sender, packet_size_bytes, dtype=np.uint32
+    )
+    if last_packet_remainder > 0:
+        packet_sizes[packets_per_sender - 1 :: packets_per_sender] = last_packet_remainder
+
+    return (
+        np.repeat(wave_ids, packets_per_sender),
+        np.repeat(sender_ids, packets_per_sender),
+        packet_index_for_sender,
+        np.repeat(sender_start_us, packets_per_sender),
+        packet_sizes,
+    )
+
+
+def classify_columns(
+    *,
+    number_of_packets: int,
+    control_packet_every_n: int,
+    control_priority_tag: int = 46,
+    bulk_priority_tag: int = 0,
+    first_packet_index: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Columnar classify_packets: every n-th packet (by global index) is CONTROL."""
+    if control_packet_every_n <= 0:
+        raise ValueError("control_packet_every_n must be > 0")
+    for name, tag in (
+        ("control_priority_tag", control_priority_tag),
+        ("bulk_priority_tag", bulk_priority_tag),
+    ):
+        if not 0 <= tag <= 0xFF:
+            raise ValueError(f"{name} must fit in uint8")
+
+    packet_index = np.arange(
+        first_packet_index, first_packet_index + number_of_packets, dtype=np.int64
+    )
+    is_control = packet_index % control_packet_every_n == 0
+    traffic_class = np.where(is_control, CONTROL_CODE, BULK_CODE).astype(np.uint8)
+    priority_tag = np.where(is_control, control_priority_tag, bulk_priority_tag).astype(np.uint8)
+    return traffic_class, priority_tag
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
+import hashlib
+import json
+
+from .models.incast_wave import JitterScheme
 
 
 @dataclass(frozen=True)
@@ -17,6 +21,7 @@ class TrafficConfig:
     control_packet_every_n: int
     control_priority_tag: int = 46
     bulk_priority_tag: int = 0
+    jitter_scheme: JitterScheme = JitterScheme.SEQUENTIAL
 
 
 class ScenarioName(Enum):
@@ -75,3 +80,13 @@ SCENARIOS = {
 
 def get_scenario(name: ScenarioName) -> TrafficConfig:
     return SCENARIOS[name]()
+
+
+def config_fingerprint(config: TrafficConfig) -> str:
+    """Stable SHA-256 hex digest over every TrafficConfig field."""
+    payload = json.dumps(
+        asdict(config),
+        sort_keys=True,
+        default=lambda value: value.value if isinstance(value, Enum) else str(value),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
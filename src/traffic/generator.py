@@ -1,49 +1,371 @@
 from __future__ import annotations
 
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .columnar import (
+    TrafficBatch,
+    classify_columns,
+    packetize_columns,
+    wave_start_columns,
+)
 from .config import ScenarioName, TrafficConfig, get_scenario
-from .models.classifier import classify_packets
-from .models.incast_wave import generate_wave_starts
-from .models.packetizer import packetize_wave_starts
+from .models.classifier import (
+    ClassifiedPacketBurst,
+    TrafficClass,
+    classify_bursts,
+    classify_packets,
+)
+from .models.incast_wave import WaveStart, generate_wave_starts, iter_ordered_wave_starts
+from .models.packetizer import (
+    burst_wave_starts,
+    packet_sizes_for_sender,
+    packetize_wave_starts,
+)
+from .profiling import StageProfiler, profile_stage
 from .schema import TrafficEvent, TrafficEvents
+from .stage_cache import StageCache
+
+
+# Bump whenever a change alters generated output for an unchanged TrafficConfig; trace caches
+# key on it so stale traces are never served.
+GENERATOR_VERSION = "1"
 
+DEFAULT_CHUNK_SIZE = 65_536
 
-def generate_traffic(config: TrafficConfig) -> TrafficEvents:
-    wave_starts = generate_wave_starts(
+PacketColumns = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def wave_schedule_kwargs(config: TrafficConfig) -> dict:
+    """The config fields generate_wave_starts and its variants take, as keyword arguments."""
+    return dict(
         senders_per_wave=config.senders_per_wave,
         number_of_waves=config.number_of_waves,
         first_wave_start_us=config.first_wave_start_us,
         wave_interval_us=config.wave_interval_us,
         max_start_offset_us=config.max_start_offset_us,
         seed=config.seed,
+        jitter_scheme=config.jitter_scheme,
     )
 
-    packet_events = packetize_wave_starts(
+
+def fuse_wave_starts_to_events(
+    *,
+    wave_starts: Iterable[WaveStart],
+    config: TrafficConfig,
+    first_packet_index: int = 0,
+) -> Iterator[TrafficEvent]:
+    """
+    Packetize and classify schedule entries straight into final events.
+
+    Produces the same events as packetize_wave_starts -> classify_packets -> TrafficEvent, but
+    allocates one object per packet instead of one per packet per stage.
+    """
+    packet_sizes = list(
+        enumerate(
+            packet_sizes_for_sender(
+                bytes_per_sender_per_wave=config.bytes_per_sender_per_wave,
+                packet_size_bytes=config.packet_size_bytes,
+            )
+        )
+    )
+    control_packet_every_n = config.control_packet_every_n
+    if control_packet_every_n <= 0:
+        raise ValueError("control_packet_every_n must be > 0")
+    control = (TrafficClass.CONTROL, config.control_priority_tag)
+    bulk = (TrafficClass.BULK, config.bulk_priority_tag)
+
+    packet_index = first_packet_index
+    for wave_start in wave_starts:
+        for packet_index_for_sender, size_bytes in packet_sizes:
+            traffic_class, priority_tag = (
+                control if packet_index % control_packet_every_n == 0 else bulk
+            )
+            yield TrafficEvent(
+                wave_id=wave_start.wave_id,
+                sender_id=wave_start.sender_id,
+                packet_index_for_sender=packet_index_for_sender,
+                packet_start_us=wave_start.sender_start_us,
+                packet_size_bytes=size_bytes,
+                traffic_class=traffic_class,
+                priority_tag=priority_tag,
+            )
+            packet_index += 1
+
+
+def _schedule_waves(
+    config: TrafficConfig, profiler: Optional[StageProfiler]
+) -> list[WaveStart]:
+    with profile_stage(profiler, "wave_scheduling") as stage:
+        wave_starts = generate_wave_starts(**wave_schedule_kwargs(config))
+        stage.add_events(len(wave_starts))
+    return wave_starts
+
+
+def generate_traffic(
+    config: TrafficConfig, *, profiler: Optional[StageProfiler] = None
+) -> TrafficEvents:
+    """
+    Generate the full event list in one fused pass over the wave schedule.
+
+    The fused pass packetizes, classifies and builds events together, so a profiler sees it
+    as a single materialization stage; generate_traffic_staged and generate_traffic_batch
+    report packetizing and classification separately.
+    """
+    wave_starts = _schedule_waves(config, profiler)
+    with profile_stage(profiler, "materialization") as stage:
+        events = list(fuse_wave_starts_to_events(wave_starts=wave_starts, config=config))
+        stage.add_events(len(events))
+    return events
+
+
+def generate_traffic_staged(
+    config: TrafficConfig, *, profiler: Optional[StageProfiler] = None
+) -> TrafficEvents:
+    """Reference pipeline that materializes every stage; kept for equivalence tests."""
+    wave_starts = _schedule_waves(config, profiler)
+
+    with profile_stage(profiler, "packetizing") as stage:
+        packet_events = packetize_wave_starts(
+            wave_starts=wave_starts,
+            bytes_per_sender_per_wave=config.bytes_per_sender_per_wave,
+            packet_size_bytes=config.packet_size_bytes,
+        )
+        stage.add_events(len(packet_events))
+
+    with profile_stage(profiler, "classification") as stage:
+        classified_packet_events = classify_packets(
+            packet_events=packet_events,
+            control_packet_every_n=config.control_packet_every_n,
+            control_priority_tag=config.control_priority_tag,
+            bulk_priority_tag=config.bulk_priority_tag,
+        )
+        stage.add_events(len(classified_packet_events))
+
+    with profile_stage(profiler, "materialization") as stage:
+        events = [
+            TrafficEvent(
+                wave_id=event.wave_id,
+                sender_id=event.sender_id,
+                packet_index_for_sender=event.packet_index_for_sender,
+                packet_start_us=event.packet_start_us,
+                packet_size_bytes=event.packet_size_bytes,
+                traffic_class=event.traffic_class,
+                priority_tag=event.priority_tag,
+            )
+            for event in classified_packet_events
+        ]
+        stage.add_events(len(events))
+    return events
+
+
+def generate_waves(config: TrafficConfig, wave_range: range) -> list[WaveStart]:
+    """
+    Schedule for just the waves in wave_range, sorted like generate_wave_starts.
+
+    With JitterScheme.PER_WAVE or COUNTER the cost is O(len(wave_range)); SEQUENTIAL has to
+    replay the shared jitter stream up to wave_range.start first.
+    """
+    return generate_wave_starts(**wave_schedule_kwargs(config), wave_range=wave_range)
+
+
+def iter_traffic(config: TrafficConfig) -> Iterator[TrafficEvent]:
+    """
+    Lazily yield the same events as generate_traffic, in packet_start_us order.
+
+    Wave starts are released in schedule order as soon as no later wave can precede them and
+    fused straight into events. The global packet index used for classification runs across
+    the whole stream, so CONTROL/BULK numbering is unchanged.
+    """
+    return fuse_wave_starts_to_events(
+        wave_starts=iter_ordered_wave_starts(**wave_schedule_kwargs(config)),
+        config=config,
+    )
+
+
+def iter_traffic_chunks(
+    config: TrafficConfig, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[TrafficEvents]:
+    """Yield iter_traffic output as lists of at most chunk_size events."""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+
+    events = iter_traffic(config)
+    while True:
+        chunk = list(islice(events, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def generate_traffic_bursts(config: TrafficConfig) -> list[ClassifiedPacketBurst]:
+    """Run-length form of generate_traffic: one classified burst per (wave, sender)."""
+    wave_starts = generate_wave_starts(**wave_schedule_kwargs(config))
+
+    bursts = burst_wave_starts(
         wave_starts=wave_starts,
         bytes_per_sender_per_wave=config.bytes_per_sender_per_wave,
         packet_size_bytes=config.packet_size_bytes,
     )
 
-    classified_packet_events = classify_packets(
-        packet_events=packet_events,
+    return classify_bursts(
+        bursts=bursts,
         control_packet_every_n=config.control_packet_every_n,
         control_priority_tag=config.control_priority_tag,
         bulk_priority_tag=config.bulk_priority_tag,
     )
 
-    return [
-        TrafficEvent(
-            wave_id=event.wave_id,
-            sender_id=event.sender_id,
-            packet_index_for_sender=event.packet_index_for_sender,
-            packet_start_us=event.packet_start_us,
-            packet_size_bytes=event.packet_size_bytes,
-            traffic_class=event.traffic_class,
-            priority_tag=event.priority_tag,
+
+def iter_burst_events(
+    classified_bursts: Iterable[ClassifiedPacketBurst], config: TrafficConfig
+) -> Iterator[TrafficEvent]:
+    """Lazily expand classified bursts into the events generate_traffic returns."""
+    for classified_burst in classified_bursts:
+        yield from fuse_wave_starts_to_events(
+            wave_starts=[
+                WaveStart(
+                    wave_id=classified_burst.burst.wave_id,
+                    sender_id=classified_burst.burst.sender_id,
+                    sender_start_us=classified_burst.burst.packet_start_us,
+                )
+            ],
+            config=config,
+            first_packet_index=classified_burst.first_packet_index,
         )
-        for event in classified_packet_events
-    ]
+
+
+def _wave_schedule_key(config: TrafficConfig, wave_range: Optional[range]) -> tuple:
+    return tuple(wave_schedule_kwargs(config).values()) + (wave_range,)
+
+
+def packetize_wave_range(
+    config: TrafficConfig,
+    wave_range: Optional[range] = None,
+    *,
+    stage_cache: Optional[StageCache] = None,
+    profiler: Optional[StageProfiler] = None,
+) -> PacketColumns:
+    """
+    Schedule and packetize the waves in wave_range as columns in schedule order.
+
+    Returns (wave_id, sender_id, packet_index_for_sender, packet_start_us, packet_size_bytes).
+    Classification is left to classify_packet_columns because it needs the global packet index.
+    With a stage_cache, the schedule is memoized on timing + seed and the packet columns on
+    that plus the size parameters; a cache hit is profiled as the time of the lookup. When the
+    packet columns are cached the schedule is not needed, so it is neither looked up nor
+    profiled.
+    """
+    schedule_key = _wave_schedule_key(config, wave_range)
+    packet_key = schedule_key + (config.bytes_per_sender_per_wave, config.packet_size_bytes)
+    schedule = None
+    if stage_cache is None or ("packetize", packet_key) not in stage_cache:
+        with profile_stage(profiler, "wave_scheduling") as stage:
+            schedule = _memoized(
+                stage_cache,
+                "wave_starts",
+                schedule_key,
+                lambda: wave_start_columns(**wave_schedule_kwargs(config), wave_range=wave_range),
+            )
+            stage.add_events(schedule[0].shape[0])
+
+    with profile_stage(profiler, "packetizing") as stage:
+        packet_columns = _memoized(
+            stage_cache,
+            "packetize",
+            packet_key,
+            lambda: packetize_columns(
+                wave_ids=schedule[0],
+                sender_ids=schedule[1],
+                sender_start_us=schedule[2],
+                bytes_per_sender_per_wave=config.bytes_per_sender_per_wave,
+                packet_size_bytes=config.packet_size_bytes,
+            ),
+        )
+        stage.add_events(packet_columns[3].shape[0])
+    return packet_columns
+
+
+def classify_packet_columns(
+    config: TrafficConfig,
+    packet_columns: PacketColumns,
+    *,
+    stage_cache: Optional[StageCache] = None,
+    profiler: Optional[StageProfiler] = None,
+) -> TrafficBatch:
+    """Attach CONTROL/BULK columns; memoized on packet count and the class parameters."""
+    (
+        packet_wave_ids,
+        packet_sender_ids,
+        packet_index_for_sender,
+        packet_start_us,
+        packet_size_bytes,
+    ) = packet_columns
+    number_of_packets = int(packet_start_us.shape[0])
+
+    with profile_stage(profiler, "classification", number_of_packets):
+        traffic_class, priority_tag = _memoized(
+            stage_cache,
+            "classify",
+            (
+                number_of_packets,
+                config.control_packet_every_n,
+                config.control_priority_tag,
+                config.bulk_priority_tag,
+            ),
+            lambda: classify_columns(
+                number_of_packets=number_of_packets,
+                control_packet_every_n=config.control_packet_every_n,
+                control_priority_tag=config.control_priority_tag,
+                bulk_priority_tag=config.bulk_priority_tag,
+            ),
+        )
+
+    return TrafficBatch(
+        packet_start_us=packet_start_us,
+        wave_id=packet_wave_ids,
+        sender_id=packet_sender_ids,
+        packet_index_for_sender=packet_index_for_sender,
+        packet_size_bytes=packet_size_bytes,
+        traffic_class=traffic_class,
+        priority_tag=priority_tag,
+    )
+
+
+def _memoized(stage_cache: Optional[StageCache], stage: str, key: tuple, compute):
+    if stage_cache is None:
+        return compute()
+    return stage_cache.get_or_compute(stage, key, compute)
+
+
+def generate_traffic_batch(
+    config: TrafficConfig,
+    *,
+    stage_cache: Optional[StageCache] = None,
+    profiler: Optional[StageProfiler] = None,
+) -> TrafficBatch:
+    """
+    Columnar equivalent of generate_traffic; row order and values are identical.
+
+    Pass a StageCache to reuse upstream stages across calls: sweeping only the classifier
+    parameters then recomputes only the classification columns. Pass a StageProfiler to
+    time scheduling, packetizing and classification separately; the columns those stages
+    build are the batch, so there is no separate materialization stage.
+    """
+    return classify_packet_columns(
+        config,
+        packetize_wave_range(config, stage_cache=stage_cache, profiler=profiler),
+        stage_cache=stage_cache,
+        profiler=profiler,
+    )
 
 
 def generate_traffic_for_scenario(name: ScenarioName) -> TrafficEvents:
     config = get_scenario(name)
     return generate_traffic(config)
+
+
+def generate_traffic_batch_for_scenario(name: ScenarioName) -> TrafficBatch:
+    config = get_scenario(name)
+    return generate_traffic_batch(config)
@@ -0,0 +1,175 @@
+"""Fixed-width little-endian binary traces that load as zero-copy np.memmap columns.
+
+File layout (all integers little-endian):
+
+    header        magic (8s) | version (u16) | column_count (u16) | reserved (u32)
+                  | row_count (u64) | config_fingerprint (32s, SHA-256 digest or zeros)
+    column table  column_count x [ name (32s, NUL padded) | dtype (4s, NumPy str) | offset (u64) ]
+    data          one contiguous array per column, each starting on a 64-byte boundary
+
+Columns follow TRACE_COLUMNS order; traffic_class is stored as the uint8 code used by
+traffic.columnar (BULK = 0, CONTROL = 1).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import struct
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from traffic.columnar import COLUMN_DTYPES, TrafficBatch, TrafficLike, as_batch
+from traffic.config import ScenarioName, TrafficConfig, config_fingerprint
+from traffic.generator import generate_traffic_batch
+from traffic.io.csv_export import DEFAULT_TRACE_DIR, TRACE_COLUMNS, build_trace_path
+from traffic.profiling import StageProfiler, profile_stage
+from traffic.validate import validate_generated_traffic
+
+if TYPE_CHECKING:
+    from traffic.io.trace_cache import TraceCache
+
+
+BINARY_TRACE_MAGIC = b"TRFTRACE"
+BINARY_TRACE_VERSION = 1
+BINARY_TRACE_SUFFIX = ".trbin"
+
+_HEADER = struct.Struct("<8sHHIQ32s")
+_COLUMN_ENTRY = struct.Struct("<32s4sQ")
+_DATA_ALIGNMENT = 64
+_EMPTY_FINGERPRINT = bytes(32)
+
+
+@dataclass(frozen=True)
+class BinaryTrace:
+    version: int
+    row_count: int
+    config_fingerprint: str | None
+    events: TrafficBatch
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _DATA_ALIGNMENT) * _DATA_ALIGNMENT
+
+
+def _column_dtypes() -> list[tuple[str, np.dtype]]:
+    return [(name, np.dtype(COLUMN_DTYPES[name]).newbyteorder("<")) for name in TRACE_COLUMNS]
+
+
+def export_events_to_binary(
+    events: TrafficLike,
+    output_path: Path,
+    *,
+    config: TrafficConfig | None = None,
+) -> Path:
+    batch = as_batch(events)
+    row_count = len(batch)
+    columns = _column_dtypes()
+    fingerprint = (
+        bytes.fromhex(config_fingerprint(config)) if config is not None else _EMPTY_FINGERPRINT
+    )
+
+    offsets = []
+    offset = _align(_HEADER.size + _COLUMN_ENTRY.size * len(columns))
+    for _, dtype in columns:
+        offsets.append(offset)
+        offset = _align(offset + dtype.itemsize * row_count)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("wb") as trace_file:
+        trace_file.write(
+            _HEADER.pack(
+                BINARY_TRACE_MAGIC, BINARY_TRACE_VERSION, len(columns), 0, row_count, fingerprint
+            )
+        )
+        for (name, dtype), column_offset in zip(columns, offsets):
+            trace_file.write(
+                _COLUMN_ENTRY.pack(name.encode("ascii"), dtype.str.encode("ascii"), column_offset)
+            )
+        for (name, dtype), column_offset in zip(columns, offsets):
+            trace_file.write(bytes(column_offset - trace_file.tell()))
+            trace_file.write(np.ascontiguousarray(getattr(batch, name), dtype=dtype).tobytes())
+    return output_path
+
+
+def read_binary_trace(path: Path) -> BinaryTrace:
+    """Open a binary trace; each column is an np.memmap view, so nothing is read up front."""
+    with path.open("rb") as trace_file:
+        header = trace_file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"Truncated binary trace header: {path}")
+        magic, version, column_count, _, row_count, fingerprint = _HEADER.unpack(header)
+        if magic != BINARY_TRACE_MAGIC:
+            raise ValueError(f"Not a binary traffic trace (bad magic {magic!r}): {path}")
+        if version != BINARY_TRACE_VERSION:
+            raise ValueError(
+                f"Unsupported binary trace version {version}; expected {BINARY_TRACE_VERSION}"
+            )
+        column_table = trace_file.read(_COLUMN_ENTRY.size * column_count)
+
+    expected_columns = _column_dtypes()
+    if column_count != len(expected_columns):
+        raise ValueError(
+            f"Invalid binary trace column count. Expected {len(expected_columns)}, "
+            f"got {column_count}"
+        )
+
+    columns: dict[str, np.ndarray] = {}
+    for index, (expected_name, expected_dtype) in enumerate(expected_columns):
+        raw_name, raw_dtype, offset = _COLUMN_ENTRY.unpack_from(
+            column_table, index * _COLUMN_ENTRY.size
+        )
+        name = raw_name.rstrip(b"\0").decode("ascii")
+        dtype = np.dtype(raw_dtype.rstrip(b"\0").decode("ascii"))
+        if name != expected_name or dtype != expected_dtype:
+            raise ValueError(
+                f"Invalid binary trace column at index {index}. "
+                f"Expected '{expected_name}' {expected_dtype.str}, got '{name}' {dtype.str}"
+            )
+        if row_count == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(row_count,))
+
+    return BinaryTrace(
+        version=version,
+        row_count=row_count,
+        config_fingerprint=fingerprint.hex() if fingerprint != _EMPTY_FINGERPRINT else None,
+        events=TrafficBatch(**columns),
+    )
+
+
+def generate_and_export_binary(
+    *,
+    config: TrafficConfig,
+    scenario_name: ScenarioName | None = None,
+    output_dir: Path = DEFAULT_TRACE_DIR,
+    validate: bool = True,
+    validation_mode: str = "full",
+    profiler: Optional[StageProfiler] = None,
+    cache: Optional[TraceCache] = None,
+) -> Path:
+    """Generate, validate and write one binary trace, or copy it out of cache when given."""
+    output_path = build_trace_path(
+        config=config,
+        scenario_name=scenario_name,
+        output_dir=output_dir,
+        suffix=BINARY_TRACE_SUFFIX,
+    )
+    if cache is not None:
+        cache.copy_to(
+            config,
+            output_path,
+            trace_format="binary",
+            validate=validate,
+            validation_mode=validation_mode,
+            profiler=profiler,
+        )
+        return output_path
+    events = generate_traffic_batch(config, profiler=profiler)
+    if validate:
+        with profile_stage(profiler, "validation", len(events)):
+            validate_generated_traffic(events, config, mode=validation_mode)
+    with profile_stage(profiler, "export", len(events)):
+        return export_events_to_binary(events, output_path, config=config)
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
 import csv
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Optional
 
-from traffic.config import ScenarioName, TrafficConfig
-from traffic.generator import generate_traffic
-from traffic.schema import TrafficEvents
-from traffic.validate import validate_generated_traffic
+import numpy as np
+
+from traffic.columnar import (
+    COLUMN_DTYPES,
+    TRAFFIC_CLASS_BY_CODE,
+    TRAFFIC_CLASS_CODES,
+    TrafficBatch,
+    concat_batches,
+)
+from traffic.config import ScenarioName, TrafficConfig, config_fingerprint
+from traffic.generator import DEFAULT_CHUNK_SIZE, generate_traffic_batch, iter_traffic_chunks
+from traffic.profiling import StageProfiler, profile_iter, profile_stage
+from traffic.validate import iter_validated, validate_generated_traffic
+
+if TYPE_CHECKING:
+    from traffic.io.trace_cache import TraceCache
 
 
 TRACE_COLUMNS = (
@@ -21,6 +34,10 @@ TRACE_COLUMNS = (
 )
 
 DEFAULT_TRACE_DIR = Path("src/data/traces")
+BATCH_EXPORT_CHUNK_ROWS = 65_536
+CSV_READ_CHUNK_ROWS = 262_144
+# Enough of config_fingerprint to keep configs that share seed/senders/waves apart.
+TRACE_PATH_FINGERPRINT_CHARS = 12
 
 
 def build_trace_path(
@@ -28,34 +45,83 @@ def build_trace_path(
     config: TrafficConfig,
     scenario_name: ScenarioName | None = None,
     output_dir: Path = DEFAULT_TRACE_DIR,
+    suffix: str = ".csv",
 ) -> Path:
     scenario_label = scenario_name.value if scenario_name is not None else "custom"
     filename = (
         f"{scenario_label}"
         f"_seed{config.seed}"
         f"_senders{config.senders_per_wave}"
-        f"_waves{config.number_of_waves}.csv"
+        f"_waves{config.number_of_waves}"
+        f"_{config_fingerprint(config)[:TRACE_PATH_FINGERPRINT_CHARS]}{suffix}"
     )
     return output_dir / filename
 
 
-def export_events_to_csv(events: Iterable, output_path: Path) -> Path:
+def _write_batch_rows(writer, batch: TrafficBatch) -> None:
+    class_labels = [traffic_class.value for traffic_class in TRAFFIC_CLASS_BY_CODE]
+    for start in range(0, len(batch), BATCH_EXPORT_CHUNK_ROWS):
+        chunk = batch[start : start + BATCH_EXPORT_CHUNK_ROWS]
+        writer.writerows(
+            zip(
+                chunk.packet_start_us.tolist(),
+                chunk.wave_id.tolist(),
+                chunk.sender_id.tolist(),
+                chunk.packet_index_for_sender.tolist(),
+                chunk.packet_size_bytes.tolist(),
+                [class_labels[code] for code in chunk.traffic_class.tolist()],
+                chunk.priority_tag.tolist(),
+            )
+        )
+
+
+def _write_event_rows(writer, events: Iterable) -> None:
+    for event in events:
+        writer.writerow(
+            [
+                event.packet_start_us,
+                event.wave_id,
+                event.sender_id,
+                event.packet_index_for_sender,
+                event.packet_size_bytes,
+                event.traffic_class.value,
+                event.priority_tag,
+            ]
+        )
+
+
+def export_events_to_csv(events: Iterable | TrafficBatch, output_path: Path) -> Path:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", newline="", encoding="utf-8") as csv_file:
         writer = csv.writer(csv_file)
         writer.writerow(TRACE_COLUMNS)
-        for event in events:
-            writer.writerow(
-                [
-                    event.packet_start_us,
-                    event.wave_id,
-                    event.sender_id,
-                    event.packet_index_for_sender,
-                    event.packet_size_bytes,
-                    event.traffic_class.value,
-                    event.priority_tag,
-                ]
-            )
+        if isinstance(events, TrafficBatch):
+            _write_batch_rows(writer, events)
+        else:
+            _write_event_rows(writer, events)
+    return output_path
+
+
+def export_chunks_to_csv(chunks: Iterable[Iterable | TrafficBatch], output_path: Path) -> Path:
+    """
+    Write chunks as they arrive, so only one chunk is held in memory at a time.
+
+    If a chunk (or a validating wrapper such as iter_validated) raises, the partial file is
+    removed before the error propagates.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with output_path.open("w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(TRACE_COLUMNS)
+            for chunk in chunks:
+                if isinstance(chunk, TrafficBatch):
+                    _write_batch_rows(writer, chunk)
+                else:
+                    _write_event_rows(writer, chunk)
+    except BaseException:
+        output_path.unlink(missing_ok=True)
+        raise
     return output_path
 
 
@@ -65,13 +131,103 @@ def generate_and_export_csv(
     scenario_name: ScenarioName | None = None,
     output_dir: Path = DEFAULT_TRACE_DIR,
     validate: bool = True,
+    validation_mode: str = "full",
+    stream: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    profiler: Optional[StageProfiler] = None,
+    cache: Optional[TraceCache] = None,
 ) -> Path:
-    events: TrafficEvents = generate_traffic(config)
-    if validate:
-        validate_generated_traffic(events, config)
+    """
+    Generate, validate and write one trace.
+
+    With stream=True events are generated, validated (StreamingValidator) and written chunk by
+    chunk, so memory stays bounded by chunk_size rather than the trace length. The streaming
+    generator is fused, so a profiler reports its chunks as materialization.
+
+    With a cache, the trace is copied out of it and only generated on a miss. A miss builds
+    the whole trace in memory, so a cache cannot be combined with stream=True.
+
+    validation_mode is passed to validate_generated_traffic; streaming always validates every
+    chunk, so it only accepts "full".
+    """
     output_path = build_trace_path(
         config=config,
         scenario_name=scenario_name,
         output_dir=output_dir,
     )
-    return export_events_to_csv(events, output_path)
+    if cache is not None:
+        if stream:
+            raise ValueError("stream=True cannot be combined with a trace cache")
+        cache.copy_to(
+            config,
+            output_path,
+            validate=validate,
+            validation_mode=validation_mode,
+            profiler=profiler,
+        )
+        return output_path
+    if stream:
+        if validation_mode != "full":
+            raise ValueError("stream=True only supports validation_mode='full'")
+        chunks = profile_iter(
+            profiler,
+            "materialization",
+            (
+                TrafficBatch.from_events(chunk)
+                for chunk in iter_traffic_chunks(config, chunk_size)
+            ),
+        )
+        if validate:
+            chunks = profile_iter(profiler, "validation", iter_validated(chunks, config))
+        with profile_stage(profiler, "export") as stage:
+            return export_chunks_to_csv(stage.counted(chunks), output_path)
+
+    events = generate_traffic_batch(config, profiler=profiler)
+    if validate:
+        with profile_stage(profiler, "validation", len(events)):
+            validate_generated_traffic(events, config, mode=validation_mode)
+    with profile_stage(profiler, "export", len(events)):
+        return export_events_to_csv(events, output_path)
+
+
+def parse_trace_rows(lines: Iterable[bytes | str]) -> TrafficBatch:
+    """Parse header-less CSV trace rows (as written by export_events_to_csv) into a batch."""
+    rows = [
+        (line.decode("utf-8") if isinstance(line, bytes) else line).rstrip("\r\n").split(",")
+        for line in lines
+    ]
+    rows = [row for row in rows if row != [""]]
+    for line_no, row in enumerate(rows, start=1):
+        if len(row) != len(TRACE_COLUMNS):
+            raise ValueError(
+                f"Invalid CSV trace row {line_no}: expected {len(TRACE_COLUMNS)} fields, "
+                f"got {len(row)}"
+            )
+    class_codes = {
+        traffic_class.value: code for traffic_class, code in TRAFFIC_CLASS_CODES.items()
+    }
+    columns = {}
+    for position, name in enumerate(TRACE_COLUMNS):
+        values = [row[position] for row in rows]
+        if name == "traffic_class":
+            values = [class_codes[value] for value in values]
+        columns[name] = np.array(values, dtype=COLUMN_DTYPES[name]).reshape(-1)
+    return TrafficBatch(**columns)
+
+
+def read_trace_csv(path: Path, chunk_rows: int = CSV_READ_CHUNK_ROWS) -> TrafficBatch:
+    """Read a whole CSV trace back into a TrafficBatch, parsing chunk_rows lines at a time."""
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be > 0")
+    with path.open("r", newline="", encoding="utf-8") as csv_file:
+        header = tuple(csv_file.readline().rstrip("\r\n").split(","))
+        if header != TRACE_COLUMNS:
+            raise ValueError(f"Invalid CSV trace header in {path}: {','.join(header)}")
+        batches = []
+        while True:
+            lines = list(islice(csv_file, chunk_rows))
+            if not lines:
+                break
+            batches.append(parse_trace_rows(lines))
+    return concat_batches(batches)
+
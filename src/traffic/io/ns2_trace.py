@@ -0,0 +1,204 @@
+"""Chunked reader for the standard ns-2 wired trace format into typed NumPy columns."""
+
+from __future__ import annotations
+
+from functools import cached_property
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+
+# <action> <time> <from> <to> <type> <size> <flags> <fid> <src.port> <dst.port> <seq> <pkt_id>
+NS2_FIELDS = 12
+# Shorter lines are not records. 11-field lines (no pkt_id) are kept, as analyze_trace.py always
+# did, with packet_id MISSING_PACKET_ID; fields past the twelfth are ignored.
+MIN_NS2_FIELDS = 11
+MISSING_PACKET_ID = -1
+NS2_ACTIONS = ("+", "-", "r", "d")
+ENQUEUE, DEQUEUE, RECEIVE, DROP = range(len(NS2_ACTIONS))
+OTHER_ACTION = 0xFF
+
+NS2_COLUMNS = (
+    "action",
+    "time_s",
+    "from_node",
+    "to_node",
+    "packet_type",
+    "size_bytes",
+    "flow_id",
+    "seq",
+    "packet_id",
+)
+
+DEFAULT_CHUNK_BYTES = 4 * 1024**2
+
+_MISSING_PACKET_ID_TOKEN = str(MISSING_PACKET_ID).encode()
+
+
+def _fields_per_line(block: bytes) -> np.ndarray:
+    """Number of whitespace-separated fields on each line of block."""
+    data = np.frombuffer(block, dtype=np.uint8)
+    # The separators of bytes.split(): space and \t \n \v \f \r (9..13; uint8 wraps below 9).
+    separator = (data == 32) | ((data - 9) <= 4)
+    token_starts = np.flatnonzero(separator[:-1] & ~separator[1:]) + 1
+    if data.shape[0] and not separator[0]:
+        token_starts = np.concatenate(([0], token_starts))
+    line_ends = np.flatnonzero(data == ord("\n"))
+    if not block.endswith(b"\n"):
+        line_ends = np.append(line_ends, data.shape[0])
+    return np.diff(np.searchsorted(token_starts, line_ends), prepend=0)
+
+
+def _record_tokens(block: bytes) -> list[bytes]:
+    """Flat list of NS2_FIELDS tokens per record line (see MIN_NS2_FIELDS)."""
+    if not block:
+        return []
+    fields_per_line = _fields_per_line(block)
+    if (fields_per_line == NS2_FIELDS).all():
+        # Fast path: every line is a standard record, so the flat split is already aligned.
+        return block.split()
+
+    records: list[bytes] = []
+    for line in block.split(b"\n"):
+        fields = line.split()
+        if len(fields) >= NS2_FIELDS:
+            records.extend(fields[:NS2_FIELDS])
+        elif len(fields) == MIN_NS2_FIELDS:
+            records.extend(fields)
+            records.append(_MISSING_PACKET_ID_TOKEN)
+    return records
+
+
+class Ns2Chunk:
+    """
+    One block of trace lines, exposed as typed columns.
+
+    Columns are parsed from the block's tokens on first access, so a pass that needs only a
+    few fields (e.g. action, time and size for a summary) never converts the rest. action holds
+    ENQUEUE/DEQUEUE/RECEIVE/DROP (OTHER_ACTION for anything else); packet_type indexes
+    packet_types, a vocabulary shared by every chunk of one iter_ns2_chunks call that only
+    grows, so codes are stable across chunks.
+    """
+
+    def __init__(self, tokens: list[bytes], packet_types: list[str]) -> None:
+        self._tokens = tokens
+        self._packet_types = packet_types
+        self._count = len(tokens) // NS2_FIELDS
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _field(self, index: int, dtype, parse=int) -> np.ndarray:
+        return np.fromiter(
+            map(parse, self._tokens[index::NS2_FIELDS]), dtype=dtype, count=self._count
+        )
+
+    @property
+    def packet_types(self) -> tuple[str, ...]:
+        return tuple(self._packet_types)
+
+    @cached_property
+    def action(self) -> np.ndarray:
+        action_names = np.array(self._tokens[0::NS2_FIELDS], dtype="S2")
+        action = np.full(self._count, OTHER_ACTION, dtype=np.uint8)
+        for code, symbol in enumerate(NS2_ACTIONS):
+            action[action_names == symbol.encode()] = code
+        return action
+
+    @cached_property
+    def time_s(self) -> np.ndarray:
+        return self._field(1, np.float64, float)
+
+    @cached_property
+    def from_node(self) -> np.ndarray:
+        return self._field(2, np.int32)
+
+    @cached_property
+    def to_node(self) -> np.ndarray:
+        return self._field(3, np.int32)
+
+    @cached_property
+    def packet_type(self) -> np.ndarray:
+        type_names, type_inverse = np.unique(
+            np.array(self._tokens[4::NS2_FIELDS], dtype=bytes), return_inverse=True
+        )
+        type_codes = np.empty(type_names.shape[0], dtype=np.uint16)
+        for index, raw_name in enumerate(type_names.tolist()):
+            name = raw_name.decode()
+            if name not in self._packet_types:
+                self._packet_types.append(name)
+            type_codes[index] = self._packet_types.index(name)
+        return type_codes[type_inverse.reshape(-1)]
+
+    @cached_property
+    def size_bytes(self) -> np.ndarray:
+        return self._field(5, np.uint32)
+
+    @cached_property
+    def flow_id(self) -> np.ndarray:
+        return self._field(7, np.int32)
+
+    @cached_property
+    def seq(self) -> np.ndarray:
+        return self._field(10, np.int64)
+
+    @cached_property
+    def packet_id(self) -> np.ndarray:
+        return self._field(11, np.int64)
+
+
+def parse_ns2_block(block: bytes, packet_types: list[str]) -> Ns2Chunk:
+    """Wrap complete trace lines; lines with fewer than MIN_NS2_FIELDS fields are skipped."""
+    return Ns2Chunk(_record_tokens(block), packet_types)
+
+
+def iter_line_blocks(path: Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[bytes]:
+    """Yield roughly chunk_bytes-sized blocks of whole lines; memory stays O(chunk_bytes)."""
+    if chunk_bytes <= 0:
+        raise ValueError("chunk_bytes must be > 0")
+
+    with Path(path).open("rb") as trace_file:
+        carry = b""
+        while True:
+            data = trace_file.read(chunk_bytes)
+            if not data:
+                break
+            data = carry + data
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                carry = data
+                continue
+            carry = data[cut:]
+            yield data[:cut]
+        if carry.strip():
+            yield carry
+
+
+def iter_ns2_chunks(path: Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[Ns2Chunk]:
+    """Yield non-empty chunks of about chunk_bytes of trace text, sharing one type vocabulary."""
+    packet_types: list[str] = []
+    for block in iter_line_blocks(path, chunk_bytes):
+        chunk = parse_ns2_block(block, packet_types)
+        if len(chunk):
+            yield chunk
+
+
+def read_ns2_trace(path: Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> dict[str, np.ndarray]:
+    """
+    Whole trace as NS2_COLUMNS arrays plus "packet_types" (the type vocabulary).
+
+    Prefer iter_ns2_chunks for traces larger than memory.
+    """
+    packet_types: list[str] = []
+    columns: dict[str, list[np.ndarray]] = {name: [] for name in NS2_COLUMNS}
+    for block in iter_line_blocks(path, chunk_bytes):
+        chunk = parse_ns2_block(block, packet_types)
+        for name in NS2_COLUMNS:
+            columns[name].append(getattr(chunk, name))
+    if not columns["action"]:
+        empty = parse_ns2_block(b"", packet_types)
+        columns = {name: [getattr(empty, name)] for name in NS2_COLUMNS}
+    trace = {name: np.concatenate(parts) for name, parts in columns.items()}
+    trace["packet_types"] = np.array(packet_types, dtype=str)
+    return trace
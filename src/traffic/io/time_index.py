@@ -0,0 +1,250 @@
+"""Sidecar time indexes that let readers seek straight to a time window of a text trace.
+
+An index records, for every `interval` of trace time, the byte offset of the first line at or
+after that mark. It is stored next to the trace as `<trace name>.tidx.npz` together with the
+trace's size and mtime, so a stale index is detected and rebuilt. Both supported formats are
+sorted by time: ns-2 `.tr` traces (seconds, second field) and traffic.io CSV traces
+(packet_start_us, first column, one header line).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from traffic.columnar import TrafficBatch
+from traffic.io.csv_export import parse_trace_rows
+from traffic.io.ns2_trace import DEFAULT_CHUNK_BYTES, Ns2Chunk, parse_ns2_block
+
+
+TIME_INDEX_SUFFIX = ".tidx.npz"
+TIME_INDEX_VERSION = 1
+
+NS2_KIND = "ns2"
+CSV_KIND = "csv"
+# Default spacing between index entries, in each format's own time unit.
+DEFAULT_INTERVALS = {
+    NS2_KIND: 0.1,
+    CSV_KIND: 1_000,
+}
+
+
+@dataclass(frozen=True, eq=False)
+class TimeIndex:
+    """times[i] is the time of the line at byte offsets[i], the first at or after mark i."""
+
+    kind: str
+    interval: float
+    data_offset: int
+    times: np.ndarray
+    offsets: np.ndarray
+    trace_size: int
+    trace_mtime_ns: int
+
+    def seek_offset(self, start: float) -> int:
+        """Byte offset from which every line with time >= start can be read."""
+        # Lines before entry i are earlier than its mark, and the mark is <= times[i].
+        position = int(np.searchsorted(self.times, start, side="right")) - 1
+        return int(self.offsets[position]) if position >= 0 else self.data_offset
+
+
+def time_index_path(trace_path: Path) -> Path:
+    return trace_path.with_name(trace_path.name + TIME_INDEX_SUFFIX)
+
+
+def _infer_kind(trace_path: Path, kind: Optional[str]) -> str:
+    if kind is None:
+        kind = CSV_KIND if trace_path.suffix == ".csv" else NS2_KIND
+    if kind not in DEFAULT_INTERVALS:
+        allowed = ", ".join(DEFAULT_INTERVALS)
+        raise ValueError(f"Unknown trace kind '{kind}'. Choose one of: {allowed}")
+    return kind
+
+
+def _line_time(kind: str):
+    if kind == CSV_KIND:
+        def parse(line: bytes) -> float:
+            return float(line.split(b",", 1)[0])
+    else:
+        def parse(line: bytes) -> float:
+            return float(line.split(None, 2)[1])
+
+    def safe_parse(line: bytes) -> float:
+        try:
+            return parse(line)
+        except (IndexError, ValueError):
+            return np.nan
+
+    return safe_parse
+
+
+def _data_offset(trace_path: Path, kind: str) -> int:
+    if kind != CSV_KIND:
+        return 0
+    with trace_path.open("rb") as trace_file:
+        return len(trace_file.readline())
+
+
+def _iter_timed_lines(
+    trace_path: Path, kind: str, offset: int, chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> Iterator[tuple[list[bytes], np.ndarray, np.ndarray]]:
+    """Yield (lines, line start offsets, line times) for blocks of whole lines from offset."""
+    parse = _line_time(kind)
+    with trace_path.open("rb") as trace_file:
+        trace_file.seek(offset)
+        carry = b""
+        while True:
+            data = trace_file.read(chunk_bytes)
+            at_end = not data
+            data = carry + data
+            cut = len(data) if at_end else data.rfind(b"\n") + 1
+            if cut == 0 and not at_end:
+                carry = data
+                continue
+            block, carry = data[:cut], data[cut:]
+            lines = block.splitlines(keepends=True)
+            if lines:
+                lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+                starts = offset + np.concatenate(([0], np.cumsum(lengths)[:-1]))
+                times = np.fromiter(map(parse, lines), dtype=np.float64, count=len(lines))
+                yield lines, starts, times
+            offset += len(block)
+            if at_end:
+                return
+
+
+def build_time_index(
+    trace_path: Path,
+    *,
+    kind: Optional[str] = None,
+    interval: Optional[float] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> TimeIndex:
+    """Scan the trace once, then write and return its sidecar index."""
+    trace_path = Path(trace_path)
+    kind = _infer_kind(trace_path, kind)
+    interval = DEFAULT_INTERVALS[kind] if interval is None else interval
+    if interval <= 0:
+        raise ValueError("interval must be > 0")
+
+    stat = trace_path.stat()
+    data_offset = _data_offset(trace_path, kind)
+    times: list[np.ndarray] = []
+    offsets: list[np.ndarray] = []
+    last_mark = -np.inf
+    for _, starts, line_times in _iter_timed_lines(trace_path, kind, data_offset, chunk_bytes):
+        timed = ~np.isnan(line_times)
+        marks = np.floor(line_times[timed] / interval)
+        # Running max keeps entries monotonic even if a stray line is out of order.
+        running = np.maximum.accumulate(np.concatenate(([last_mark], marks)))
+        is_entry = running[1:] > running[:-1]
+        times.append(line_times[timed][is_entry])
+        offsets.append(starts[timed][is_entry])
+        last_mark = running[-1]
+
+    index = TimeIndex(
+        kind=kind,
+        interval=float(interval),
+        data_offset=data_offset,
+        times=np.concatenate(times) if times else np.empty(0),
+        offsets=np.concatenate(offsets) if offsets else np.empty(0, dtype=np.int64),
+        trace_size=stat.st_size,
+        trace_mtime_ns=stat.st_mtime_ns,
+    )
+    _save_time_index(index, time_index_path(trace_path))
+    return index
+
+
+def _save_time_index(index: TimeIndex, path: Path) -> None:
+    tmp_path = path.with_name(f".tmp-{os.getpid()}-{path.name}")
+    with tmp_path.open("wb") as index_file:
+        np.savez(
+            index_file,
+            version=TIME_INDEX_VERSION,
+            kind=index.kind,
+            interval=index.interval,
+            data_offset=index.data_offset,
+            times=index.times,
+            offsets=index.offsets,
+            trace_size=index.trace_size,
+            trace_mtime_ns=index.trace_mtime_ns,
+        )
+    os.replace(tmp_path, path)
+
+
+def load_time_index(
+    trace_path: Path,
+    *,
+    kind: Optional[str] = None,
+    interval: Optional[float] = None,
+) -> TimeIndex:
+    """Load the sidecar, (re)building it when missing, stale or built with other settings."""
+    trace_path = Path(trace_path)
+    kind = _infer_kind(trace_path, kind)
+    index_path = time_index_path(trace_path)
+    if index_path.exists():
+        stat = trace_path.stat()
+        with np.load(index_path) as data:
+            fresh = (
+                int(data["version"]) == TIME_INDEX_VERSION
+                and str(data["kind"]) == kind
+                and (interval is None or float(data["interval"]) == interval)
+                and int(data["trace_size"]) == stat.st_size
+                and int(data["trace_mtime_ns"]) == stat.st_mtime_ns
+            )
+            if fresh:
+                return TimeIndex(
+                    kind=kind,
+                    interval=float(data["interval"]),
+                    data_offset=int(data["data_offset"]),
+                    times=data["times"],
+                    offsets=data["offsets"],
+                    trace_size=stat.st_size,
+                    trace_mtime_ns=stat.st_mtime_ns,
+                )
+    return build_time_index(trace_path, kind=kind, interval=interval)
+
+
+def read_window_lines(
+    trace_path: Path,
+    start: float,
+    end: float,
+    *,
+    index: Optional[TimeIndex] = None,
+) -> list[bytes]:
+    """Raw lines with start <= time < end, reading only from the indexed offset onwards."""
+    if end <= start:
+        raise ValueError("end must be > start")
+    trace_path = Path(trace_path)
+    if index is None:
+        index = load_time_index(trace_path)
+
+    window: list[bytes] = []
+    for lines, _, times in _iter_timed_lines(
+        trace_path, index.kind, index.seek_offset(start), DEFAULT_CHUNK_BYTES // 16
+    ):
+        # NaN (untimed) lines compare False and are dropped.
+        window.extend(line for line, time in zip(lines, times.tolist()) if start <= time < end)
+        if np.nanmax(times, initial=-np.inf) >= end:
+            break
+    return window
+
+
+def read_ns2_window(
+    trace_path: Path, start_s: float, end_s: float, *, index: Optional[TimeIndex] = None
+) -> Ns2Chunk:
+    """ns-2 records with start_s <= time < end_s as typed columns."""
+    lines = read_window_lines(trace_path, start_s, end_s, index=index)
+    return parse_ns2_block(b"".join(lines), [])
+
+
+def read_csv_window(
+    trace_path: Path, start_us: int, end_us: int, *, index: Optional[TimeIndex] = None
+) -> TrafficBatch:
+    """Generated-trace rows with start_us <= packet_start_us < end_us as a TrafficBatch."""
+    lines = read_window_lines(trace_path, start_us, end_us, index=index)
+    return parse_trace_rows(lines)
@@ -0,0 +1,189 @@
+"""Content-addressed on-disk cache of exported traces, keyed by the full TrafficConfig."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Optional
+
+from traffic.config import TrafficConfig, config_fingerprint
+from traffic.generator import GENERATOR_VERSION, generate_traffic_batch
+from traffic.io.binary_trace import BINARY_TRACE_SUFFIX, export_events_to_binary
+from traffic.io.csv_export import DEFAULT_TRACE_DIR, export_events_to_csv
+from traffic.profiling import StageProfiler, profile_stage
+from traffic.validate import validate_generated_traffic
+
+
+DEFAULT_CACHE_DIR = DEFAULT_TRACE_DIR / "cache"
+DEFAULT_CACHE_MAX_BYTES = 4 * 1024**3
+
+TRACE_FORMAT_SUFFIXES = {
+    "csv": ".csv",
+    "binary": BINARY_TRACE_SUFFIX,
+}
+
+
+@dataclass
+class TraceCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    evicted_bytes: int = 0
+
+
+@dataclass(frozen=True)
+class CachedTrace:
+    path: Path
+    hit: bool
+
+
+def trace_cache_key(config: TrafficConfig, trace_format: str = "csv") -> str:
+    """Stable key over every config field, the generator version and the file format."""
+    if trace_format not in TRACE_FORMAT_SUFFIXES:
+        allowed = ", ".join(sorted(TRACE_FORMAT_SUFFIXES))
+        raise ValueError(f"Unknown trace_format '{trace_format}'. Choose one of: {allowed}")
+    payload = f"{config_fingerprint(config)}:{GENERATOR_VERSION}:{trace_format}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TraceCache:
+    """
+    Directory of traces named by trace_cache_key.
+
+    Entries are written to a temporary file and renamed into place, so readers never see a
+    partial trace. A hit refreshes the entry's mtime, and after every write the least recently
+    used entries are removed until the directory fits in max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DEFAULT_CACHE_DIR,
+        *,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = TraceCacheStats()
+
+    def path_for(self, config: TrafficConfig, trace_format: str = "csv") -> Path:
+        key = trace_cache_key(config, trace_format)
+        return self.directory / f"{key}{TRACE_FORMAT_SUFFIXES[trace_format]}"
+
+    def get_or_create(
+        self,
+        config: TrafficConfig,
+        *,
+        trace_format: str = "csv",
+        validate: bool = True,
+        validation_mode: str = "full",
+        profiler: Optional[StageProfiler] = None,
+    ) -> CachedTrace:
+        """The cached trace for config; only a miss generates, validates and writes it."""
+        path = self.path_for(config, trace_format)
+        if path.exists():
+            os.utime(path)
+            self.stats.hits += 1
+            return CachedTrace(path=path, hit=True)
+
+        self.stats.misses += 1
+        events = generate_traffic_batch(config, profiler=profiler)
+        if validate:
+            with profile_stage(profiler, "validation", len(events)):
+                validate_generated_traffic(events, config, mode=validation_mode)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_name = tempfile.mkstemp(
+            dir=self.directory, prefix=".tmp-", suffix=path.suffix
+        )
+        os.close(file_descriptor)
+        temporary_path = Path(temporary_name)
+        try:
+            with profile_stage(profiler, "export", len(events)):
+                if trace_format == "binary":
+                    export_events_to_binary(events, temporary_path, config=config)
+                else:
+                    export_events_to_csv(events, temporary_path)
+            os.replace(temporary_path, path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+        self.evict(keep=path)
+        return CachedTrace(path=path, hit=False)
+
+    def copy_to(
+        self,
+        config: TrafficConfig,
+        output_path: Path,
+        *,
+        trace_format: str = "csv",
+        validate: bool = True,
+        validation_mode: str = "full",
+        profiler: Optional[StageProfiler] = None,
+    ) -> CachedTrace:
+        """
+        get_or_create, then copy the entry to output_path.
+
+        The copy stays valid after the entry is evicted, and rewriting it never touches the
+        cache.
+        """
+        cached = self.get_or_create(
+            config,
+            trace_format=trace_format,
+            validate=validate,
+            validation_mode=validation_mode,
+            profiler=profiler,
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached.path, output_path)
+        return cached
+
+    def _entry_stats(self) -> list[tuple[Path, os.stat_result]]:
+        if not self.directory.exists():
+            return []
+        suffixes = set(TRACE_FORMAT_SUFFIXES.values())
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix not in suffixes or path.name.startswith(".tmp-"):
+                continue
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                # Evicted by another process sharing the directory (parallel sweep workers).
+                continue
+        return sorted(entries, key=lambda entry: entry[1].st_mtime_ns)
+
+    def entries(self) -> list[Path]:
+        """Cached trace files, least recently used first."""
+        return [path for path, _ in self._entry_stats()]
+
+    def total_bytes(self) -> int:
+        return sum(stat.st_size for _, stat in self._entry_stats())
+
+    def evict(self, *, keep: Path | None = None) -> list[Path]:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = self._entry_stats()
+        total = sum(stat.st_size for _, stat in entries)
+        evicted: list[Path] = []
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            evicted.append(path)
+            self.stats.evictions += 1
+            self.stats.evicted_bytes += stat.st_size
+        return evicted
+
+    def report(self) -> str:
+        return (
+            f"trace cache {self.directory}: hits={self.stats.hits} misses={self.stats.misses} "
+            f"evictions={self.stats.evictions} size={self.total_bytes()}/{self.max_bytes} bytes"
+        )
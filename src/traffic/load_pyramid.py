@@ -0,0 +1,204 @@
+"""Multi-resolution offered-load histograms (packets and bytes per bin, by traffic class)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .columnar import TRAFFIC_CLASS_BY_CODE, TrafficLike, as_batch
+from .config import TrafficConfig
+
+
+DEFAULT_LEVEL_FACTOR = 4
+# Caps the finest level (and so the whole pyramid) however long the trace runs.
+DEFAULT_MAX_BASE_BINS = 1 << 18
+DEFAULT_MAX_QUERY_BINS = 2_000
+# Events binned per pass; each pass only allocates bins for the time range it covers.
+BIN_CHUNK_EVENTS = 1 << 20
+
+NUMBER_OF_CLASSES = len(TRAFFIC_CLASS_BY_CODE)
+
+
+@dataclass(frozen=True, eq=False)
+class LoadWindow:
+    """Offered load over a time window; columns of packets/bytes follow TRAFFIC_CLASS_BY_CODE."""
+
+    bin_width_us: int
+    bin_edges_us: np.ndarray
+    packets: np.ndarray
+    bytes: np.ndarray
+
+
+@dataclass(frozen=True, eq=False)
+class LoadPyramid:
+    """
+    Offered load binned at bin_widths_us[0], [1], ... (each level factor x the previous).
+
+    packets[level] and bytes[level] have shape (bins, NUMBER_OF_CLASSES); bin i of a level
+    covers [origin_us + i * width, origin_us + (i + 1) * width). Coarser levels are exact sums
+    of the finer ones, so any window can be answered without touching the events again.
+    """
+
+    origin_us: int
+    bin_widths_us: tuple[int, ...]
+    packets: tuple[np.ndarray, ...]
+    bytes: tuple[np.ndarray, ...]
+
+    @property
+    def end_us(self) -> int:
+        """End of the last bin; levels are padded to whole top-level bins past the last packet."""
+        return self.origin_us + self.packets[0].shape[0] * self.bin_widths_us[0]
+
+    def level_for(self, window_us: int, max_bins: int = DEFAULT_MAX_QUERY_BINS) -> int:
+        """Finest level that spans window_us in at most max_bins bins (else the coarsest)."""
+        if max_bins <= 0:
+            raise ValueError("max_bins must be > 0")
+        for level, width in enumerate(self.bin_widths_us):
+            if math.ceil(window_us / width) <= max_bins:
+                return level
+        return len(self.bin_widths_us) - 1
+
+    def query(
+        self,
+        start_us: int,
+        end_us: int,
+        *,
+        max_bins: int = DEFAULT_MAX_QUERY_BINS,
+        level: Optional[int] = None,
+    ) -> LoadWindow:
+        """Bins of one level covering [start_us, end_us), widened to that level's bin grid."""
+        if end_us <= start_us:
+            raise ValueError("end_us must be > start_us")
+        if level is None:
+            level = self.level_for(end_us - start_us, max_bins)
+        width = self.bin_widths_us[level]
+        number_of_bins = self.packets[level].shape[0]
+
+        first_bin = min(max((start_us - self.origin_us) // width, 0), number_of_bins)
+        last_bin = min(max(-(-(end_us - self.origin_us) // width), first_bin), number_of_bins)
+        bin_indices = np.arange(first_bin, last_bin + 1, dtype=np.int64)
+        return LoadWindow(
+            bin_width_us=width,
+            bin_edges_us=self.origin_us + bin_indices * width,
+            packets=self.packets[level][first_bin:last_bin],
+            bytes=self.bytes[level][first_bin:last_bin],
+        )
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as npz_file:
+            np.savez_compressed(
+                npz_file,
+                origin_us=np.int64(self.origin_us),
+                bin_widths_us=np.asarray(self.bin_widths_us, dtype=np.int64),
+                # Only the finest level is stored; coarser ones are rebuilt exactly on load.
+                packets=self.packets[0],
+                bytes=self.bytes[0],
+            )
+        return path
+
+    @classmethod
+    def from_finest(
+        cls, origin_us: int, bin_widths_us: Sequence[int], packets: np.ndarray, bytes: np.ndarray
+    ) -> "LoadPyramid":
+        """Rebuild every level from the finest one, as stored by save()."""
+        bin_widths_us = tuple(int(width) for width in bin_widths_us)
+        return cls(
+            origin_us=int(origin_us),
+            bin_widths_us=bin_widths_us,
+            packets=_coarsen(packets, bin_widths_us),
+            bytes=_coarsen(bytes, bin_widths_us),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "LoadPyramid":
+        with np.load(path) as data:
+            return cls.from_finest(
+                data["origin_us"], data["bin_widths_us"], data["packets"], data["bytes"]
+            )
+
+
+def _coarsen(finest: np.ndarray, bin_widths_us: tuple[int, ...]) -> tuple[np.ndarray, ...]:
+    levels = [finest]
+    for previous_width, width in zip(bin_widths_us, bin_widths_us[1:]):
+        factor = width // previous_width
+        levels.append(levels[-1].reshape(-1, factor, NUMBER_OF_CLASSES).sum(axis=1))
+    return tuple(levels)
+
+
+def build_load_pyramid(
+    events: TrafficLike,
+    config: Optional[TrafficConfig] = None,
+    *,
+    base_bin_us: Optional[int] = None,
+    factor: int = DEFAULT_LEVEL_FACTOR,
+    top_bin_us: Optional[int] = None,
+    origin_us: Optional[int] = None,
+    max_base_bins: int = DEFAULT_MAX_BASE_BINS,
+) -> LoadPyramid:
+    """
+    Bin a trace once at base_bin_us and sum upward until a bin is at least top_bin_us wide.
+
+    base_bin_us defaults to the finest factor**k us width that covers the trace in at most
+    max_base_bins bins, so memory is bounded by max_base_bins rather than the trace span.
+    top_bin_us defaults to config.wave_interval_us (or the trace span without a config), and
+    origin_us to config.first_wave_start_us (or the first packet).
+    """
+    if base_bin_us is not None and base_bin_us <= 0:
+        raise ValueError("base_bin_us must be > 0")
+    if factor < 2:
+        raise ValueError("factor must be >= 2")
+    if max_base_bins <= 0:
+        raise ValueError("max_base_bins must be > 0")
+
+    batch = as_batch(events)
+    packet_start_us = batch.packet_start_us
+    if origin_us is None:
+        if config is not None:
+            origin_us = config.first_wave_start_us
+        else:
+            origin_us = int(packet_start_us.min()) if len(batch) else 0
+    if len(batch) and int(packet_start_us.min()) < origin_us:
+        raise ValueError("origin_us must be <= every packet_start_us")
+
+    span_us = int(packet_start_us.max()) - origin_us + 1 if len(batch) else 1
+    if top_bin_us is None:
+        top_bin_us = config.wave_interval_us if config is not None else span_us
+    if base_bin_us is None:
+        base_bin_us = 1
+        while math.ceil(span_us / base_bin_us) > max_base_bins:
+            base_bin_us *= factor
+
+    bin_widths_us = [base_bin_us]
+    while bin_widths_us[-1] < top_bin_us:
+        bin_widths_us.append(bin_widths_us[-1] * factor)
+
+    # Pad the finest level so every coarser level is an exact reshape-and-sum.
+    top_ratio = bin_widths_us[-1] // base_bin_us
+    number_of_bins = -(-math.ceil(span_us / base_bin_us) // top_ratio) * top_ratio
+
+    packets = np.zeros(number_of_bins * NUMBER_OF_CLASSES, dtype=np.int64)
+    packet_bytes = np.zeros(number_of_bins * NUMBER_OF_CLASSES, dtype=np.int64)
+    for start in range(0, len(batch), BIN_CHUNK_EVENTS):
+        chunk = batch[start : start + BIN_CHUNK_EVENTS]
+        slots = ((chunk.packet_start_us - origin_us) // base_bin_us) * NUMBER_OF_CLASSES
+        slots += chunk.traffic_class
+        # Traces are in time order, so a chunk's slots span a short range starting at low.
+        low = int(slots.min())
+        slots -= low
+        chunk_packets = np.bincount(slots)
+        packets[low : low + chunk_packets.shape[0]] += chunk_packets
+        # Per-chunk byte sums stay far below 2**53, so the float64 bincount is exact.
+        chunk_bytes = np.bincount(slots, weights=chunk.packet_size_bytes)
+        packet_bytes[low : low + chunk_bytes.shape[0]] += chunk_bytes.astype(np.int64)
+
+    return LoadPyramid.from_finest(
+        origin_us,
+        bin_widths_us,
+        packets.reshape(-1, NUMBER_OF_CLASSES),
+        packet_bytes.reshape(-1, NUMBER_OF_CLASSES),
+    )
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from typing import Iterable, Iterator
 
-from .packetizer import PacketEvent
+from .packetizer import PacketBurst, PacketEvent
 
 
 class TrafficClass(Enum):
@@ -22,18 +23,41 @@ class ClassifiedPacketEvent:
     priority_tag: int
 
 
+@dataclass(frozen=True)
+class ClassifiedPacketBurst:
+    """A PacketBurst plus its position in the global packet order and its classification."""
+
+    burst: PacketBurst
+    first_packet_index: int
+    control_packet_count: int
+    control_priority_tag: int
+    bulk_priority_tag: int
+
+
+def count_control_packets(
+    *, first_packet_index: int, packet_count: int, control_packet_every_n: int
+) -> int:
+    """Number of multiples of control_packet_every_n in [first, first + packet_count)."""
+
+    def ceil_div(numerator: int) -> int:
+        return -(-numerator // control_packet_every_n)
+
+    return ceil_div(first_packet_index + packet_count) - ceil_div(first_packet_index)
+
+
 def classify_packets(
     *,
     packet_events: list[PacketEvent],
     control_packet_every_n: int,
     control_priority_tag: int = 46,
     bulk_priority_tag: int = 0,
+    first_packet_index: int = 0,
 ) -> list[ClassifiedPacketEvent]:
     if control_packet_every_n <= 0:
         raise ValueError("control_packet_every_n must be > 0")
 
     classified_events: list[ClassifiedPacketEvent] = []
-    for packet_index, packet_event in enumerate(packet_events):
+    for packet_index, packet_event in enumerate(packet_events, start=first_packet_index):
         is_control = packet_index % control_packet_every_n == 0
         traffic_class = TrafficClass.CONTROL if is_control else TrafficClass.BULK
         priority_tag = control_priority_tag if is_control else bulk_priority_tag
@@ -51,3 +75,53 @@ def classify_packets(
         )
 
     return classified_events
+
+
+def classify_bursts(
+    *,
+    bursts: list[PacketBurst],
+    control_packet_every_n: int,
+    control_priority_tag: int = 46,
+    bulk_priority_tag: int = 0,
+    first_packet_index: int = 0,
+) -> list[ClassifiedPacketBurst]:
+    """Burst counterpart of classify_packets; CONTROL counts follow in closed form."""
+    if control_packet_every_n <= 0:
+        raise ValueError("control_packet_every_n must be > 0")
+
+    classified_bursts: list[ClassifiedPacketBurst] = []
+    packet_index = first_packet_index
+    for burst in bursts:
+        packet_count = burst.packet_count
+        classified_bursts.append(
+            ClassifiedPacketBurst(
+                burst=burst,
+                first_packet_index=packet_index,
+                control_packet_count=count_control_packets(
+                    first_packet_index=packet_index,
+                    packet_count=packet_count,
+                    control_packet_every_n=control_packet_every_n,
+                ),
+                control_priority_tag=control_priority_tag,
+                bulk_priority_tag=bulk_priority_tag,
+            )
+        )
+        packet_index += packet_count
+
+    return classified_bursts
+
+
+def iter_classified_burst_packets(
+    *,
+    classified_bursts: Iterable[ClassifiedPacketBurst],
+    control_packet_every_n: int,
+) -> Iterator[ClassifiedPacketEvent]:
+    """Lazily expand classified bursts into the events classify_packets would have emitted."""
+    for classified_burst in classified_bursts:
+        yield from classify_packets(
+            packet_events=list(classified_burst.burst.expand()),
+            control_packet_every_n=control_packet_every_n,
+            control_priority_tag=classified_burst.control_priority_tag,
+            bulk_priority_tag=classified_burst.bulk_priority_tag,
+            first_packet_index=classified_burst.first_packet_index,
+        )
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from enum import Enum
+import heapq
 import random
+from typing import Iterator, Optional
+
+
+_MASK64 = (1 << 64) - 1
 
 
 @dataclass(frozen=True)
@@ -11,15 +17,48 @@ class WaveStart:
     sender_start_us: int
 
 
-def generate_wave_starts(
+class JitterScheme(Enum):
+    # One random.Random(seed) stream consumed wave-major; wave k depends on waves 0..k-1.
+    SEQUENTIAL = "sequential"
+    # Each wave draws from its own random.Random(derive_wave_seed(seed, wave_id)).
+    PER_WAVE = "per_wave"
+    # Each (seed, wave_id, sender_id) offset is a pure hash; see counter_start_offset.
+    COUNTER = "counter"
+
+
+def _splitmix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def derive_wave_seed(seed: int, wave_id: int) -> int:
+    """Independent 64-bit seed for one wave, stable across processes and Python versions."""
+    return _splitmix64((_splitmix64(seed & _MASK64) + wave_id) & _MASK64)
+
+
+def counter_start_offset(
+    *, seed: int, wave_id: int, sender_id: int, max_start_offset_us: int
+) -> int:
+    """
+    Counter-based jitter: one SplitMix64 step keyed by (wave seed, sender_id).
+
+    Any single value is computable in O(1) without drawing the ones before it. The modulo
+    bias is at most (max_start_offset_us + 1) / 2**64.
+    """
+    counter = (derive_wave_seed(seed, wave_id) + sender_id) & _MASK64
+    return _splitmix64(counter) % (max_start_offset_us + 1)
+
+
+def validate_wave_schedule_args(
     *,
     senders_per_wave: int,
     number_of_waves: int,
     first_wave_start_us: int,
     wave_interval_us: int,
-    max_start_offset_us: int = 0,
-    seed: int = 0,
-) -> list[WaveStart]:
+    max_start_offset_us: int,
+) -> None:
     if senders_per_wave <= 0:
         raise ValueError("senders_per_wave must be > 0")
     if number_of_waves <= 0:
@@ -31,21 +70,180 @@ def generate_wave_starts(
     if max_start_offset_us < 0:
         raise ValueError("max_start_offset_us must be >= 0")
 
-    jitter_rng = random.Random(seed)
-    schedule: list[WaveStart] = []
 
-    for wave_id in range(number_of_waves):
-        wave_start_us = first_wave_start_us + wave_id * wave_interval_us
-        for sender_id in range(senders_per_wave):
-            start_offset_us = jitter_rng.randint(0, max_start_offset_us)
-            sender_start_us = wave_start_us + start_offset_us
-            schedule.append(
-                WaveStart(
+def resolve_wave_range(number_of_waves: int, wave_range: Optional[range]) -> range:
+    if wave_range is None:
+        return range(number_of_waves)
+    if wave_range.step != 1:
+        raise ValueError("wave_range must have step 1")
+    if wave_range.start < 0 or wave_range.stop > number_of_waves:
+        raise ValueError(f"wave_range must lie within range(0, {number_of_waves})")
+    return wave_range
+
+
+def iter_start_offsets(
+    *,
+    senders_per_wave: int,
+    number_of_waves: int,
+    max_start_offset_us: int = 0,
+    seed: int = 0,
+    jitter_scheme: JitterScheme = JitterScheme.SEQUENTIAL,
+    wave_range: Optional[range] = None,
+) -> Iterator[int]:
+    """Yield one jitter offset per (wave, sender) in wave_range, wave-major."""
+    waves = resolve_wave_range(number_of_waves, wave_range)
+
+    if jitter_scheme is JitterScheme.SEQUENTIAL:
+        jitter_rng = random.Random(seed)
+        # A single stream cannot seek: replay the draws of every wave before the range.
+        for _ in range(waves.start * senders_per_wave):
+            jitter_rng.randint(0, max_start_offset_us)
+        for _ in range(len(waves) * senders_per_wave):
+            yield jitter_rng.randint(0, max_start_offset_us)
+        return
+
+    if jitter_scheme is JitterScheme.PER_WAVE:
+        for wave_id in waves:
+            jitter_rng = random.Random(derive_wave_seed(seed, wave_id))
+            for _ in range(senders_per_wave):
+                yield jitter_rng.randint(0, max_start_offset_us)
+        return
+
+    if jitter_scheme is JitterScheme.COUNTER:
+        for wave_id in waves:
+            for sender_id in range(senders_per_wave):
+                yield counter_start_offset(
+                    seed=seed,
                     wave_id=wave_id,
                     sender_id=sender_id,
-                    sender_start_us=sender_start_us,
+                    max_start_offset_us=max_start_offset_us,
                 )
+        return
+
+    raise ValueError(f"Unsupported jitter_scheme: {jitter_scheme!r}")
+
+
+def iter_wave_blocks(
+    *,
+    senders_per_wave: int,
+    number_of_waves: int,
+    first_wave_start_us: int,
+    wave_interval_us: int,
+    max_start_offset_us: int = 0,
+    seed: int = 0,
+    jitter_scheme: JitterScheme = JitterScheme.SEQUENTIAL,
+    wave_range: Optional[range] = None,
+) -> Iterator[list[WaveStart]]:
+    """Yield each wave's starts in sender order, one wave at a time."""
+    validate_wave_schedule_args(
+        senders_per_wave=senders_per_wave,
+        number_of_waves=number_of_waves,
+        first_wave_start_us=first_wave_start_us,
+        wave_interval_us=wave_interval_us,
+        max_start_offset_us=max_start_offset_us,
+    )
+
+    waves = resolve_wave_range(number_of_waves, wave_range)
+    start_offsets_us = iter_start_offsets(
+        senders_per_wave=senders_per_wave,
+        number_of_waves=number_of_waves,
+        max_start_offset_us=max_start_offset_us,
+        seed=seed,
+        jitter_scheme=jitter_scheme,
+        wave_range=waves,
+    )
+    for wave_id in waves:
+        wave_start_us = first_wave_start_us + wave_id * wave_interval_us
+        yield [
+            WaveStart(
+                wave_id=wave_id,
+                sender_id=sender_id,
+                sender_start_us=wave_start_us + start_offset_us,
             )
+            for sender_id, start_offset_us in zip(range(senders_per_wave), start_offsets_us)
+        ]
+
+
+def generate_wave_starts(
+    *,
+    senders_per_wave: int,
+    number_of_waves: int,
+    first_wave_start_us: int,
+    wave_interval_us: int,
+    max_start_offset_us: int = 0,
+    seed: int = 0,
+    jitter_scheme: JitterScheme = JitterScheme.SEQUENTIAL,
+    wave_range: Optional[range] = None,
+) -> list[WaveStart]:
+    schedule: list[WaveStart] = []
+    for wave_block in iter_wave_blocks(
+        senders_per_wave=senders_per_wave,
+        number_of_waves=number_of_waves,
+        first_wave_start_us=first_wave_start_us,
+        wave_interval_us=wave_interval_us,
+        max_start_offset_us=max_start_offset_us,
+        seed=seed,
+        jitter_scheme=jitter_scheme,
+        wave_range=wave_range,
+    ):
+        schedule.extend(wave_block)
 
     schedule.sort(key=lambda x: (x.sender_start_us, x.wave_id, x.sender_id))
     return schedule
+
+
+def iter_ordered_wave_starts(
+    *,
+    senders_per_wave: int,
+    number_of_waves: int,
+    first_wave_start_us: int,
+    wave_interval_us: int,
+    max_start_offset_us: int = 0,
+    seed: int = 0,
+    jitter_scheme: JitterScheme = JitterScheme.SEQUENTIAL,
+    wave_range: Optional[range] = None,
+) -> Iterator[WaveStart]:
+    """
+    Lazily yield the same sequence as generate_wave_starts.
+
+    Waves are generated one at a time. A pending start is released once no later wave can
+    sort before it: every start of wave w + 1 or later is >= that wave's base start and has a
+    larger wave_id, so anything pending at or before that base is final. Memory is bounded by
+    the waves whose jitter windows overlap.
+    """
+    waves = resolve_wave_range(number_of_waves, wave_range)
+    pending: list[tuple[int, int, int]] = []
+    for wave_id, wave_block in zip(
+        waves,
+        iter_wave_blocks(
+            senders_per_wave=senders_per_wave,
+            number_of_waves=number_of_waves,
+            first_wave_start_us=first_wave_start_us,
+            wave_interval_us=wave_interval_us,
+            max_start_offset_us=max_start_offset_us,
+            seed=seed,
+            jitter_scheme=jitter_scheme,
+            wave_range=waves,
+        ),
+    ):
+        for wave_start in wave_block:
+            heapq.heappush(
+                pending, (wave_start.sender_start_us, wave_start.wave_id, wave_start.sender_id)
+            )
+
+        next_wave_start_us = first_wave_start_us + (wave_id + 1) * wave_interval_us
+        while pending and pending[0][0] <= next_wave_start_us:
+            sender_start_us, released_wave_id, sender_id = heapq.heappop(pending)
+            yield WaveStart(
+                wave_id=released_wave_id,
+                sender_id=sender_id,
+                sender_start_us=sender_start_us,
+            )
+
+    while pending:
+        sender_start_us, released_wave_id, sender_id = heapq.heappop(pending)
+        yield WaveStart(
+            wave_id=released_wave_id,
+            sender_id=sender_id,
+            sender_start_us=sender_start_us,
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Iterable, Iterator
 
 from .incast_wave import WaveStart
 
@@ -14,47 +15,130 @@ class PacketEvent:
     packet_size_bytes: int
 
 
-def packetize_wave_starts(
+@dataclass(frozen=True)
+class PacketBurst:
+    """Run-length form of one sender's packets in one wave; all share packet_start_us."""
+
+    wave_id: int
+    sender_id: int
+    packet_start_us: int
+    full_packet_count: int
+    full_packet_size_bytes: int
+    remainder_size_bytes: int
+
+    @property
+    def packet_count(self) -> int:
+        return self.full_packet_count + (1 if self.remainder_size_bytes > 0 else 0)
+
+    @property
+    def total_bytes(self) -> int:
+        return self.full_packet_count * self.full_packet_size_bytes + self.remainder_size_bytes
+
+    def expand(self) -> Iterator[PacketEvent]:
+        for packet_index_for_sender in range(self.full_packet_count):
+            yield PacketEvent(
+                wave_id=self.wave_id,
+                sender_id=self.sender_id,
+                packet_index_for_sender=packet_index_for_sender,
+                packet_start_us=self.packet_start_us,
+                packet_size_bytes=self.full_packet_size_bytes,
+            )
+        if self.remainder_size_bytes > 0:
+            yield PacketEvent(
+                wave_id=self.wave_id,
+                sender_id=self.sender_id,
+                packet_index_for_sender=self.full_packet_count,
+                packet_start_us=self.packet_start_us,
+                packet_size_bytes=self.remainder_size_bytes,
+            )
+
+
+def _split_sender_bytes(
     *,
-    wave_starts: list[WaveStart],
     bytes_per_sender_per_wave: int,
     packet_size_bytes: int,
-) -> list[PacketEvent]:
+) -> tuple[int, int]:
+    """(full packet count, remainder bytes) for one sender's bytes in one wave."""
     if bytes_per_sender_per_wave < 0:
         raise ValueError("bytes_per_sender_per_wave must be >= 0")
     if packet_size_bytes <= 0:
         raise ValueError("packet_size_bytes must be > 0")
-    if bytes_per_sender_per_wave == 0:
-        return []
 
-    full_packets = bytes_per_sender_per_wave // packet_size_bytes
-    last_packet_remainder = bytes_per_sender_per_wave % packet_size_bytes
+    return divmod(bytes_per_sender_per_wave, packet_size_bytes)
 
-    packet_events: list[PacketEvent] = []
-    for wave_start in wave_starts:
-        packet_index_for_sender = 0
 
-        for _ in range(full_packets):
-            packet_events.append(
-                PacketEvent(
-                    wave_id=wave_start.wave_id,
-                    sender_id=wave_start.sender_id,
-                    packet_index_for_sender=packet_index_for_sender,
-                    packet_start_us=wave_start.sender_start_us,
-                    packet_size_bytes=packet_size_bytes,
-                )
-            )
-            packet_index_for_sender += 1
+def packet_sizes_for_sender(
+    *,
+    bytes_per_sender_per_wave: int,
+    packet_size_bytes: int,
+) -> list[int]:
+    """Sizes of the packets one sender emits per wave: full packets, then any remainder."""
+    full_packets, last_packet_remainder = _split_sender_bytes(
+        bytes_per_sender_per_wave=bytes_per_sender_per_wave,
+        packet_size_bytes=packet_size_bytes,
+    )
+
+    packet_sizes = [packet_size_bytes] * full_packets
+    if last_packet_remainder > 0:
+        packet_sizes.append(last_packet_remainder)
+    return packet_sizes
+
+
+def packetize_wave_starts(
+    *,
+    wave_starts: list[WaveStart],
+    bytes_per_sender_per_wave: int,
+    packet_size_bytes: int,
+) -> list[PacketEvent]:
+    packet_sizes = packet_sizes_for_sender(
+        bytes_per_sender_per_wave=bytes_per_sender_per_wave,
+        packet_size_bytes=packet_size_bytes,
+    )
 
-        if last_packet_remainder > 0:
+    packet_events: list[PacketEvent] = []
+    for wave_start in wave_starts:
+        for packet_index_for_sender, size_bytes in enumerate(packet_sizes):
             packet_events.append(
                 PacketEvent(
                     wave_id=wave_start.wave_id,
                     sender_id=wave_start.sender_id,
                     packet_index_for_sender=packet_index_for_sender,
                     packet_start_us=wave_start.sender_start_us,
-                    packet_size_bytes=last_packet_remainder,
+                    packet_size_bytes=size_bytes,
                 )
             )
 
     return packet_events
+
+
+def burst_wave_starts(
+    *,
+    wave_starts: list[WaveStart],
+    bytes_per_sender_per_wave: int,
+    packet_size_bytes: int,
+) -> list[PacketBurst]:
+    """Burst counterpart of packetize_wave_starts: one record per wave start."""
+    full_packets, last_packet_remainder = _split_sender_bytes(
+        bytes_per_sender_per_wave=bytes_per_sender_per_wave,
+        packet_size_bytes=packet_size_bytes,
+    )
+    if bytes_per_sender_per_wave == 0:
+        return []
+
+    return [
+        PacketBurst(
+            wave_id=wave_start.wave_id,
+            sender_id=wave_start.sender_id,
+            packet_start_us=wave_start.sender_start_us,
+            full_packet_count=full_packets,
+            full_packet_size_bytes=packet_size_bytes,
+            remainder_size_bytes=last_packet_remainder,
+        )
+        for wave_start in wave_starts
+    ]
+
+
+def iter_burst_packets(bursts: Iterable[PacketBurst]) -> Iterator[PacketEvent]:
+    """Lazily expand bursts into the packets packetize_wave_starts would have emitted."""
+    for burst in bursts:
+        yield from burst.expand()
@@ -0,0 +1,271 @@
+"""One-pass per-flow, per-link and per-node statistics over ns-2 traces."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Collection, Optional, Union
+
+import numpy as np
+
+from .io.ns2_trace import (
+    DEFAULT_CHUNK_BYTES,
+    DROP,
+    ENQUEUE,
+    NS2_ACTIONS,
+    RECEIVE,
+    iter_ns2_chunks,
+)
+
+
+DEFAULT_THROUGHPUT_BIN_S = 1.0
+
+ACTION_NAMES = ("enqueue", "dequeue", "receive", "drop")
+NUMBER_OF_ACTIONS = len(NS2_ACTIONS)
+
+FLOW_LINK_KEYS = ("flow_id", "packet_type", "from_node", "to_node")
+
+KeyFilter = Union[int, Collection[int]]
+
+
+def _unique_rows(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    np.unique(keys, axis=0, return_inverse=True), via one packed int64 column when it fits.
+
+    Row-wise unique sorts a structured view and is several times slower than a 1-D unique,
+    and key columns (flow, node, type, bin) have small ranges.
+    """
+    low = keys.min(axis=0)
+    radix = keys.max(axis=0) - low + 1
+    if float(np.prod(radix.astype(np.float64))) >= 2**62:
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        return unique_keys, inverse.reshape(-1)
+
+    packed = np.zeros(keys.shape[0], dtype=np.int64)
+    for column in range(keys.shape[1]):
+        packed = packed * radix[column] + (keys[:, column] - low[column])
+    unique_packed, inverse = np.unique(packed, return_inverse=True)
+
+    unique_keys = np.empty((unique_packed.shape[0], keys.shape[1]), dtype=keys.dtype)
+    for column in reversed(range(keys.shape[1])):
+        unique_packed, unique_keys[:, column] = np.divmod(unique_packed, radix[column])
+        unique_keys[:, column] += low[column]
+    return unique_keys, inverse.reshape(-1)
+
+
+def _group_sum(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sum value rows that share a key row; keys come back sorted and unique."""
+    if keys.shape[0] == 0:
+        return keys, values
+    unique_keys, inverse = _unique_rows(keys)
+    sums = np.stack(
+        [
+            np.bincount(inverse, weights=values[:, column], minlength=unique_keys.shape[0])
+            for column in range(values.shape[1])
+        ],
+        axis=1,
+    )
+    return unique_keys, sums.astype(np.int64)
+
+
+@dataclass(frozen=True, eq=False)
+class ActionTable:
+    """
+    Packet and byte counts per action (columns follow ACTION_NAMES), one row per key.
+
+    keys has one column per key_names entry. Tables are small (one row per distinct key), so
+    grouping and filtering are cheap regardless of trace length.
+    """
+
+    key_names: tuple[str, ...]
+    keys: np.ndarray
+    packets: np.ndarray
+    bytes: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.keys.shape[0])
+
+    def _column(self, name: str) -> np.ndarray:
+        try:
+            return self.keys[:, self.key_names.index(name)]
+        except ValueError:
+            raise ValueError(f"Unknown key '{name}'. Choose one of: {', '.join(self.key_names)}")
+
+    def where(self, **filters: KeyFilter) -> "ActionTable":
+        """Rows whose key columns equal (or are in) the given values."""
+        mask = np.ones(len(self), dtype=bool)
+        for name, allowed in filters.items():
+            allowed_values = [allowed] if isinstance(allowed, (int, np.integer)) else list(allowed)
+            mask &= np.isin(self._column(name), allowed_values)
+        return ActionTable(self.key_names, self.keys[mask], self.packets[mask], self.bytes[mask])
+
+    def group_by(self, *names: str) -> "ActionTable":
+        keys = np.stack([self._column(name) for name in names], axis=1)
+        grouped_keys, sums = _group_sum(keys, np.hstack([self.packets, self.bytes]))
+        return ActionTable(
+            names,
+            grouped_keys,
+            sums[:, :NUMBER_OF_ACTIONS],
+            sums[:, NUMBER_OF_ACTIONS:],
+        )
+
+    def total(self, action: int) -> int:
+        return int(self.packets[:, action].sum())
+
+    def counts(self, *key: int) -> dict[str, int]:
+        """Packet counts by action name for one key (zeros if the key never appears)."""
+        matches = np.flatnonzero(np.all(self.keys == np.asarray(key), axis=1))
+        row = self.packets[matches[0]] if matches.size else np.zeros(NUMBER_OF_ACTIONS)
+        return dict(zip(ACTION_NAMES, (int(value) for value in row)))
+
+
+class _KeyedAccumulator:
+    """Running group-sum of (key row, value row) pairs; state is one row per distinct key."""
+
+    def __init__(self, key_width: int, value_width: int) -> None:
+        self.keys = np.empty((0, key_width), dtype=np.int64)
+        self.values = np.empty((0, value_width), dtype=np.int64)
+
+    def add(self, keys: np.ndarray, values: np.ndarray) -> None:
+        chunk_keys, chunk_values = _group_sum(keys, values)
+        self.keys, self.values = _group_sum(
+            np.concatenate([self.keys, chunk_keys]), np.concatenate([self.values, chunk_values])
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class Ns2Analytics:
+    """
+    Everything the trace front-ends report, from a single pass.
+
+    flow_links is the finest table, keyed by FLOW_LINK_KEYS; per-flow, per-link and per-node
+    views are reductions of it. "+", "-" and "d" happen at a link's queue and are attributed to
+    from_node; "r" is attributed to to_node. received_bytes holds RECEIVE bytes keyed by
+    (flow_id, floor(time_s / bin_s)).
+    """
+
+    flow_links: ActionTable
+    packet_types: tuple[str, ...]
+    bin_s: float
+    received_bytes_keys: np.ndarray
+    received_bytes: np.ndarray
+
+    def packet_type_code(self, name: str) -> int:
+        if name not in self.packet_types:
+            raise ValueError(f"Packet type '{name}' does not occur in the trace")
+        return self.packet_types.index(name)
+
+    def per_flow(self) -> ActionTable:
+        return self.flow_links.group_by("flow_id")
+
+    def per_link(self) -> ActionTable:
+        return self.flow_links.group_by("from_node", "to_node")
+
+    def per_node(self) -> ActionTable:
+        queue_side = self.flow_links.group_by("from_node")
+        receive_side = self.flow_links.group_by("to_node")
+        is_receive_column = np.tile(np.arange(NUMBER_OF_ACTIONS) == RECEIVE, 2)
+        queue_values = np.hstack([queue_side.packets, queue_side.bytes]) * ~is_receive_column
+        receive_values = np.hstack([receive_side.packets, receive_side.bytes]) * is_receive_column
+        keys, sums = _group_sum(
+            np.concatenate([queue_side.keys, receive_side.keys]),
+            np.concatenate([queue_values, receive_values]),
+        )
+        return ActionTable(
+            ("node",), keys, sums[:, :NUMBER_OF_ACTIONS], sums[:, NUMBER_OF_ACTIONS:]
+        )
+
+    @property
+    def sent(self) -> int:
+        return self.flow_links.total(ENQUEUE)
+
+    @property
+    def received(self) -> int:
+        return self.flow_links.total(RECEIVE)
+
+    @property
+    def dropped(self) -> int:
+        return self.flow_links.total(DROP)
+
+    @property
+    def delivery_ratio(self) -> float:
+        return self.received / self.sent if self.sent else 0.0
+
+    def throughput_kbps(
+        self, flow_id: Optional[KeyFilter] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """(bin start time in s, kbps) for every bin with at least one matching receive."""
+        keys, received_bytes = self.received_bytes_keys, self.received_bytes[:, 0]
+        if flow_id is not None:
+            allowed = [flow_id] if isinstance(flow_id, (int, np.integer)) else list(flow_id)
+            mask = np.isin(keys[:, 0], allowed)
+            keys, received_bytes = keys[mask], received_bytes[mask]
+        bins, per_bin = _group_sum(keys[:, 1:], received_bytes[:, None])
+        return bins[:, 0] * self.bin_s, per_bin[:, 0] * 8 / 1000 / self.bin_s
+
+
+def analyze_ns2_trace(
+    path: Path,
+    *,
+    bin_s: float = DEFAULT_THROUGHPUT_BIN_S,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Ns2Analytics:
+    """
+    Single bounded-memory pass over an ns-2 trace.
+
+    State grows with distinct (flow, type, link) keys and active (flow, bin) pairs, never with
+    the number of trace lines, so traces with thousands of flows stay cheap.
+    """
+    if bin_s <= 0:
+        raise ValueError("bin_s must be > 0")
+
+    flow_links = _KeyedAccumulator(len(FLOW_LINK_KEYS), 2 * NUMBER_OF_ACTIONS)
+    received = _KeyedAccumulator(2, 1)
+    packet_types: tuple[str, ...] = ()
+    for chunk in iter_ns2_chunks(path, chunk_bytes):
+        action = chunk.action
+        known = action < NUMBER_OF_ACTIONS
+        action = action[known].astype(np.int64)
+        size_bytes = chunk.size_bytes[known].astype(np.int64)
+
+        one_hot = np.zeros((action.shape[0], NUMBER_OF_ACTIONS), dtype=np.int64)
+        one_hot[np.arange(action.shape[0]), action] = 1
+        flow_id = chunk.flow_id[known].astype(np.int64)
+        flow_links.add(
+            np.stack(
+                [
+                    flow_id,
+                    chunk.packet_type[known].astype(np.int64),
+                    chunk.from_node[known].astype(np.int64),
+                    chunk.to_node[known].astype(np.int64),
+                ],
+                axis=1,
+            ),
+            np.hstack([one_hot, one_hot * size_bytes[:, None]]),
+        )
+
+        is_receive = action == RECEIVE
+        received.add(
+            np.stack(
+                [
+                    flow_id[is_receive],
+                    np.floor(chunk.time_s[known][is_receive] / bin_s).astype(np.int64),
+                ],
+                axis=1,
+            ),
+            size_bytes[is_receive, None],
+        )
+        packet_types = chunk.packet_types
+
+    return Ns2Analytics(
+        flow_links=ActionTable(
+            FLOW_LINK_KEYS,
+            flow_links.keys,
+            flow_links.values[:, :NUMBER_OF_ACTIONS],
+            flow_links.values[:, NUMBER_OF_ACTIONS:],
+        ),
+        packet_types=packet_types,
+        bin_s=bin_s,
+        received_bytes_keys=received.keys,
+        received_bytes=received.values,
+    )
@@ -0,0 +1,84 @@
+"""Deterministic multi-process traffic generation sharded by wave."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import os
+from typing import Optional
+
+import numpy as np
+
+from .columnar import TrafficBatch
+from .config import TrafficConfig
+from .generator import PacketColumns, classify_packet_columns, packetize_wave_range
+from .models.incast_wave import JitterScheme
+
+
+SHARDS_PER_WORKER = 4
+
+
+def shard_wave_ranges(number_of_waves: int, shard_count: int) -> list[range]:
+    """Split range(number_of_waves) into at most shard_count contiguous, near-equal ranges."""
+    if shard_count <= 0:
+        raise ValueError("shard_count must be > 0")
+    shard_count = min(shard_count, number_of_waves)
+    base_size, extra = divmod(number_of_waves, shard_count)
+
+    ranges: list[range] = []
+    start = 0
+    for shard_index in range(shard_count):
+        stop = start + base_size + (1 if shard_index < extra else 0)
+        ranges.append(range(start, stop))
+        start = stop
+    return ranges
+
+
+def merge_packet_columns(config: TrafficConfig, shards: list[PacketColumns]) -> PacketColumns:
+    """
+    Merge per-shard columns (in wave order) into global schedule order.
+
+    When max_start_offset_us <= wave_interval_us no start of wave w can follow a start of wave
+    w + 1, so contiguous wave shards are already in order and concatenation is the merge.
+    Otherwise shards interleave in time and rows are re-sorted by the schedule key.
+    """
+    columns = tuple(np.concatenate(parts) for parts in zip(*shards))
+    if config.max_start_offset_us <= config.wave_interval_us:
+        return columns
+
+    wave_ids, sender_ids, packet_index_for_sender, packet_start_us, _ = columns
+    order = np.lexsort((packet_index_for_sender, sender_ids, wave_ids, packet_start_us))
+    return tuple(column[order] for column in columns)
+
+
+def generate_traffic_parallel(
+    config: TrafficConfig,
+    *,
+    workers: Optional[int] = None,
+    shard_count: Optional[int] = None,
+) -> TrafficBatch:
+    """
+    Columnar generation with waves sharded across a process pool.
+
+    Requires a jitter scheme whose waves can be drawn independently. Output is bit-identical to
+    generate_traffic_batch(config) for any worker or shard count: shards are merged back into
+    schedule order before CONTROL/BULK classification runs over the global packet index.
+    """
+    if config.jitter_scheme is JitterScheme.SEQUENTIAL:
+        raise ValueError(
+            "Parallel generation needs per-wave jitter; "
+            "JitterScheme.SEQUENTIAL draws every wave from one shared stream."
+        )
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError("workers must be > 0")
+    shard_count = shard_count if shard_count is not None else workers * SHARDS_PER_WORKER
+
+    wave_ranges = shard_wave_ranges(config.number_of_waves, shard_count)
+    if workers == 1:
+        shards = [packetize_wave_range(config, wave_range) for wave_range in wave_ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(packetize_wave_range, repeat(config), wave_ranges))
+
+    return classify_packet_columns(config, merge_packet_columns(config, shards))
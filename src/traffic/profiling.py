@@ -0,0 +1,265 @@
+"""Opt-in per-stage profiling of generation, validation and export.
+
+Pipeline functions take an optional `profiler`. Without one, a stage costs one `is None`
+check and a shared no-op context manager, so nothing is timed or counted. With a
+StageProfiler, every stage adds its wall time, event count and peak RSS to a running total
+under its name; ProfileReport is the frozen snapshot of those totals.
+
+Stages may nest (a streaming export pulls chunks through validation and generation). Each
+stage reports self time: time spent in a nested stage is charged to that stage only. The RSS
+high-water mark is reset when a top-level stage starts, so a nested stage's peak covers its
+top-level stage up to the nested stage's end.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+import resource
+import sys
+import time
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+PROFILE_STAGES = (
+    "wave_scheduling",
+    "packetizing",
+    "classification",
+    "materialization",
+    "validation",
+    "export",
+)
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark (Linux); False where that is not possible."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes() -> int:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass(frozen=True)
+class StageProfile:
+    name: str
+    wall_s: float
+    events: int
+    calls: int
+    peak_rss_bytes: Optional[int]
+
+    @property
+    def events_per_s(self) -> Optional[float]:
+        return self.events / self.wall_s if self.wall_s > 0 else None
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    """
+    Per-stage totals, PROFILE_STAGES first in pipeline order, then any other stage names.
+
+    peak_rss_is_stage_local is False where the RSS high-water mark cannot be reset; each
+    peak_rss_bytes is then the process peak up to the end of that stage.
+    """
+
+    stages: tuple[StageProfile, ...]
+    peak_rss_is_stage_local: bool
+
+    @property
+    def total_wall_s(self) -> float:
+        return sum(stage.wall_s for stage in self.stages)
+
+    def stage(self, name: str) -> StageProfile:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(f"No stage '{name}' in this report")
+
+    def to_dict(self) -> dict:
+        return {
+            "total_wall_s": self.total_wall_s,
+            "peak_rss_is_stage_local": self.peak_rss_is_stage_local,
+            "stages": [
+                {
+                    "name": stage.name,
+                    "wall_s": stage.wall_s,
+                    "events": stage.events,
+                    "events_per_s": stage.events_per_s,
+                    "calls": stage.calls,
+                    "peak_rss_bytes": stage.peak_rss_bytes,
+                }
+                for stage in self.stages
+            ],
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'stage':<16} {'wall s':>9} {'events':>11} {'events/s':>12} {'peak MiB':>9}"]
+        for stage in self.stages:
+            rate = f"{stage.events_per_s:12.4g}" if stage.events_per_s is not None else " " * 12
+            peak = (
+                f"{stage.peak_rss_bytes / 2**20:9.1f}"
+                if stage.peak_rss_bytes is not None
+                else " " * 9
+            )
+            lines.append(
+                f"{stage.name:<16} {stage.wall_s:9.4f} {stage.events:11d} {rate} {peak}"
+            )
+        lines.append(f"{'total':<16} {self.total_wall_s:9.4f}")
+        return "\n".join(lines)
+
+
+class _StageTotals:
+    __slots__ = ("wall_s", "events", "calls", "peak_rss_bytes")
+
+    def __init__(self) -> None:
+        self.wall_s = 0.0
+        self.events = 0
+        self.calls = 0
+        self.peak_rss_bytes: Optional[int] = None
+
+    def add_events(self, count: int) -> None:
+        self.events += int(count)
+
+    def counted(self, chunks: Iterable[T]) -> Iterator[T]:
+        """Pass chunks through, adding len(chunk) events for each."""
+        for chunk in chunks:
+            self.events += len(chunk)
+            yield chunk
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def add_events(self, count: int) -> None:
+        pass
+
+    def counted(self, chunks: Iterable[T]) -> Iterable[T]:
+        return chunks
+
+
+_NULL_STAGE = nullcontext(_NullStage())
+
+
+def _stage_order(item: tuple[str, _StageTotals]) -> int:
+    name = item[0]
+    return PROFILE_STAGES.index(name) if name in PROFILE_STAGES else len(PROFILE_STAGES)
+
+
+class StageProfiler:
+    """Accumulates StageProfiles; pass one as `profiler=` and call report() afterwards."""
+
+    def __init__(self, *, track_memory: bool = True) -> None:
+        self.track_memory = track_memory
+        self._totals: dict[str, _StageTotals] = {}
+        # One [totals, seconds spent in nested stages, start time] entry per running stage.
+        self._active: list[list] = []
+        self._peak_rss_is_stage_local = True
+
+    def _fold_peak(self, totals: _StageTotals, peak: int) -> None:
+        if totals.peak_rss_bytes is None or peak > totals.peak_rss_bytes:
+            totals.peak_rss_bytes = peak
+
+    def _start(self, name: str) -> list:
+        totals = self._totals.get(name)
+        if totals is None:
+            totals = self._totals[name] = _StageTotals()
+        if self.track_memory and not self._active:
+            # Reset once per top-level stage: resetting in nested (per-chunk) stages would cost
+            # a write per chunk and lose the enclosing stage's peak.
+            self._peak_rss_is_stage_local &= reset_peak_rss()
+        frame = [totals, 0.0, time.perf_counter()]
+        self._active.append(frame)
+        return frame
+
+    def _finish(self, frame: list, events: int = 0, call: bool = True) -> None:
+        totals, child_s, started = frame
+        elapsed = time.perf_counter() - started
+        self._active.pop()
+        totals.wall_s += elapsed - child_s
+        totals.events += events
+        totals.calls += call
+        if self._active:
+            self._active[-1][1] += elapsed
+        if self.track_memory:
+            peak = peak_rss_bytes()
+            self._fold_peak(totals, peak)
+            if self._active:
+                self._fold_peak(self._active[-1][0], peak)
+
+    @contextmanager
+    def stage(self, name: str, events: int = 0) -> Iterator[_StageTotals]:
+        """Time the body as stage `name`; the yielded handle takes add_events()."""
+        frame = self._start(name)
+        try:
+            yield frame[0]
+        finally:
+            self._finish(frame, events)
+
+    def iter_stage(
+        self, name: str, items: Iterable[T], count: Callable[[T], int] = len
+    ) -> Iterator[T]:
+        """Pass items through, charging the time to produce each one to stage `name`."""
+        iterator = iter(items)
+        while True:
+            frame = self._start(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                # Finding the end takes time but produces nothing, so it is not a call.
+                self._finish(frame, call=False)
+                return
+            except BaseException:
+                self._finish(frame)
+                raise
+            self._finish(frame, count(item))
+            yield item
+
+    def report(self) -> ProfileReport:
+        return ProfileReport(
+            stages=tuple(
+                StageProfile(
+                    name=name,
+                    wall_s=totals.wall_s,
+                    events=totals.events,
+                    calls=totals.calls,
+                    peak_rss_bytes=totals.peak_rss_bytes,
+                )
+                for name, totals in sorted(self._totals.items(), key=_stage_order)
+            ),
+            peak_rss_is_stage_local=self.track_memory and self._peak_rss_is_stage_local,
+        )
+
+
+def profile_stage(profiler: Optional[StageProfiler], name: str, events: int = 0):
+    """profiler.stage(name, events), or a shared no-op context when profiling is off."""
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name, events)
+
+
+def profile_iter(
+    profiler: Optional[StageProfiler],
+    name: str,
+    items: Iterable[T],
+    count: Callable[[T], int] = len,
+) -> Iterable[T]:
+    """profiler.iter_stage(name, items, count), or items unchanged when profiling is off."""
+    if profiler is None:
+        return items
+    return profiler.iter_stage(name, items, count)
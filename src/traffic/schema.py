@@ -8,6 +8,18 @@ from .models.classifier import TrafficClass
 
 @dataclass(frozen=True)
 class TrafficEvent:
+    # Slotted: a generated trace holds millions of these, and dropping the per-instance
+    # dict roughly halves their footprint.
+    __slots__ = (
+        "wave_id",
+        "sender_id",
+        "packet_index_for_sender",
+        "packet_start_us",
+        "packet_size_bytes",
+        "traffic_class",
+        "priority_tag",
+    )
+
     wave_id: int
     sender_id: int
     packet_index_for_sender: int
@@ -16,5 +28,9 @@ class TrafficEvent:
     traffic_class: TrafficClass
     priority_tag: int
 
+    def __reduce__(self):
+        # Default slot pickling restores state via setattr, which a frozen dataclass rejects.
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
 
 TrafficEvents = List[TrafficEvent]
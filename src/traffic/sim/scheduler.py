@@ -0,0 +1,288 @@
+"""Multi-queue output link: one drop-tail queue per priority_tag, served by SP, WRR or DRR.
+
+Each queue has its own byte limit. A queue's occupancy is the bytes waiting in it plus the
+untransmitted remainder of its packet on the wire, so a single queue behaves exactly like
+traffic.sim.fifo.
+
+The simulation is event driven over two event sources: arrival instants (distinct
+packet_start_us values, already sorted) and the link becoming free. Between two arrival
+instants the scheduler's choices cannot change except at queue boundaries, so the link is
+served in runs: each run takes consecutive packets from one queue, bounded by the policy
+(SP: until empty; WRR: the queue's remaining packet credit; DRR: its byte deficit) and by the
+next arrival instant. A run is one searchsorted over the queue's cumulative bytes, and a burst
+arriving at one instant is admitted per queue with one cumsum, so the Python loop runs once
+per run and once per arrival instant, not once per packet.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+import math
+
+import numpy as np
+
+from traffic.columnar import TrafficBatch
+from traffic.sim.fifo import SimInput, check_arrival_order, load_sim_traffic
+from traffic.sim.stats import SimStats, build_sim_stats
+
+
+class SchedulerPolicy(Enum):
+    # Always serve the first non-empty queue in SchedulerConfig.queues.
+    STRICT_PRIORITY = "strict_priority"
+    # Round robin sending up to QueueConfig.weight packets per turn.
+    WEIGHTED_ROUND_ROBIN = "wrr"
+    # Deficit round robin adding QueueConfig.quantum_bytes of credit per turn.
+    DEFICIT_ROUND_ROBIN = "drr"
+
+
+@dataclass(frozen=True)
+class QueueConfig:
+    priority_tag: int
+    buffer_bytes: int
+    weight: int = 1
+    quantum_bytes: int = 1_500
+
+
+def default_queues() -> tuple[QueueConfig, ...]:
+    """CONTROL (tag 46) ahead of BULK (tag 0), matching TrafficConfig's default tags."""
+    return (
+        QueueConfig(priority_tag=46, buffer_bytes=250_000, weight=1, quantum_bytes=1_500),
+        QueueConfig(priority_tag=0, buffer_bytes=1_000_000, weight=4, quantum_bytes=6_000),
+    )
+
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    """queues are listed from highest to lowest priority; round robin visits them in order."""
+
+    policy: SchedulerPolicy = SchedulerPolicy.STRICT_PRIORITY
+    link_rate_bps: float = 10e9
+    queues: tuple[QueueConfig, ...] = default_queues()
+
+
+@dataclass(frozen=True, eq=False)
+class SchedulerStats:
+    overall: SimStats
+    per_queue: dict[int, SimStats]
+
+
+def validate_scheduler_config(config: SchedulerConfig) -> None:
+    if config.link_rate_bps <= 0:
+        raise ValueError("link_rate_bps must be > 0")
+    if not config.queues:
+        raise ValueError("queues must not be empty")
+    tags = [queue.priority_tag for queue in config.queues]
+    if len(set(tags)) != len(tags):
+        raise ValueError("Each queue needs a distinct priority_tag")
+    for queue in config.queues:
+        if queue.buffer_bytes < 0:
+            raise ValueError("buffer_bytes must be >= 0")
+        if queue.weight <= 0:
+            raise ValueError("weight must be > 0")
+        if queue.quantum_bytes <= 0:
+            raise ValueError("quantum_bytes must be > 0")
+
+
+def _admit_in_order(sizes: np.ndarray, room: float) -> np.ndarray:
+    """Offsets of the packets a drop-tail queue with `room` free bytes accepts, in order."""
+    cumulative = np.cumsum(sizes)
+    cut = int(np.searchsorted(cumulative, room, side="right"))
+    if cut == sizes.shape[0]:
+        return np.arange(cut)
+    admitted = list(range(cut))
+    room -= int(cumulative[cut - 1]) if cut else 0
+    position = cut + 1
+    while position < sizes.shape[0]:
+        fits = np.flatnonzero(sizes[position:] <= room)
+        if fits.shape[0] == 0:
+            break
+        position += int(fits[0])
+        admitted.append(position)
+        room -= int(sizes[position])
+        position += 1
+    return np.asarray(admitted, dtype=np.int64)
+
+
+class _PacketQueue:
+    """Admitted rows of one queue with running byte totals; head/tail index into both."""
+
+    def __init__(self, capacity: int) -> None:
+        self.rows = np.empty(capacity, dtype=np.int64)
+        self.cumulative_bytes = np.zeros(capacity + 1, dtype=np.int64)
+        self.head = 0
+        self.tail = 0
+
+    def __bool__(self) -> bool:
+        return self.head < self.tail
+
+    @property
+    def queued_bytes(self) -> int:
+        return int(self.cumulative_bytes[self.tail] - self.cumulative_bytes[self.head])
+
+    def push(self, rows: np.ndarray, sizes: np.ndarray) -> None:
+        end = self.tail + rows.shape[0]
+        self.rows[self.tail : end] = rows
+        self.cumulative_bytes[self.tail + 1 : end + 1] = (
+            self.cumulative_bytes[self.tail] + np.cumsum(sizes)
+        )
+        self.tail = end
+
+    def packets_within(self, budget_bytes: float) -> int:
+        """How many head packets fit, in total, into budget_bytes."""
+        totals = self.cumulative_bytes[self.head + 1 : self.tail + 1]
+        limit = self.cumulative_bytes[self.head] + budget_bytes
+        return int(np.searchsorted(totals, limit, side="right"))
+
+    def packets_starting_before(self, budget_bytes: float) -> int:
+        """How many head packets start transmitting within budget_bytes of link time."""
+        starts = self.cumulative_bytes[self.head : self.tail]
+        limit = self.cumulative_bytes[self.head] + budget_bytes
+        return int(np.searchsorted(starts, limit, side="left"))
+
+
+def schedule_packets(
+    batch: TrafficBatch, config: SchedulerConfig
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (transmit_order, queue_delay_us) for every transmitted row of batch."""
+    validate_scheduler_config(config)
+    check_arrival_order(batch.packet_start_us)
+    queue_tags = np.array([queue.priority_tag for queue in config.queues])
+    unknown = np.setdiff1d(np.unique(batch.priority_tag), queue_tags)
+    if unknown.shape[0]:
+        raise ValueError(f"No queue configured for priority_tag {unknown.tolist()}")
+
+    rate_bytes_per_us = config.link_rate_bps / 8e6
+    policy = config.policy
+    starts_us = batch.packet_start_us
+    sizes = batch.packet_size_bytes.astype(np.int64)
+    number_of_packets = len(batch)
+    queue_delay_us = np.full(number_of_packets, np.nan)
+    if number_of_packets == 0:
+        return np.empty(0, dtype=np.int64), queue_delay_us
+
+    group_first = np.concatenate(([0], np.flatnonzero(np.diff(starts_us)) + 1))
+    group_times = starts_us[group_first].tolist() + [math.inf]
+    rows_by_queue = [np.flatnonzero(batch.priority_tag == tag) for tag in queue_tags.tolist()]
+    group_bounds = [
+        np.append(np.searchsorted(rows, group_first), rows.shape[0]).tolist()
+        for rows in rows_by_queue
+    ]
+    queues = [_PacketQueue(rows.shape[0]) for rows in rows_by_queue]
+    buffers = [queue.buffer_bytes for queue in config.queues]
+    weights = [queue.weight for queue in config.queues]
+    quanta = [queue.quantum_bytes for queue in config.queues]
+    number_of_queues = len(queues)
+
+    sent_rows: list[np.ndarray] = []
+    # The link is free at anchor_us + sent_bytes / rate; keeping the byte count exact makes
+    # run boundaries independent of how packets were grouped into runs.
+    anchor_us = group_times[0]
+    sent_bytes = 0
+    link_free_us = anchor_us
+    wire_queue = -1
+    # Round-robin state: the queue holding the turn and what it may still send in that turn.
+    turn = number_of_queues - 1
+    turn_open = False
+    credit = 0
+    deficits = [0] * number_of_queues
+
+    for group_index, next_arrival_us in enumerate(group_times):
+        while link_free_us < next_arrival_us and any(queues):
+            if policy is SchedulerPolicy.STRICT_PRIORITY:
+                current = next(index for index, queue in enumerate(queues) if queue)
+                limit = None
+            else:
+                if not (turn_open and queues[turn]):
+                    if policy is SchedulerPolicy.DEFICIT_ROUND_ROBIN and not queues[turn]:
+                        deficits[turn] = 0
+                    turn = next(
+                        (turn + step) % number_of_queues
+                        for step in range(1, number_of_queues + 1)
+                        if queues[(turn + step) % number_of_queues]
+                    )
+                    turn_open = True
+                    if policy is SchedulerPolicy.WEIGHTED_ROUND_ROBIN:
+                        credit = weights[turn]
+                    else:
+                        deficits[turn] += quanta[turn]
+                current = turn
+                if policy is SchedulerPolicy.WEIGHTED_ROUND_ROBIN:
+                    limit = credit
+                else:
+                    limit = queues[current].packets_within(deficits[current])
+                    if limit == 0:
+                        turn_open = False
+                        continue
+
+            queue = queues[current]
+            count = queue.packets_starting_before(
+                (next_arrival_us - link_free_us) * rate_bytes_per_us
+            )
+            if limit is not None and limit < count:
+                count = limit
+            head = queue.head
+            offsets = queue.cumulative_bytes[head : head + count + 1] - queue.cumulative_bytes[head]
+            rows = queue.rows[head : head + count]
+            queue_delay_us[rows] = (
+                anchor_us + (sent_bytes + offsets[:-1]) / rate_bytes_per_us - starts_us[rows]
+            )
+            sent_rows.append(rows)
+            queue.head += count
+            sent_bytes += int(offsets[-1])
+            link_free_us = anchor_us + sent_bytes / rate_bytes_per_us
+            wire_queue = current
+
+            if policy is SchedulerPolicy.WEIGHTED_ROUND_ROBIN:
+                credit -= count
+                turn_open = credit > 0
+            elif policy is SchedulerPolicy.DEFICIT_ROUND_ROBIN:
+                deficits[current] -= int(offsets[-1])
+                if count == limit:
+                    turn_open = False
+                if not queue:
+                    deficits[current] = 0
+
+        if group_index == len(group_times) - 1:
+            break
+        if link_free_us < next_arrival_us:
+            # The link went idle: the next packet starts no earlier than this arrival.
+            anchor_us = link_free_us = next_arrival_us
+            sent_bytes = 0
+
+        for queue_index, queue in enumerate(queues):
+            lo = group_bounds[queue_index][group_index]
+            hi = group_bounds[queue_index][group_index + 1]
+            if lo == hi:
+                continue
+            rows = rows_by_queue[queue_index][lo:hi]
+            occupancy = queue.queued_bytes
+            if queue_index == wire_queue:
+                occupancy += max(0.0, link_free_us - next_arrival_us) * rate_bytes_per_us
+            admitted = _admit_in_order(sizes[rows], buffers[queue_index] - occupancy)
+            queue.push(rows[admitted], sizes[rows[admitted]])
+
+    transmit_order = np.concatenate(sent_rows) if sent_rows else np.empty(0, dtype=np.int64)
+    return transmit_order, queue_delay_us
+
+
+def simulate_scheduler(
+    traffic: SimInput, config: SchedulerConfig = SchedulerConfig()
+) -> SchedulerStats:
+    """Simulate the multi-queue link; per_queue is keyed by priority_tag."""
+    batch = load_sim_traffic(traffic)
+    transmit_order, queue_delay_us = schedule_packets(batch, config)
+
+    per_queue = {}
+    local_index = np.empty(len(batch), dtype=np.int64)
+    for queue in config.queues:
+        rows = np.flatnonzero(batch.priority_tag == queue.priority_tag)
+        local_index[rows] = np.arange(rows.shape[0])
+        queue_order = transmit_order[batch.priority_tag[transmit_order] == queue.priority_tag]
+        per_queue[queue.priority_tag] = build_sim_stats(
+            batch[rows], local_index[queue_order], queue_delay_us[rows]
+        )
+    return SchedulerStats(
+        overall=build_sim_stats(batch, transmit_order, queue_delay_us),
+        per_queue=per_queue,
+    )
@@ -0,0 +1,125 @@
+"""Fixed-memory, mergeable quantile sketch for non-negative integer delays (HDR-histogram style).
+
+Values below 2**significant_bits get one bucket each and are exact. Above that, every power of
+two [2**k, 2**(k+1)) is split into 2**(significant_bits - 1) equal buckets, so a bucket is never
+wider than 2**-(significant_bits - 1) of its lower bound. Quantiles report the bucket midpoint,
+giving a relative error of at most 2**-significant_bits. The bucket layout covers all of int64,
+so memory is fixed by significant_bits alone (3,712 counters at the default of 7), and two
+sketches with the same layout merge by adding their counters.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Iterable, Sequence
+
+import numpy as np
+
+
+DEFAULT_SIGNIFICANT_BITS = 7
+MAX_VALUE_BITS = 63
+
+
+class QuantileSketch:
+    def __init__(self, significant_bits: int = DEFAULT_SIGNIFICANT_BITS) -> None:
+        if not 1 <= significant_bits <= 16:
+            raise ValueError("significant_bits must be between 1 and 16")
+        self.significant_bits = significant_bits
+        self._exact_limit = 1 << significant_bits
+        self._half = self._exact_limit >> 1
+        bucket_count = self._exact_limit + (MAX_VALUE_BITS - significant_bits) * self._half
+        self.counts = np.zeros(bucket_count, dtype=np.int64)
+        self.count = 0
+        self.total = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def relative_error(self) -> float:
+        return 2.0 ** -self.significant_bits
+
+    def _bucket_index(self, values: np.ndarray) -> np.ndarray:
+        _, exponents = np.frexp(values.astype(np.float64))
+        shift = exponents.astype(np.int64) - self.significant_bits
+        # Large values can round up to the next power of two in float64; step back if so.
+        shift -= (values >> np.maximum(shift, 0)) < self._half
+        shift = np.maximum(shift, 0)
+        sub_bucket = values >> shift
+        return np.where(
+            values < self._exact_limit,
+            values,
+            self._exact_limit + (shift - 1) * self._half + (sub_bucket - self._half),
+        )
+
+    def _bucket_bounds(self, index: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Inclusive (lowest, highest) value of each bucket."""
+        index = np.asarray(index, dtype=np.int64)
+        log_index = np.maximum(index - self._exact_limit, 0)
+        shift, offset = np.divmod(log_index, self._half)
+        shift += 1
+        low = np.where(index < self._exact_limit, index, (self._half + offset) << shift)
+        width = np.where(index < self._exact_limit, 1, np.left_shift(1, shift))
+        return low, low + width - 1
+
+    def record(self, values: Iterable[int] | np.ndarray) -> None:
+        """Add every value in one vectorized pass."""
+        values = np.asarray(values, dtype=np.int64).reshape(-1)
+        if values.shape[0] == 0:
+            return
+        if values.min() < 0:
+            raise ValueError("QuantileSketch only records values >= 0")
+        self.counts += np.bincount(self._bucket_index(values), minlength=self.counts.shape[0])
+        self.count += int(values.shape[0])
+        self.total += int(values.sum())
+        self.min = min(self.min, int(values.min()))
+        self.max = max(self.max, int(values.max()))
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add other's observations into this sketch in place; returns self."""
+        if other.significant_bits != self.significant_bits:
+            raise ValueError(
+                "Cannot merge sketches with different significant_bits: "
+                f"{self.significant_bits} != {other.significant_bits}"
+            )
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @classmethod
+    def merged(
+        cls, sketches: Iterable["QuantileSketch"], significant_bits: int = DEFAULT_SIGNIFICANT_BITS
+    ) -> "QuantileSketch":
+        result = cls(significant_bits)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Nearest-rank quantiles, each within relative_error of the exact value."""
+        qs = np.asarray(qs, dtype=np.float64)
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("quantiles must lie in [0, 1]")
+        if self.count == 0:
+            return np.full(qs.shape, math.nan)
+        ranks = np.maximum(np.ceil(qs * self.count), 1)
+        index = np.searchsorted(np.cumsum(self.counts), ranks, side="left")
+        low, high = self._bucket_bounds(index)
+        return np.clip((low.astype(np.float64) + high) / 2, self.min, self.max)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    def percentiles(self) -> dict[str, float]:
+        """The p50 / p99 / p99.9 summary used in reports."""
+        p50, p99, p999 = self.quantiles([0.5, 0.99, 0.999]).tolist()
+        return {"p50": p50, "p99": p99, "p99.9": p999}
@@ -0,0 +1,106 @@
+"""Simulation results shared by the link simulators; mirrors sim::cpu_fifo::SimStats."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from traffic.columnar import CONTROL_CODE, TrafficBatch
+from traffic.sim.sketch import DEFAULT_SIGNIFICANT_BITS, QuantileSketch
+
+
+@dataclass(frozen=True, eq=False)
+class SimStats:
+    """
+    Packet/byte totals plus queueing-delay distributions, split into all / CONTROL / BULK.
+
+    Delays are whole microseconds from arrival to start of transmission, held in fixed-size
+    QuantileSketches (DelaySketch in the C++ struct, same bucket layout), so memory does not
+    grow with packet count and stats from shards or separate runs merge with merge_sim_stats.
+    """
+
+    arrived_packets: int
+    dropped_packets: int
+    transmitted_packets: int
+    arrived_bytes: int
+    dropped_bytes: int
+    transmitted_bytes: int
+    queue_delay_us_all: QuantileSketch
+    queue_delay_us_control: QuantileSketch
+    queue_delay_us_bulk: QuantileSketch
+
+    @property
+    def drop_ratio(self) -> float:
+        if self.arrived_packets == 0:
+            return 0.0
+        return self.dropped_packets / self.arrived_packets
+
+
+def _sketch_of(values: np.ndarray, significant_bits: int) -> QuantileSketch:
+    sketch = QuantileSketch(significant_bits)
+    sketch.record(values)
+    return sketch
+
+
+def build_sim_stats(
+    batch: TrafficBatch,
+    transmit_order: np.ndarray,
+    queue_delay_us: np.ndarray,
+    *,
+    significant_bits: int = DEFAULT_SIGNIFICANT_BITS,
+) -> SimStats:
+    """
+    Fold per-packet simulator output into SimStats.
+
+    transmit_order lists the indices of transmitted packets in the order they left the link;
+    queue_delay_us is indexed like batch (entries of dropped packets are ignored).
+    """
+    sizes = batch.packet_size_bytes.astype(np.int64)
+    transmitted = np.zeros(len(batch), dtype=bool)
+    transmitted[transmit_order] = True
+
+    delays = np.rint(queue_delay_us[transmit_order]).astype(np.int64)
+    is_control = batch.traffic_class[transmit_order] == CONTROL_CODE
+
+    arrived_bytes = int(sizes.sum())
+    transmitted_bytes = int(sizes[transmitted].sum())
+    return SimStats(
+        arrived_packets=len(batch),
+        dropped_packets=len(batch) - int(transmit_order.shape[0]),
+        transmitted_packets=int(transmit_order.shape[0]),
+        arrived_bytes=arrived_bytes,
+        dropped_bytes=arrived_bytes - transmitted_bytes,
+        transmitted_bytes=transmitted_bytes,
+        queue_delay_us_all=_sketch_of(delays, significant_bits),
+        queue_delay_us_control=_sketch_of(delays[is_control], significant_bits),
+        queue_delay_us_bulk=_sketch_of(delays[~is_control], significant_bits),
+    )
+
+
+def merge_sim_stats(stats: Iterable[SimStats]) -> SimStats:
+    """Combine stats of disjoint traffic (shards of one trace, or independent runs)."""
+    stats = list(stats)
+    if not stats:
+        raise ValueError("merge_sim_stats needs at least one SimStats")
+    significant_bits = stats[0].queue_delay_us_all.significant_bits
+    return SimStats(
+        **{
+            name: sum(getattr(item, name) for item in stats)
+            for name in (
+                "arrived_packets",
+                "dropped_packets",
+                "transmitted_packets",
+                "arrived_bytes",
+                "dropped_bytes",
+                "transmitted_bytes",
+            )
+        },
+        **{
+            name: QuantileSketch.merged(
+                (getattr(item, name) for item in stats), significant_bits
+            )
+            for name in ("queue_delay_us_all", "queue_delay_us_control", "queue_delay_us_bulk")
+        },
+    )
@@ -0,0 +1,91 @@
+"""Bounded in-memory memoization of generation pipeline stages."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import sys
+from typing import Callable, Hashable, TypeVar
+
+import numpy as np
+
+
+T = TypeVar("T")
+
+DEFAULT_STAGE_CACHE_MAX_BYTES = 512 * 1024**2
+
+
+@dataclass
+class StageCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+def estimate_nbytes(value) -> int:
+    """Approximate retained size of a stage output (arrays, tuples/lists of them, objects)."""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    # Cached outputs are shared between callers, so arrays are made read-only.
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+class StageCache:
+    """
+    LRU memo of stage outputs keyed by (stage name, that stage's inputs only).
+
+    Entries across all stages share one byte budget; the least recently used ones are
+    dropped when it is exceeded, and an output larger than the whole budget is not kept.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_STAGE_CACHE_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.stats: dict[str, StageCacheStats] = {}
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[object, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entry_key: tuple[str, Hashable]) -> bool:
+        """Whether (stage, key) is cached; does not touch stats or LRU order."""
+        return entry_key in self._entries
+
+    def get_or_compute(self, stage: str, key: Hashable, compute: Callable[[], T]) -> T:
+        stats = self.stats.setdefault(stage, StageCacheStats())
+        entry_key = (stage, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            self._entries.move_to_end(entry_key)
+            stats.hits += 1
+            return entry[0]
+
+        stats.misses += 1
+        value = _freeze(compute())
+        size = estimate_nbytes(value)
+        if size <= self.max_bytes:
+            self._entries[entry_key] = (value, size)
+            self.total_bytes += size
+            self._evict()
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
@@ -0,0 +1,399 @@
+"""Parameter sweeps over TrafficConfig and link settings, run in a process pool.
+
+A sweep is a list of points; each point is a dict of overrides applied to a base TrafficConfig,
+where the names are TrafficConfig fields or FifoConfig fields (link_rate_bps, buffer_bytes).
+Every point is generated, validated, optionally exported, and pushed through the drop-tail
+FIFO simulator. One row of summary metrics per point is appended to `<sweep dir>/results.csv`
+as soon as the point finishes, keyed by a hash of the resolved configuration, so re-running an
+interrupted sweep skips every point already in the table. Traces come from a TraceCache
+(`<sweep dir>/cache` by default), so points that share a TrafficConfig, such as a sweep over
+link settings only, generate their traffic once.
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+from dataclasses import dataclass, fields, replace
+import hashlib
+import itertools
+import os
+from pathlib import Path
+import random
+import time
+from typing import Mapping, Optional, Sequence
+
+from .columnar import CONTROL_CODE
+from .config import ScenarioName, TrafficConfig, config_fingerprint, get_scenario
+from .generator import GENERATOR_VERSION, generate_traffic_batch
+from .io.binary_trace import BINARY_TRACE_SUFFIX, export_events_to_binary, read_binary_trace
+from .io.csv_export import build_trace_path, export_events_to_csv
+from .io.trace_cache import TraceCache
+from .models.incast_wave import JitterScheme
+from .sim.fifo import FifoConfig, simulate_fifo
+from .validate import validate_generated_traffic
+
+
+DEFAULT_SWEEP_DIR = Path("src/data/sweeps")
+RESULTS_FILENAME = "results.csv"
+TRACE_FORMATS = ("csv", "binary", "none")
+
+TRAFFIC_PARAMETERS = tuple(field.name for field in fields(TrafficConfig))
+LINK_PARAMETERS = tuple(field.name for field in fields(FifoConfig))
+
+METRIC_COLUMNS = (
+    "packets",
+    "bytes",
+    "control_ratio",
+    "offered_load_gbps",
+    "drop_ratio",
+    "dropped_bytes",
+    "delay_p50_us",
+    "delay_p99_us",
+    "delay_p999_us",
+    "control_delay_p99_us",
+    "trace_path",
+    "elapsed_s",
+)
+
+SweepPoint = Mapping[str, object]
+
+
+@dataclass(frozen=True)
+class Range:
+    """Closed range for random_design: integers if both ends are ints, floats otherwise."""
+
+    low: float
+    high: float
+
+    def __post_init__(self) -> None:
+        if self.low > self.high:
+            raise ValueError("low must be <= high")
+
+    def sample(self, rng: random.Random):
+        if isinstance(self.low, int) and isinstance(self.high, int):
+            return rng.randint(self.low, self.high)
+        return rng.uniform(self.low, self.high)
+
+
+def grid_design(axes: Mapping[str, Sequence]) -> list[dict]:
+    """Every combination of the axis values, first axis varying slowest."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def random_design(
+    space: Mapping[str, Range | Sequence], samples: int, seed: int = 0
+) -> list[dict]:
+    """
+    samples points drawn independently per parameter.
+
+    A Range is sampled uniformly; any sequence, tuples included, is a set of choices.
+    Duplicate points are dropped.
+    """
+    if samples <= 0:
+        raise ValueError("samples must be > 0")
+    rng = random.Random(seed)
+    points: list[dict] = []
+    seen = set()
+    for _ in range(samples):
+        point = {}
+        for name, values in space.items():
+            if isinstance(values, Range):
+                point[name] = values.sample(rng)
+            else:
+                point[name] = rng.choice(list(values))
+        key = tuple(sorted(point.items()))
+        if key not in seen:
+            seen.add(key)
+            points.append(point)
+    return points
+
+
+def resolve_point(base: TrafficConfig, point: SweepPoint) -> tuple[TrafficConfig, FifoConfig]:
+    traffic_overrides = {}
+    link_overrides = {}
+    for name, value in point.items():
+        if name in TRAFFIC_PARAMETERS:
+            if name == "jitter_scheme" and not isinstance(value, JitterScheme):
+                value = JitterScheme(value)
+            traffic_overrides[name] = value
+        elif name in LINK_PARAMETERS:
+            link_overrides[name] = value
+        else:
+            allowed = ", ".join(TRAFFIC_PARAMETERS + LINK_PARAMETERS)
+            raise ValueError(f"Unknown sweep parameter '{name}'. Choose from: {allowed}")
+    return replace(base, **traffic_overrides), FifoConfig(**link_overrides)
+
+
+def point_id(config: TrafficConfig, link: FifoConfig) -> str:
+    """Stable key of one resolved point; also covers GENERATOR_VERSION."""
+    payload = (
+        f"{config_fingerprint(config)}:{GENERATOR_VERSION}:"
+        f"{link.link_rate_bps!r}:{link.buffer_bytes!r}"
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def run_point(
+    config: TrafficConfig,
+    link: FifoConfig,
+    trace_dir: Path,
+    trace_format: str = "csv",
+    cache: Optional[TraceCache] = None,
+) -> dict:
+    """
+    Generate, validate, export and simulate one point; returns its METRIC_COLUMNS.
+
+    With a cache, the events come from the point's binary cache entry, so a config seen before
+    is not generated again; the exported trace is written from those events, so the cache
+    holds one entry per config whatever trace_format is.
+    """
+    started = time.perf_counter()
+    batch = None
+    if cache is not None:
+        try:
+            batch = read_binary_trace(
+                cache.get_or_create(config, trace_format="binary").path
+            ).events
+        except FileNotFoundError:
+            # Evicted by another worker sharing the cache before it could be opened; the open
+            # memmap keeps the file readable once read_binary_trace returns.
+            batch = None
+    if batch is None:
+        batch = generate_traffic_batch(config)
+        validate_generated_traffic(batch, config)
+
+    trace_path = ""
+    if trace_format == "csv":
+        trace_path = export_events_to_csv(
+            batch, build_trace_path(config=config, output_dir=trace_dir)
+        )
+    elif trace_format == "binary":
+        trace_path = export_events_to_binary(
+            batch,
+            build_trace_path(config=config, output_dir=trace_dir, suffix=BINARY_TRACE_SUFFIX),
+            config=config,
+        )
+
+    stats = simulate_fifo(batch, link)
+    total_bytes = int(batch.packet_size_bytes.sum(dtype="int64"))
+    span_us = config.number_of_waves * config.wave_interval_us
+    p50, p99, p999 = stats.queue_delay_us_all.quantiles([0.5, 0.99, 0.999]).tolist()
+    return {
+        "packets": len(batch),
+        "bytes": total_bytes,
+        "control_ratio": (
+            int((batch.traffic_class == CONTROL_CODE).sum()) / len(batch) if len(batch) else 0.0
+        ),
+        "offered_load_gbps": total_bytes * 8 / span_us / 1e3 if span_us else float("nan"),
+        "drop_ratio": stats.drop_ratio,
+        "dropped_bytes": stats.dropped_bytes,
+        "delay_p50_us": p50,
+        "delay_p99_us": p99,
+        "delay_p999_us": p999,
+        "control_delay_p99_us": stats.queue_delay_us_control.quantile(0.99),
+        "trace_path": str(trace_path),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def _results_columns(parameter_names: Sequence[str]) -> list[str]:
+    return ["point_id", *parameter_names, *METRIC_COLUMNS]
+
+
+def load_results(results_path: Path) -> list[dict]:
+    """
+    Rows of a results table; a trailing partial row (interrupted write) is cut off the file.
+    """
+    if not results_path.exists():
+        return []
+    raw = results_path.read_bytes()
+    if raw and not raw.endswith(b"\n"):
+        with results_path.open("r+b") as results_file:
+            results_file.truncate(raw.rfind(b"\n") + 1)
+    with results_path.open(newline="", encoding="utf-8") as results_file:
+        return list(csv.DictReader(results_file))
+
+
+def _results_header(results_path: Path) -> Optional[list[str]]:
+    """Column names of an existing results table; None when there is no header yet."""
+    if not results_path.exists():
+        return None
+    with results_path.open(newline="", encoding="utf-8") as results_file:
+        return next(csv.reader(results_file), None)
+
+
+def run_sweep(
+    points: Sequence[SweepPoint],
+    *,
+    base: TrafficConfig,
+    sweep_dir: Path = DEFAULT_SWEEP_DIR,
+    jobs: int = 1,
+    trace_format: str = "csv",
+    cache: Optional[TraceCache] = None,
+) -> list[dict]:
+    """
+    Run every point not already in sweep_dir's results table and return the full table.
+
+    Points run concurrently when jobs > 1; rows are written by this process only, one per
+    finished point, so an interrupted sweep loses at most the points still in flight. cache
+    defaults to a TraceCache in `<sweep_dir>/cache`; pass a shared one to reuse traces across
+    sweeps.
+    """
+    if jobs <= 0:
+        raise ValueError("jobs must be > 0")
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f"trace_format must be one of: {', '.join(TRACE_FORMATS)}")
+
+    parameter_names = sorted({name for point in points for name in point})
+    columns = _results_columns(parameter_names)
+    resolved = {}
+    for point in points:
+        config, link = resolve_point(base, point)
+        resolved.setdefault(point_id(config, link), (point, config, link))
+
+    sweep_dir.mkdir(parents=True, exist_ok=True)
+    results_path = sweep_dir / RESULTS_FILENAME
+    existing = load_results(results_path)
+    header = _results_header(results_path)
+    if header is not None and header != columns:
+        raise ValueError(
+            f"{results_path} has columns {header}; this sweep needs {columns}. "
+            "Use a different sweep_dir for a different set of parameters."
+        )
+    done = {row["point_id"] for row in existing}
+    pending = [(key, *value) for key, value in resolved.items() if key not in done]
+
+    trace_dir = sweep_dir / "traces"
+    if cache is None:
+        cache = TraceCache(sweep_dir / "cache")
+    with results_path.open("a", newline="", encoding="utf-8") as results_file:
+        writer = csv.DictWriter(results_file, fieldnames=columns)
+        if header is None:
+            writer.writeheader()
+
+        def record(key: str, point: SweepPoint, metrics: dict) -> None:
+            row = {"point_id": key, **{name: point.get(name, "") for name in parameter_names}}
+            row.update(metrics)
+            writer.writerow(row)
+            results_file.flush()
+            existing.append({name: str(value) for name, value in row.items()})
+
+        failures: list[Exception] = []
+        if jobs == 1 or len(pending) <= 1:
+            for key, point, config, link in pending:
+                record(key, point, run_point(config, link, trace_dir, trace_format, cache))
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+                futures = {
+                    pool.submit(
+                        run_point, config, link, trace_dir, trace_format, cache
+                    ): (key, point)
+                    for key, point, config, link in pending
+                }
+                for future in as_completed(futures):
+                    try:
+                        metrics = future.result()
+                    except Exception as error:
+                        # Keep recording the other points so a rerun only repeats failures.
+                        failures.append(error)
+                        continue
+                    record(*futures[future], metrics)
+        if failures:
+            raise failures[0]
+
+    return existing
+
+
+def _parse_value(text: str):
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _parse_axis(text: str) -> tuple[str, list]:
+    name, separator, values = text.partition("=")
+    if not separator or not values:
+        raise argparse.ArgumentTypeError(f"Expected name=v1,v2,... got '{text}'")
+    return name, [_parse_value(value) for value in values.split(",")]
+
+
+def _parse_range(text: str) -> tuple[str, Range]:
+    name, separator, bounds = text.partition("=")
+    low, colon, high = bounds.partition(":")
+    if not separator or not colon:
+        raise argparse.ArgumentTypeError(f"Expected name=low:high, got '{text}'")
+    try:
+        return name, Range(_parse_value(low), _parse_value(high))
+    except (TypeError, ValueError) as error:
+        raise argparse.ArgumentTypeError(f"Invalid range '{text}': {error}") from None
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog=prog, description="Sweep traffic and link parameters.")
+    parser.add_argument(
+        "--scenario",
+        type=ScenarioName,
+        default=ScenarioName.NORMAL_TRAFFIC,
+        help="Base scenario the sweep parameters override.",
+    )
+    parser.add_argument(
+        "--grid",
+        type=_parse_axis,
+        action="append",
+        default=[],
+        help="Axis name=v1,v2,... (repeatable). Without --samples, all combinations run.",
+    )
+    parser.add_argument(
+        "--range",
+        type=_parse_range,
+        action="append",
+        default=[],
+        help="Random-design range name=low:high (repeatable); requires --samples.",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        help="Draw this many random points from the --grid choices and --range bounds.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random design.")
+    parser.add_argument("--sweep-dir", type=Path, default=DEFAULT_SWEEP_DIR)
+    parser.add_argument("--format", choices=TRACE_FORMATS, default="csv")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Trace cache directory (default <sweep-dir>/cache); share one across sweeps.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes; each runs one point at a time.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.samples is not None:
+        points = random_design(dict(args.grid + args.range), args.samples, seed=args.seed)
+    elif args.range:
+        parser.error("--range needs --samples")
+    else:
+        points = grid_design(dict(args.grid))
+
+    rows = run_sweep(
+        points,
+        base=get_scenario(args.scenario),
+        sweep_dir=args.sweep_dir,
+        jobs=args.jobs,
+        trace_format=args.format,
+        cache=TraceCache(args.cache_dir) if args.cache_dir is not None else None,
+    )
+    print(f"{len(rows)} points in {args.sweep_dir / RESULTS_FILENAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Tests the plot summary aggregation and its on-disk cache."""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import fields, replace
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic import aggregate
+from traffic.aggregate import load_or_build_summary, summarize_traffic
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic
+from traffic.models.classifier import TrafficClass
+
+
+def test_summary_matches_per_event_counting() -> None:
+    """Expectation: vectorized counts equal a plain loop over the event list."""
+    config = replace(normal_traffic(), number_of_waves=5, bytes_per_sender_per_wave=6_000)
+    events = generate_traffic(config)
+    summary = summarize_traffic(events, config)
+
+    packets = Counter(event.wave_id for event in events)
+    controls = Counter(
+        event.wave_id for event in events if event.traffic_class == TrafficClass.CONTROL
+    )
+    assert summary.wave_packet_counts.tolist() == [packets[w] for w in range(5)]
+    assert summary.wave_control_counts.tolist() == [controls[w] for w in range(5)]
+    load = summary.load_pyramid().query(0, 3 * config.wave_interval_us, level=0)
+    assert int(load.packets.sum()) == sum(
+        1 for event in events if event.packet_start_us < load.bin_edges_us[-1]
+    )
+
+    first_starts = {
+        (event.wave_id, event.sender_id): event.packet_start_us
+        for event in events
+        if event.packet_index_for_sender == 0
+    }
+    base = {w: min(t for (wave, _), t in first_starts.items() if wave == w) for w in range(5)}
+    assert sorted(
+        zip(summary.first_packet_wave_ids.tolist(), summary.first_packet_offsets_us.tolist())
+    ) == sorted((wave, t - base[wave]) for (wave, _), t in first_starts.items())
+
+
+def test_cached_summary_is_reused_without_regeneration(tmp_path: Path, monkeypatch) -> None:
+    """Expectation: the second request loads the .npz and never touches the generator."""
+    config = replace(normal_traffic(), number_of_waves=5, bytes_per_sender_per_wave=6_000)
+    built = load_or_build_summary(config, summary_dir=tmp_path)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    def fail(_config):
+        raise AssertionError("summary cache miss regenerated traffic")
+
+    monkeypatch.setattr(aggregate, "generate_traffic_batch", fail)
+    loaded = load_or_build_summary(config, summary_dir=tmp_path)
+    for field in fields(built):
+        np.testing.assert_array_equal(getattr(loaded, field.name), getattr(built, field.name))
+
+
+def test_explicit_events_bypass_the_cache(tmp_path: Path) -> None:
+    """Expectation: passed events are summarized as given and never read from or written to disk."""
+    config = replace(normal_traffic(), number_of_waves=5, bytes_per_sender_per_wave=6_000)
+    load_or_build_summary(config, summary_dir=tmp_path)
+    cached_files = sorted(tmp_path.iterdir())
+    events = generate_traffic(config)[:10]
+
+    summary = load_or_build_summary(config, summary_dir=tmp_path, events=events)
+
+    assert int(summary.wave_packet_counts.sum()) == 10
+    assert sorted(tmp_path.iterdir()) == cached_files
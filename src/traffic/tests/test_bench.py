@@ -0,0 +1,83 @@
+"""Tests the stage benchmark harness and baseline regression comparison."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.bench import (
+    BENCH_STAGES,
+    SCALED_SCENARIO,
+    bench_scenarios,
+    compare_to_baseline,
+    measure_stage,
+    run_benchmarks,
+)
+from traffic.config import ScenarioName, normal_traffic
+
+
+def _tiny_config():
+    return replace(normal_traffic(), number_of_waves=2, bytes_per_sender_per_wave=15_000)
+
+
+def _report(**metrics):
+    return {"version": 1, "results": [{"scenario": "s", "stage": "x", **metrics}]}
+
+
+def test_scenarios_cover_builtins_and_a_scaled_one() -> None:
+    """Expectation: every ScenarioName plus the scaled-up scenario is benchmarked."""
+    scenarios = bench_scenarios()
+
+    assert {name.value for name in ScenarioName} | {SCALED_SCENARIO} == set(scenarios)
+    assert scenarios[SCALED_SCENARIO].senders_per_wave > normal_traffic().senders_per_wave
+
+
+def test_every_stage_reports_time_memory_and_allocations() -> None:
+    """Expectation: each stage yields wall time, RSS, allocation figures and its event count."""
+    config = _tiny_config()
+    report = run_benchmarks({"tiny": config}, repeats=2, isolate=False)
+
+    assert [result["stage"] for result in report["results"]] == list(BENCH_STAGES)
+    packets = 32 * 2 * 10
+    for result in report["results"]:
+        assert result["wall_s_min"] <= result["wall_s_median"]
+        assert result["peak_rss_bytes"] > 0 and result["alloc_peak_bytes"] > 0
+        assert result["events"] == (64 if result["stage"] == "generate_wave_starts" else packets)
+
+
+def test_isolated_measurement_runs_in_a_fresh_process() -> None:
+    """Expectation: isolate=True returns the same shape of result from a spawned worker."""
+    result = measure_stage(
+        "generate_wave_starts", _tiny_config(), repeats=1, track_allocations=False
+    )
+
+    assert result["events"] == 64 and result["alloc_peak_bytes"] is None
+
+
+def test_baseline_comparison_flags_only_real_regressions() -> None:
+    """Expectation: ratios past the threshold regress; noise-level timings are ignored."""
+    baseline = _report(wall_s_min=1.0, peak_rss_bytes=100, alloc_peak_bytes=100)
+
+    slower = compare_to_baseline(
+        _report(wall_s_min=1.5, peak_rss_bytes=110, alloc_peak_bytes=100), baseline
+    )
+    tiny = compare_to_baseline(
+        _report(wall_s_min=0.004, peak_rss_bytes=100), _report(wall_s_min=0.001, peak_rss_bytes=100)
+    )
+    unknown = compare_to_baseline(
+        {"results": [{"scenario": "other", "stage": "x", "wall_s_min": 9.0}]}, baseline
+    )
+
+    assert [(item.metric, round(item.ratio, 2)) for item in slower] == [("wall_s_min", 1.5)]
+    assert tiny == [] and unknown == []
+
+
+def test_unknown_stage_is_rejected() -> None:
+    """Expectation: only the documented stages can be benchmarked."""
+    with pytest.raises(ValueError, match="Unknown benchmark stage 'nope'"):
+        measure_stage("nope", _tiny_config())
@@ -0,0 +1,70 @@
+"""Tests the memory-mappable binary trace format."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import ScenarioName, config_fingerprint, normal_traffic
+from traffic.generator import generate_traffic, generate_traffic_batch
+from traffic.io.binary_trace import (
+    export_events_to_binary,
+    generate_and_export_binary,
+    read_binary_trace,
+)
+
+
+def test_binary_round_trip_returns_memmap_columns(tmp_path: Path) -> None:
+    """Expectation: every column reads back as an identical np.memmap view."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=10_000)
+    batch = generate_traffic_batch(config)
+
+    trace = read_binary_trace(export_events_to_binary(batch, tmp_path / "t.trbin", config=config))
+
+    assert trace.row_count == len(batch)
+    assert trace.config_fingerprint == config_fingerprint(config)
+    for name, column in batch.columns().items():
+        loaded = getattr(trace.events, name)
+        assert isinstance(loaded, np.memmap)
+        assert np.array_equal(loaded, column)
+    assert trace.events.to_events() == generate_traffic(config)
+
+
+def test_binary_export_accepts_event_lists_and_empty_traces(tmp_path: Path) -> None:
+    """Expectation: list input and zero-row traces are written and read back without error."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=10_000)
+
+    from_list = read_binary_trace(export_events_to_binary(generate_traffic(config), tmp_path / "a"))
+    empty = read_binary_trace(export_events_to_binary([], tmp_path / "b"))
+
+    assert from_list.config_fingerprint is None
+    assert from_list.events.to_events() == generate_traffic(config)
+    assert empty.row_count == 0 and len(empty.events) == 0
+
+
+def test_read_binary_trace_rejects_foreign_files(tmp_path: Path) -> None:
+    """Expectation: a file without the trace magic is refused."""
+    path = tmp_path / "not_a_trace.trbin"
+    path.write_bytes(b"packet_start_us,wave_id\n" * 8)
+
+    with pytest.raises(ValueError, match="bad magic"):
+        read_binary_trace(path)
+
+
+def test_generate_and_export_binary_names_file_like_csv(tmp_path: Path) -> None:
+    """Expectation: binary export reuses the CSV naming scheme with a .trbin suffix."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=10_000)
+
+    output_path = generate_and_export_binary(
+        config=config, scenario_name=ScenarioName.NORMAL_TRAFFIC, output_dir=tmp_path
+    )
+
+    assert output_path.name.startswith("normal_traffic")
+    assert output_path.suffix == ".trbin"
+    assert read_binary_trace(output_path).row_count == len(generate_traffic(config))
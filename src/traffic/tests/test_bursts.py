@@ -0,0 +1,115 @@
+"""Tests the run-length burst representation against per-packet generation."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import high_congestion, normal_traffic
+from traffic.generator import (
+    generate_traffic_bursts,
+    generate_traffic_staged,
+    iter_burst_events,
+)
+from traffic.models.classifier import classify_packets, iter_classified_burst_packets
+from traffic.models.incast_wave import generate_wave_starts
+from traffic.models.packetizer import burst_wave_starts, iter_burst_packets, packetize_wave_starts
+from traffic.validate import validate_bursts
+
+
+def test_bursts_expand_to_packetized_events() -> None:
+    """Expectation: expanding bursts reproduces packetize_wave_starts exactly."""
+    wave_starts = generate_wave_starts(
+        senders_per_wave=4,
+        number_of_waves=3,
+        first_wave_start_us=0,
+        wave_interval_us=100,
+        max_start_offset_us=10,
+        seed=1,
+    )
+    kwargs = dict(wave_starts=wave_starts, bytes_per_sender_per_wave=4_000, packet_size_bytes=1_500)
+
+    bursts = burst_wave_starts(**kwargs)
+
+    assert len(bursts) == len(wave_starts)
+    assert list(iter_burst_packets(bursts)) == packetize_wave_starts(**kwargs)
+
+
+def test_classified_bursts_match_per_packet_classification() -> None:
+    """Expectation: burst CONTROL counts, tags and expansion agree with classify_packets."""
+    config = replace(
+        normal_traffic(),
+        number_of_waves=5,
+        bytes_per_sender_per_wave=10_000,
+        control_packet_every_n=7,
+        control_priority_tag=34,
+        bulk_priority_tag=8,
+    )
+    classified_bursts = generate_traffic_bursts(config)
+
+    expanded = list(
+        iter_classified_burst_packets(
+            classified_bursts=classified_bursts,
+            control_packet_every_n=config.control_packet_every_n,
+        )
+    )
+    wave_starts = generate_wave_starts(
+        senders_per_wave=config.senders_per_wave,
+        number_of_waves=config.number_of_waves,
+        first_wave_start_us=config.first_wave_start_us,
+        wave_interval_us=config.wave_interval_us,
+        max_start_offset_us=config.max_start_offset_us,
+        seed=config.seed,
+    )
+    expected = classify_packets(
+        packet_events=packetize_wave_starts(
+            wave_starts=wave_starts,
+            bytes_per_sender_per_wave=config.bytes_per_sender_per_wave,
+            packet_size_bytes=config.packet_size_bytes,
+        ),
+        control_packet_every_n=config.control_packet_every_n,
+        control_priority_tag=config.control_priority_tag,
+        bulk_priority_tag=config.bulk_priority_tag,
+    )
+
+    assert expanded == expected
+    assert sum(burst.control_packet_count for burst in classified_bursts) == sum(
+        1 for event in expected if event.priority_tag == config.control_priority_tag
+    )
+
+
+def test_burst_events_match_generate_traffic() -> None:
+    """Expectation: bursts expand lazily into the exact generate_traffic output."""
+    config = replace(normal_traffic(), number_of_waves=5, bytes_per_sender_per_wave=10_000)
+
+    assert list(iter_burst_events(generate_traffic_bursts(config), config)) == (
+        generate_traffic_staged(config)
+    )
+
+
+def test_validate_bursts_on_large_scenario_without_expansion() -> None:
+    """Expectation: high_congestion validates from ~350x fewer burst records."""
+    config = high_congestion()
+
+    bursts = generate_traffic_bursts(config)
+
+    assert len(bursts) == config.senders_per_wave * config.number_of_waves
+    validate_bursts(bursts, config)
+
+
+def test_validate_bursts_reports_missing_sender() -> None:
+    """Expectation: dropping one burst surfaces the same coverage error as per-packet checks."""
+    config = replace(normal_traffic(), number_of_waves=5, bytes_per_sender_per_wave=10_000)
+    bursts = [
+        classified_burst
+        for classified_burst in generate_traffic_bursts(config)
+        if not (classified_burst.burst.wave_id == 2 and classified_burst.burst.sender_id == 5)
+    ]
+
+    with pytest.raises(ValueError, match="Sender coverage mismatch for wave 2"):
+        validate_bursts(bursts, config)
@@ -0,0 +1,92 @@
+"""Tests the unified `traffic` command: lazy imports, dispatch and the trace commands."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.cli import main
+from traffic.profiling import PROFILE_STAGES
+
+
+def _loaded_after(code: str, cwd: Path) -> list[str]:
+    """Heavy modules present in sys.modules after running code in a fresh interpreter."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import json, sys\n{code}\n"
+            "print(json.dumps([name for name in ('numpy', 'matplotlib', 'traffic.generator') "
+            "if name in sys.modules]))",
+        ],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_help_and_dispatch_load_no_pipeline_modules() -> None:
+    """Expectation: parsing `traffic export --help` imports neither NumPy nor the generator."""
+    loaded = _loaded_after(
+        "from traffic.cli import main\n"
+        "try:\n"
+        "    main(['export', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass",
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    assert loaded == []
+
+
+def test_export_never_loads_matplotlib(tmp_path: Path) -> None:
+    """Expectation: a full `traffic export` run imports the pipeline but not matplotlib."""
+    loaded = _loaded_after(
+        "from traffic.cli import main\n"
+        f"main(['export', '--format', 'binary', '--output-dir', {str(tmp_path)!r}])",
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    assert loaded == ["numpy", "traffic.generator"]
+    assert len(list(tmp_path.glob("*.trbin"))) == 1
+
+
+def test_export_then_validate_round_trip(tmp_path: Path, capsys) -> None:
+    """Expectation: an exported trace validates for its scenario and fails for another."""
+    profile_path = tmp_path / "profile.json"
+    assert (
+        main(["export", "--output-dir", str(tmp_path), "--profile-json", str(profile_path)])
+        == 0
+    )
+    (trace_path,) = tmp_path.glob("*.csv")
+    report = json.loads(profile_path.read_text())
+    assert [stage["name"] for stage in report["stages"]] == [
+        name for name in PROFILE_STAGES if name != "materialization"
+    ]
+
+    assert main(["validate", str(trace_path)]) == 0
+    assert "events match normal_traffic" in capsys.readouterr().out
+    assert main(["validate", str(trace_path), "--scenario", "high_congestion"]) == 1
+    assert "mismatch" in capsys.readouterr().err
+
+
+def test_invalid_scenario_is_a_usage_error(capsys) -> None:
+    """Expectation: an unknown scenario exits with status 2 and lists the valid names."""
+    with pytest.raises(SystemExit) as exit_info:
+        main(["generate", "--scenario", "nope"])
+    assert exit_info.value.code == 2
+    assert "normal_traffic" in capsys.readouterr().err
+
+
+def test_delegated_command_receives_remaining_arguments(capsys) -> None:
+    """Expectation: plot/bench/sweep parse their own arguments under a `traffic <cmd>` prog."""
+    with pytest.raises(SystemExit) as exit_info:
+        main(["sweep", "--help"])
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out.startswith("usage: traffic sweep")
@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import csv
+from dataclasses import replace
 from pathlib import Path
 import sys
 
+import pytest
+
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from traffic.config import ScenarioName, normal_traffic
@@ -44,3 +47,18 @@ def test_generate_and_export_csv_filename_contains_scenario_and_seed(tmp_path: P
     assert "normal_traffic" in filename
     assert f"seed{config.seed}" in filename
     assert filename.endswith(".csv")
+
+
+def test_generate_and_export_csv_schedule_validation_matches_full(tmp_path: Path) -> None:
+    """Expectation: schedule-mode validation writes the same trace; streaming rejects it."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    full_path = generate_and_export_csv(config=config, output_dir=tmp_path / "full")
+    schedule_path = generate_and_export_csv(
+        config=config, output_dir=tmp_path / "schedule", validation_mode="schedule"
+    )
+
+    assert schedule_path.read_bytes() == full_path.read_bytes()
+    with pytest.raises(ValueError, match="only supports validation_mode='full'"):
+        generate_and_export_csv(
+            config=config, output_dir=tmp_path, stream=True, validation_mode="schedule"
+        )
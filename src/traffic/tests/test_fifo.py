@@ -0,0 +1,107 @@
+"""Tests the vectorized drop-tail FIFO simulator against a per-packet Lindley reference."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic, generate_traffic_batch
+from traffic.io.binary_trace import export_events_to_binary
+from traffic.io.csv_export import export_events_to_csv
+from traffic.sim.fifo import FifoConfig, drop_tail_fifo, simulate_fifo
+
+
+def _reference_fifo(starts, sizes, config: FifoConfig):
+    rate = config.link_rate_bps / 8e6
+    backlog, previous = 0.0, int(starts[0])
+    admitted, delays = [], []
+    for start_us, size in zip(starts.tolist(), sizes.tolist()):
+        backlog = max(0.0, backlog - rate * (start_us - previous))
+        previous = start_us
+        fits = backlog + size <= config.buffer_bytes
+        admitted.append(fits)
+        delays.append(backlog / rate if fits else np.nan)
+        backlog += size if fits else 0
+    return np.array(admitted), np.array(delays)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_per_packet_reference(seed: int) -> None:
+    """Expectation: admissions and delays equal a packet-at-a-time Lindley recursion."""
+    rng = np.random.default_rng(seed)
+    # Mix of lone packets, small bursts and large bursts sharing a timestamp.
+    starts = np.sort(rng.integers(0, 2_000, 3_000) // rng.choice([1, 50]))
+    sizes = rng.choice([64, 700, 1_500], starts.shape[0])
+    config = FifoConfig(link_rate_bps=float(rng.choice([1e9, 10e9])), buffer_bytes=30_000)
+
+    admitted, delays = drop_tail_fifo(starts, sizes, config)
+    expected_admitted, expected_delays = _reference_fifo(starts, sizes, config)
+
+    np.testing.assert_array_equal(admitted, expected_admitted)
+    np.testing.assert_allclose(delays[admitted], expected_delays[admitted])
+    assert np.isnan(delays[~admitted]).all()
+
+
+def test_stats_are_consistent_and_split_by_class() -> None:
+    """Expectation: arrivals = drops + transmissions, and class delays partition all delays."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=40_000)
+    batch = generate_traffic_batch(config)
+    stats = simulate_fifo(batch, FifoConfig(link_rate_bps=10e9, buffer_bytes=200_000))
+
+    assert stats.arrived_packets == len(batch)
+    assert stats.dropped_packets > 0
+    assert stats.arrived_packets == stats.dropped_packets + stats.transmitted_packets
+    assert stats.arrived_bytes == stats.dropped_bytes + stats.transmitted_bytes
+    assert stats.queue_delay_us_all.count == stats.transmitted_packets
+    assert (
+        stats.queue_delay_us_control.count + stats.queue_delay_us_bulk.count
+        == stats.transmitted_packets
+    )
+    assert stats.queue_delay_us_all.max <= 200_000 * 8 / 10e9 * 1e6
+
+
+def test_unlimited_buffer_never_drops() -> None:
+    """Expectation: with a buffer larger than the whole trace every packet is sent."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=40_000)
+    batch = generate_traffic_batch(config)
+    stats = simulate_fifo(batch, FifoConfig(buffer_bytes=10**12))
+
+    assert stats.dropped_packets == 0
+    assert stats.queue_delay_us_all.min == 0
+
+
+def test_events_batches_and_traces_give_the_same_result(tmp_path: Path) -> None:
+    """Expectation: event lists, CSV traces and binary traces are interchangeable inputs."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=40_000)
+    events = generate_traffic(config)
+    fifo = FifoConfig(link_rate_bps=10e9, buffer_bytes=150_000)
+
+    results = [
+        simulate_fifo(events, fifo),
+        simulate_fifo(export_events_to_csv(events, tmp_path / "trace.csv"), fifo),
+        simulate_fifo(export_events_to_binary(events, tmp_path / "trace.trbin"), fifo),
+    ]
+
+    for stats in results[1:]:
+        assert stats.dropped_bytes == results[0].dropped_bytes
+        np.testing.assert_array_equal(
+            stats.queue_delay_us_all.counts, results[0].queue_delay_us_all.counts
+        )
+
+
+def test_unsorted_arrivals_and_bad_config_are_rejected() -> None:
+    """Expectation: arrivals must be time ordered and the link must have a positive rate."""
+    starts = np.array([0, 5, 3])
+    sizes = np.array([100, 100, 100])
+
+    with pytest.raises(ValueError, match="not sorted"):
+        drop_tail_fifo(starts, sizes, FifoConfig())
+    with pytest.raises(ValueError, match="link_rate_bps must be > 0"):
+        drop_tail_fifo(starts, sizes, FifoConfig(link_rate_bps=0))
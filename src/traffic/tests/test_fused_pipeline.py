@@ -0,0 +1,52 @@
+"""Tests that the fused generation pass matches the staged pipeline at a fraction of the memory."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+import tracemalloc
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import congestion_avoidance, normal_traffic
+from traffic.generator import generate_traffic, generate_traffic_staged
+
+
+def _peak_traced_bytes(generate, config) -> int:
+    tracemalloc.start()
+    try:
+        generate(config)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_fused_matches_staged_pipeline() -> None:
+    """Expectation: fused generation yields exactly the staged pipeline's events."""
+    config = replace(normal_traffic(), number_of_waves=5)
+
+    assert generate_traffic(config) == generate_traffic_staged(config)
+
+
+def test_fused_matches_staged_with_remainder_packets_and_overlap() -> None:
+    """Expectation: remainder sizes and overlapping waves are handled identically."""
+    config = replace(
+        congestion_avoidance(),
+        number_of_waves=4,
+        wave_interval_us=10,
+        bytes_per_sender_per_wave=7_777,
+        control_packet_every_n=4,
+    )
+
+    assert generate_traffic(config) == generate_traffic_staged(config)
+
+
+def test_fused_peak_memory_is_at_least_three_times_lower() -> None:
+    """Expectation: fused generation peaks at <= 1/3 of the staged pipeline's traced memory."""
+    config = replace(normal_traffic(), number_of_waves=10)
+
+    fused_peak = _peak_traced_bytes(generate_traffic, config)
+    staged_peak = _peak_traced_bytes(generate_traffic_staged, config)
+
+    assert fused_peak * 3 <= staged_peak
@@ -0,0 +1,80 @@
+"""Tests the multi-resolution offered-load pyramid."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic_batch
+from traffic import load_pyramid
+from traffic.load_pyramid import LoadPyramid, build_load_pyramid
+
+
+def test_every_level_preserves_totals_by_class() -> None:
+    """Expectation: each resolution sums to the same per-class packet and byte totals."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    batch = generate_traffic_batch(config)
+    pyramid = build_load_pyramid(batch, config)
+
+    expected_packets = np.bincount(batch.traffic_class, minlength=2)
+    expected_bytes = np.bincount(batch.traffic_class, weights=batch.packet_size_bytes, minlength=2)
+    assert pyramid.bin_widths_us[-1] >= config.wave_interval_us
+    for packets, packet_bytes in zip(pyramid.packets, pyramid.bytes):
+        np.testing.assert_array_equal(packets.sum(axis=0), expected_packets)
+        np.testing.assert_array_equal(packet_bytes.sum(axis=0), expected_bytes)
+
+
+def test_query_matches_direct_histogram_of_window() -> None:
+    """Expectation: a window query equals histogramming the raw events at that bin width."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    batch = generate_traffic_batch(config)
+    pyramid = build_load_pyramid(batch, config)
+
+    window = pyramid.query(4_990, 10_070, max_bins=400)
+    assert window.bin_width_us == 16
+    assert window.bin_edges_us[0] <= 4_990 and window.bin_edges_us[-1] >= 10_070
+
+    for code in (0, 1):
+        in_class = batch.traffic_class == code
+        expected, _ = np.histogram(batch.packet_start_us[in_class], bins=window.bin_edges_us)
+        np.testing.assert_array_equal(window.packets[:, code], expected)
+
+
+def test_saved_pyramid_round_trips(tmp_path: Path) -> None:
+    """Expectation: load rebuilds identical levels from the stored finest level."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    pyramid = build_load_pyramid(generate_traffic_batch(config), config)
+    loaded = LoadPyramid.load(pyramid.save(tmp_path / "load.npz"))
+
+    assert loaded.bin_widths_us == pyramid.bin_widths_us
+    for original, restored in zip(pyramid.bytes, loaded.bytes):
+        np.testing.assert_array_equal(original, restored)
+
+    with pytest.raises(ValueError, match="end_us must be > start_us"):
+        loaded.query(10, 10)
+
+
+def test_base_level_is_bounded_and_chunked_binning_is_exact(monkeypatch) -> None:
+    """Expectation: a long trace gets a coarser base level; binning in chunks changes nothing."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    batch = generate_traffic_batch(config)
+    reference = build_load_pyramid(batch, config, base_bin_us=1)
+
+    bounded = build_load_pyramid(batch, config, max_base_bins=500)
+    assert bounded.bin_widths_us[0] == 64
+    level = reference.bin_widths_us.index(64)
+    np.testing.assert_array_equal(bounded.bytes[0], reference.bytes[level])
+
+    monkeypatch.setattr(load_pyramid, "BIN_CHUNK_EVENTS", 97)
+    chunked = build_load_pyramid(batch, config, base_bin_us=1)
+    for original, rebuilt in zip(
+        reference.packets + reference.bytes, chunked.packets + chunked.bytes
+    ):
+        np.testing.assert_array_equal(original, rebuilt)
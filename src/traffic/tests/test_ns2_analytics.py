@@ -0,0 +1,81 @@
+"""Tests one-pass per-flow, per-link and per-node ns-2 trace analytics."""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.ns2_analytics import ACTION_NAMES, analyze_ns2_trace
+from traffic.tests.test_ns2_trace import write_trace
+
+
+ACTION_BY_SYMBOL = dict(zip("+-rd", ACTION_NAMES))
+
+
+def _analyze(tmp_path: Path, lines: int = 5_000):
+    path = tmp_path / "out.tr"
+    rows = write_trace(path, lines=lines)
+    return rows, analyze_ns2_trace(path, bin_s=0.5, chunk_bytes=4_096)
+
+
+def test_totals_and_throughput_match_line_by_line_reference(tmp_path: Path) -> None:
+    """Expectation: counts and throughput bins equal a dict-per-line computation."""
+    rows, analytics = _analyze(tmp_path)
+
+    assert analytics.sent == sum(1 for row in rows if row[0] == "+")
+    assert analytics.received == sum(1 for row in rows if row[0] == "r")
+    assert analytics.dropped == sum(1 for row in rows if row[0] == "d")
+
+    time_bytes = defaultdict(int)
+    for row in rows:
+        if row[0] == "r" and row[7] == "32":
+            time_bytes[int(float(row[1]) // 0.5)] += int(row[5])
+    times, kbps = analytics.throughput_kbps(flow_id=32)
+    assert times.tolist() == [slot * 0.5 for slot in sorted(time_bytes)]
+    assert kbps.tolist() == [time_bytes[slot] * 8 / 1000 / 0.5 for slot in sorted(time_bytes)]
+
+
+def test_flow_link_and_node_views_match_reference(tmp_path: Path) -> None:
+    """Expectation: grouped views agree with counting each line by flow, link and node."""
+    rows, analytics = _analyze(tmp_path)
+
+    per_flow = Counter((int(row[7]), row[0]) for row in rows)
+    per_link = Counter((int(row[2]), int(row[3]), row[0]) for row in rows)
+    per_node = Counter(
+        (int(row[3]) if row[0] == "r" else int(row[2]), row[0]) for row in rows
+    )
+
+    flows, links, nodes = analytics.per_flow(), analytics.per_link(), analytics.per_node()
+    for flow_id in (16, 32, 512):
+        expected = {ACTION_BY_SYMBOL[s]: per_flow[(flow_id, s)] for s in "+-rd"}
+        assert flows.counts(flow_id) == expected
+    for from_node in range(6):
+        for to_node in range(6):
+            expected = {ACTION_BY_SYMBOL[s]: per_link[(from_node, to_node, s)] for s in "+-rd"}
+            assert links.counts(from_node, to_node) == expected
+        expected = {ACTION_BY_SYMBOL[s]: per_node[(from_node, s)] for s in "+-rd"}
+        assert nodes.counts(from_node) == expected
+
+
+def test_filters_select_packet_type_and_nodes(tmp_path: Path) -> None:
+    """Expectation: where() narrows by packet type and node sets before grouping."""
+    rows, analytics = _analyze(tmp_path)
+
+    cbr = analytics.flow_links.where(packet_type=analytics.packet_type_code("cbr"))
+    sent = cbr.where(from_node=[0, 1, 2]).group_by("flow_id")
+    expected = sum(
+        1
+        for row in rows
+        if row[0] == "+" and row[4] == "cbr" and row[2] in "012" and row[7] == "16"
+    )
+    assert sent.counts(16)["enqueue"] == expected
+
+    with pytest.raises(ValueError, match="does not occur"):
+        analytics.packet_type_code("rtProtoDV")
+    with pytest.raises(ValueError, match="Unknown key"):
+        analytics.flow_links.where(seq=1)
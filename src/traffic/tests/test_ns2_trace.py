@@ -0,0 +1,84 @@
+"""Tests the chunked ns-2 trace parser."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.io.ns2_trace import (
+    DROP,
+    ENQUEUE,
+    MISSING_PACKET_ID,
+    RECEIVE,
+    read_ns2_trace,
+)
+
+
+def write_trace(path: Path, lines: int = 2_000, seed: int = 3) -> list[list[str]]:
+    rng = random.Random(seed)
+    rows = []
+    time_s = 0.0
+    for packet_id in range(lines):
+        time_s += rng.random() * 0.01
+        flow_id = rng.choice([16, 32, 512])
+        rows.append(
+            [
+                rng.choice("+-rd"),
+                f"{time_s:.6f}",
+                str(rng.randrange(6)),
+                str(rng.randrange(6)),
+                rng.choice(["cbr", "tcp", "ack"]),
+                str(rng.choice([16, 32, 512, 1040])),
+                "-------",
+                str(flow_id),
+                "0.0",
+                "5.0",
+                str(packet_id // 3),
+                str(packet_id),
+            ]
+        )
+    text = "\n".join(" ".join(row) for row in rows)
+    # A malformed line and a blank line must be skipped like the original script did.
+    path.write_text("v 0.0 eval {set sim_annotation start}\n\n" + text + "\n")
+    return rows
+
+
+def test_columns_round_trip_every_field(tmp_path: Path) -> None:
+    """Expectation: small chunks still parse every 12-field line into typed columns."""
+    path = tmp_path / "out.tr"
+    rows = write_trace(path)
+
+    trace = read_ns2_trace(path, chunk_bytes=997)
+
+    assert len(trace["time_s"]) == len(rows)
+    np.testing.assert_array_equal(trace["time_s"], [float(row[1]) for row in rows])
+    np.testing.assert_array_equal(trace["to_node"], [int(row[3]) for row in rows])
+    np.testing.assert_array_equal(trace["flow_id"], [int(row[7]) for row in rows])
+    np.testing.assert_array_equal(trace["seq"], [int(row[10]) for row in rows])
+    assert [trace["packet_types"][code] for code in trace["packet_type"].tolist()] == [
+        row[4] for row in rows
+    ]
+    assert [("+-rd")[code] for code in trace["action"].tolist()] == [row[0] for row in rows]
+    assert (ENQUEUE, RECEIVE, DROP) == (0, 2, 3)
+
+
+def test_short_and_long_lines_do_not_shift_later_records(tmp_path: Path) -> None:
+    """Expectation: an 11-field and a 13-field line in one block leave later records aligned."""
+    path = tmp_path / "out.tr"
+    path.write_text(
+        "+ 0.1 0 1 cbr 16 ------- 16 0.0 5.0 7\n"
+        "r 0.2 1 2 tcp 32 ------- 32 0.0 5.0 8 9 extra\n"
+        "d 0.3 2 3 ack 512 ------- 512 0.0 5.0 10 11\n"
+    )
+
+    trace = read_ns2_trace(path)
+
+    np.testing.assert_array_equal(trace["time_s"], [0.1, 0.2, 0.3])
+    np.testing.assert_array_equal(trace["seq"], [7, 8, 10])
+    np.testing.assert_array_equal(trace["packet_id"], [MISSING_PACKET_ID, 9, 11])
+    np.testing.assert_array_equal(trace["size_bytes"], [16, 32, 512])
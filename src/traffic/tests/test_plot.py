@@ -0,0 +1,52 @@
+"""Tests the plot entry point: lazy matplotlib import and the --only selector."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic import plot
+
+
+def test_importing_plot_module_does_not_load_matplotlib() -> None:
+    """Expectation: matplotlib is imported only once a figure is rendered."""
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, traffic.plot; print('matplotlib' in sys.modules)"],
+        cwd=Path(__file__).resolve().parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_only_renders_the_selected_plot(tmp_path: Path, monkeypatch) -> None:
+    """Expectation: --only writes exactly the chosen figures plus the plot guide."""
+    out_dir = tmp_path / "plots"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "plot",
+            "--out-dir",
+            str(out_dir),
+            "--summary-dir",
+            str(tmp_path / "summaries"),
+            "--only",
+            "events_per_wave",
+            "--only",
+            "input_signal_timeline",
+            "--jobs",
+            "1",
+        ],
+    )
+    plot.main()
+
+    assert sorted(path.name for path in out_dir.iterdir()) == [
+        "events_per_wave.png",
+        "input_signal_timeline.png",
+        "plots.txt",
+    ]
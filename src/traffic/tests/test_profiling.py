@@ -0,0 +1,123 @@
+"""Tests per-stage profiling of generation, validation and export."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic import profiling
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic, generate_traffic_batch, generate_traffic_staged
+from traffic.io.csv_export import generate_and_export_csv
+from traffic.profiling import PROFILE_STAGES, StageProfiler, profile_iter, profile_stage
+
+
+def test_batch_generation_reports_every_generation_stage() -> None:
+    """Expectation: columnar generation profiles each stage with its event count, same output."""
+    config = replace(normal_traffic(), number_of_waves=4, senders_per_wave=8)
+    profiler = StageProfiler()
+    batch = generate_traffic_batch(config, profiler=profiler)
+    report = profiler.report()
+
+    expected = generate_traffic_batch(config)
+    assert np.array_equal(batch.packet_start_us, expected.packet_start_us)
+    assert np.array_equal(batch.traffic_class, expected.traffic_class)
+
+    assert [stage.name for stage in report.stages] == list(PROFILE_STAGES[:3])
+    assert report.stage("wave_scheduling").events == 32
+    for name in ("packetizing", "classification"):
+        stage = report.stage(name)
+        assert stage.events == len(batch)
+        assert stage.calls == 1
+        assert stage.wall_s >= 0
+        assert stage.peak_rss_bytes > 0
+    assert report.total_wall_s == sum(stage.wall_s for stage in report.stages)
+
+
+def test_object_pipelines_report_their_stages() -> None:
+    """Expectation: the staged pipeline splits every stage; the fused one reports two."""
+    config = replace(normal_traffic(), number_of_waves=4, senders_per_wave=8)
+
+    staged = StageProfiler()
+    events = generate_traffic_staged(config, profiler=staged)
+    assert [stage.name for stage in staged.report().stages] == list(PROFILE_STAGES[:4])
+    assert staged.report().stage("classification").events == len(events)
+
+    fused = StageProfiler()
+    assert generate_traffic(config, profiler=fused) == events
+    assert [stage.name for stage in fused.report().stages] == [
+        "wave_scheduling",
+        "materialization",
+    ]
+
+
+def test_export_profiles_validation_and_export_in_both_modes(tmp_path: Path) -> None:
+    """Expectation: batch and streaming export count every event once per stage."""
+    config = replace(normal_traffic(), number_of_waves=4, senders_per_wave=8)
+    batch_profiler = StageProfiler()
+    batch_path = generate_and_export_csv(
+        config=config, output_dir=tmp_path / "batch", profiler=batch_profiler
+    )
+    stream_profiler = StageProfiler()
+    stream_path = generate_and_export_csv(
+        config=config,
+        output_dir=tmp_path / "stream",
+        stream=True,
+        chunk_size=50,
+        profiler=stream_profiler,
+    )
+
+    assert batch_path.read_bytes() == stream_path.read_bytes()
+    number_of_events = len(generate_traffic_batch(config))
+    for report in (batch_profiler.report(), stream_profiler.report()):
+        for name in ("validation", "export"):
+            assert report.stage(name).events == number_of_events
+    assert batch_profiler.report().stage("packetizing").events == number_of_events
+    assert stream_profiler.report().stage("materialization").events == number_of_events
+    assert stream_profiler.report().stage("export").calls == 1
+    assert stream_profiler.report().stage("materialization").calls > 1
+
+
+def test_nested_stages_report_self_time() -> None:
+    """Expectation: time spent in a nested stage is not charged to the enclosing one."""
+    profiler = StageProfiler(track_memory=False)
+    with profiler.stage("export"):
+        with profiler.stage("validation", events=3):
+            time.sleep(0.05)
+    report = profiler.report()
+
+    assert report.stage("validation").wall_s >= 0.05
+    assert report.stage("export").wall_s < 0.05
+    assert report.stage("validation").events_per_s is not None
+    assert report.stage("export").peak_rss_bytes is None
+    assert not report.peak_rss_is_stage_local
+
+
+def test_disabled_profiling_is_a_pass_through() -> None:
+    """Expectation: without a profiler the hooks neither wrap iterables nor record anything."""
+    chunks = [[1, 2], [3]]
+    assert profile_iter(None, "materialization", chunks) is chunks
+    with profile_stage(None, "export") as stage:
+        stage.add_events(10)
+        assert stage.counted(chunks) is chunks
+
+
+def test_iter_stage_counts_items_not_exhaustion(monkeypatch) -> None:
+    """Expectation: one call per item, and the RSS mark is reset once per top-level stage."""
+    resets = []
+    monkeypatch.setattr(profiling, "reset_peak_rss", lambda: resets.append(1) or True)
+    profiler = StageProfiler()
+    with profiler.stage("export"):
+        assert list(profiler.iter_stage("materialization", [[1, 2], [3]])) == [[1, 2], [3]]
+    report = profiler.report()
+
+    assert report.stage("materialization").calls == 2
+    assert report.stage("materialization").events == 3
+    assert report.stage("export").peak_rss_bytes >= report.stage("materialization").peak_rss_bytes
+    assert len(resets) == 1
@@ -0,0 +1,183 @@
+"""Tests the multi-queue SP / WRR / DRR link scheduler against a per-packet reference."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.columnar import TrafficBatch
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic_batch
+from traffic.sim.fifo import FifoConfig, simulate_fifo
+from traffic.sim.scheduler import (
+    QueueConfig,
+    SchedulerConfig,
+    SchedulerPolicy,
+    schedule_packets,
+    simulate_scheduler,
+)
+
+
+def _reference_scheduler(batch: TrafficBatch, config: SchedulerConfig):
+    """One packet per step; same occupancy and tie-breaking rules as the run-based version."""
+    rate = config.link_rate_bps / 8e6
+    tags = [queue.priority_tag for queue in config.queues]
+    queues = [deque() for _ in tags]
+    queued = [0] * len(tags)
+    sizes = batch.packet_size_bytes.tolist()
+    starts = batch.packet_start_us.tolist()
+    order, delays = [], {}
+    anchor, sent, wire, turn, turn_open, credit = min(starts), 0, -1, len(tags) - 1, False, 0
+    link_free = anchor
+    deficits = [0] * len(tags)
+
+    def send(index):
+        nonlocal link_free, sent, wire
+        row = queues[index].popleft()
+        queued[index] -= sizes[row]
+        delays[row] = link_free - starts[row]
+        order.append(row)
+        sent += sizes[row]
+        link_free = anchor + sent / rate
+        wire = index
+
+    times = sorted(set(starts)) + [np.inf]
+    row = 0
+    for now in times:
+        while link_free < now and any(queues):
+            if config.policy is SchedulerPolicy.STRICT_PRIORITY:
+                send(next(i for i, queue in enumerate(queues) if queue))
+                continue
+            if not (turn_open and queues[turn]):
+                if not queues[turn]:
+                    deficits[turn] = 0
+                turn = next(
+                    (turn + step) % len(tags)
+                    for step in range(1, len(tags) + 1)
+                    if queues[(turn + step) % len(tags)]
+                )
+                turn_open, credit = True, config.queues[turn].weight
+                deficits[turn] += config.queues[turn].quantum_bytes
+            if config.policy is SchedulerPolicy.WEIGHTED_ROUND_ROBIN:
+                send(turn)
+                credit -= 1
+                turn_open = credit > 0
+            elif sizes[queues[turn][0]] > deficits[turn]:
+                turn_open = False
+            else:
+                deficits[turn] -= sizes[queues[turn][0]]
+                send(turn)
+                if not queues[turn]:
+                    deficits[turn], turn_open = 0, False
+        if now == np.inf:
+            break
+        if link_free < now:
+            anchor, sent, link_free = now, 0, now
+        while row < len(starts) and starts[row] == now:
+            index = tags.index(int(batch.priority_tag[row]))
+            occupancy = queued[index]
+            if index == wire:
+                occupancy += max(0.0, link_free - now) * rate
+            if occupancy + sizes[row] <= config.queues[index].buffer_bytes:
+                queues[index].append(row)
+                queued[index] += sizes[row]
+            row += 1
+    return np.array(order), delays
+
+
+def _random_batch(seed: int, number_of_packets: int = 2_000) -> TrafficBatch:
+    rng = np.random.default_rng(seed)
+    batch = generate_traffic_batch(normal_traffic())[:number_of_packets]
+    starts = np.sort(rng.integers(0, 1_500, number_of_packets) // rng.choice([1, 40]))
+    return replace(
+        batch,
+        packet_start_us=starts,
+        packet_size_bytes=rng.choice([64, 700, 1_500], number_of_packets).astype(np.uint32),
+        priority_tag=rng.choice([0, 10, 46], number_of_packets).astype(np.uint8),
+    )
+
+
+@pytest.mark.parametrize("policy", list(SchedulerPolicy))
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_per_packet_reference(policy: SchedulerPolicy, seed: int) -> None:
+    """Expectation: transmit order and delays equal a packet-at-a-time simulation."""
+    batch = _random_batch(seed)
+    config = SchedulerConfig(
+        policy=policy,
+        link_rate_bps=5e9,
+        queues=(
+            QueueConfig(priority_tag=46, buffer_bytes=8_000, weight=1, quantum_bytes=700),
+            QueueConfig(priority_tag=10, buffer_bytes=20_000, weight=3, quantum_bytes=3_000),
+            QueueConfig(priority_tag=0, buffer_bytes=40_000, weight=2, quantum_bytes=1_500),
+        ),
+    )
+
+    transmit_order, delays = schedule_packets(batch, config)
+    expected_order, expected_delays = _reference_scheduler(batch, config)
+    stats = simulate_scheduler(batch, config)
+
+    np.testing.assert_array_equal(transmit_order, expected_order)
+    np.testing.assert_allclose(
+        delays[transmit_order], [expected_delays[row] for row in expected_order.tolist()]
+    )
+    assert sum(queue.dropped_packets for queue in stats.per_queue.values()) == (
+        stats.overall.dropped_packets
+    )
+
+
+@pytest.mark.parametrize("policy", list(SchedulerPolicy))
+def test_single_queue_matches_fifo(policy: SchedulerPolicy) -> None:
+    """Expectation: with one queue every policy is the drop-tail FIFO."""
+    config = replace(normal_traffic(), number_of_waves=5, control_priority_tag=0)
+    batch = generate_traffic_batch(config)
+
+    fifo = simulate_fifo(batch, FifoConfig(link_rate_bps=10e9, buffer_bytes=300_000))
+    scheduled = simulate_scheduler(
+        batch,
+        SchedulerConfig(
+            policy=policy,
+            link_rate_bps=10e9,
+            queues=(QueueConfig(priority_tag=0, buffer_bytes=300_000),),
+        ),
+    )
+
+    assert scheduled.overall.dropped_packets == fifo.dropped_packets
+    np.testing.assert_array_equal(
+        scheduled.overall.queue_delay_us_all.counts, fifo.queue_delay_us_all.counts
+    )
+
+
+def test_strict_priority_protects_control_traffic() -> None:
+    """Expectation: under incast, SP gives CONTROL lower delay than round robin does."""
+    batch = generate_traffic_batch(replace(normal_traffic(), number_of_waves=10))
+
+    strict = simulate_scheduler(batch, SchedulerConfig(SchedulerPolicy.STRICT_PRIORITY))
+    drr = simulate_scheduler(batch, SchedulerConfig(SchedulerPolicy.DEFICIT_ROUND_ROBIN))
+
+    assert strict.per_queue[46].dropped_packets == 0
+    assert strict.per_queue[46].queue_delay_us_all.quantile(0.99) < (
+        drr.per_queue[46].queue_delay_us_all.quantile(0.99)
+    )
+    assert strict.overall.queue_delay_us_control.count == (
+        strict.per_queue[46].transmitted_packets
+    )
+
+
+def test_unmapped_priority_tag_and_bad_queues_are_rejected() -> None:
+    """Expectation: every tag needs a queue, and queue parameters are checked."""
+    batch = generate_traffic_batch(replace(normal_traffic(), number_of_waves=1))
+    only_bulk = (QueueConfig(priority_tag=0, buffer_bytes=1_000),)
+
+    with pytest.raises(ValueError, match=r"No queue configured for priority_tag \[46\]"):
+        simulate_scheduler(batch, SchedulerConfig(queues=only_bulk))
+    with pytest.raises(ValueError, match="weight must be > 0"):
+        simulate_scheduler(
+            batch, SchedulerConfig(queues=(replace(only_bulk[0], weight=0),))
+        )
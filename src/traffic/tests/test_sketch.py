@@ -0,0 +1,88 @@
+"""Tests the fixed-memory delay quantile sketch and merging of simulation stats."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic_batch
+from traffic.sim.fifo import FifoConfig, simulate_fifo
+from traffic.sim.sketch import QuantileSketch
+from traffic.sim.stats import merge_sim_stats
+
+
+def _heavy_tailed_delays(seed: int, size: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.concatenate(
+        [rng.integers(0, 100, size // 2), (rng.pareto(1.1, size // 2) * 500).astype(np.int64)]
+    )
+
+
+@pytest.mark.parametrize("significant_bits", [4, 7, 10])
+def test_quantiles_are_within_the_relative_error_bound(significant_bits: int) -> None:
+    """Expectation: p50/p99/p99.9 stay within 2**-significant_bits of the exact quantile."""
+    values = _heavy_tailed_delays(0, 200_000)
+    sketch = QuantileSketch(significant_bits)
+    sketch.record(values)
+    qs = [0.0, 0.5, 0.99, 0.999, 1.0]
+
+    expected = np.percentile(values, np.array(qs) * 100, method="inverted_cdf")
+    error = np.abs(sketch.quantiles(qs) - expected) / np.maximum(expected, 1)
+
+    assert error.max() <= sketch.relative_error
+    assert sketch.quantile(0.0) == values.min() and sketch.quantile(1.0) == values.max()
+    assert sketch.count == values.shape[0] and sketch.mean == pytest.approx(values.mean())
+
+
+def test_merging_shards_equals_recording_everything_and_memory_is_fixed() -> None:
+    """Expectation: merged shard sketches equal one sketch of all values, at the same size."""
+    shards = [_heavy_tailed_delays(seed, 50_000) for seed in range(4)]
+    whole = QuantileSketch()
+    whole.record(np.concatenate(shards))
+    parts = []
+    for shard in shards:
+        part = QuantileSketch()
+        part.record(shard)
+        parts.append(part)
+
+    merged = QuantileSketch.merged(parts)
+
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    assert merged.percentiles() == whole.percentiles()
+    assert merged.counts.nbytes == parts[0].counts.nbytes == QuantileSketch().counts.nbytes
+
+
+def test_bad_input_is_rejected_and_empty_sketch_is_nan() -> None:
+    """Expectation: negative values and mismatched layouts raise; an empty sketch gives NaN."""
+    sketch = QuantileSketch()
+
+    assert np.isnan(sketch.quantile(0.5))
+    with pytest.raises(ValueError, match="values >= 0"):
+        sketch.record([3, -1])
+    with pytest.raises(ValueError, match="different significant_bits"):
+        sketch.merge(QuantileSketch(5))
+    with pytest.raises(ValueError, match=r"quantiles must lie in \[0, 1\]"):
+        sketch.quantiles([1.5])
+
+
+def test_sim_stats_of_independent_runs_merge() -> None:
+    """Expectation: merged per-run SimStats add totals and combine delay distributions."""
+    fifo = FifoConfig(link_rate_bps=10e9, buffer_bytes=200_000)
+    configs = [replace(normal_traffic(), number_of_waves=3, seed=seed) for seed in (1, 2)]
+    runs = [simulate_fifo(generate_traffic_batch(config), fifo) for config in configs]
+
+    merged = merge_sim_stats(runs)
+
+    assert merged.arrived_packets == sum(run.arrived_packets for run in runs)
+    assert merged.dropped_bytes == sum(run.dropped_bytes for run in runs)
+    assert merged.queue_delay_us_control.count == sum(
+        run.queue_delay_us_control.count for run in runs
+    )
+    assert merged.queue_delay_us_all.max == max(run.queue_delay_us_all.max for run in runs)
@@ -0,0 +1,85 @@
+"""Tests stage-level memoization of the columnar generation pipeline."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic_batch
+from traffic.stage_cache import StageCache
+
+
+def _assert_same_batch(actual, expected) -> None:
+    for name, column in expected.columns().items():
+        np.testing.assert_array_equal(actual.columns()[name], column)
+
+
+def test_cached_batches_match_uncached_generation() -> None:
+    """Expectation: memoized output is identical to a fresh generate_traffic_batch, hit or miss."""
+    cache = StageCache()
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+
+    for _ in range(2):
+        _assert_same_batch(
+            generate_traffic_batch(config, stage_cache=cache), generate_traffic_batch(config)
+        )
+    assert cache.stats["classify"].hits == 1
+
+
+def test_classifier_sweep_recomputes_only_classification() -> None:
+    """Expectation: varying class parameters reuses the cached schedule and packet columns."""
+    cache = StageCache()
+    base = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+    for control_packet_every_n in (5, 10, 20):
+        config = replace(base, control_packet_every_n=control_packet_every_n)
+        _assert_same_batch(
+            generate_traffic_batch(config, stage_cache=cache), generate_traffic_batch(config)
+        )
+
+    assert (cache.stats["wave_starts"].hits, cache.stats["wave_starts"].misses) == (0, 1)
+    assert (cache.stats["packetize"].hits, cache.stats["packetize"].misses) == (2, 1)
+    assert cache.stats["classify"].misses == 3
+
+
+def test_size_change_reuses_schedule_but_repacketizes() -> None:
+    """Expectation: a packet size tweak hits the wave schedule and misses packetization."""
+    cache = StageCache()
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+    generate_traffic_batch(config, stage_cache=cache)
+    generate_traffic_batch(replace(config, packet_size_bytes=500), stage_cache=cache)
+
+    assert cache.stats["wave_starts"].hits == 1
+    assert cache.stats["packetize"].misses == 2
+
+
+def test_cached_columns_are_read_only() -> None:
+    """Expectation: callers cannot corrupt shared cached arrays in place."""
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+    batch = generate_traffic_batch(config, stage_cache=StageCache())
+    with pytest.raises(ValueError, match="read-only"):
+        batch.packet_start_us[0] = -1
+
+
+def test_cache_stays_within_byte_budget() -> None:
+    """Expectation: least recently used entries are evicted to respect max_bytes."""
+    max_bytes = 20_000
+    cache = StageCache(max_bytes=max_bytes)
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+    for seed in range(5):
+        generate_traffic_batch(replace(config, seed=seed), stage_cache=cache)
+        assert cache.total_bytes <= max_bytes
+
+    # Five seeds produce ten schedule/packet entries plus one shared classification entry.
+    assert len(cache) < 11
+    generate_traffic_batch(replace(config, seed=0), stage_cache=cache)
+    assert cache.stats["packetize"].misses == 6
+
+    with pytest.raises(ValueError, match="max_bytes must be > 0"):
+        StageCache(max_bytes=0)
@@ -0,0 +1,54 @@
+"""Tests that lazy streaming generation reproduces the materialized event list."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from itertools import islice
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic, iter_traffic, iter_traffic_chunks
+
+
+def test_iter_traffic_matches_generate_traffic() -> None:
+    """Expectation: streaming yields exactly the same events in the same order."""
+    config = replace(normal_traffic(), number_of_waves=8, bytes_per_sender_per_wave=10_000)
+
+    assert list(iter_traffic(config)) == generate_traffic(config)
+
+
+def test_iter_traffic_matches_when_wave_jitter_windows_overlap() -> None:
+    """Expectation: ordering and control numbering hold when waves interleave in time."""
+    config = replace(
+        normal_traffic(),
+        number_of_waves=8,
+        bytes_per_sender_per_wave=10_000,
+        wave_interval_us=10,
+        max_start_offset_us=35,
+        control_packet_every_n=3,
+    )
+
+    assert list(iter_traffic(config)) == generate_traffic(config)
+
+
+def test_iter_traffic_chunks_preserve_sequence() -> None:
+    """Expectation: chunks have bounded size and concatenate back to the full sequence."""
+    config = replace(normal_traffic(), number_of_waves=8, bytes_per_sender_per_wave=10_000)
+
+    chunks = list(iter_traffic_chunks(config, chunk_size=1_000))
+
+    assert all(0 < len(chunk) <= 1_000 for chunk in chunks)
+    assert [event for chunk in chunks for event in chunk] == generate_traffic(config)
+
+
+def test_iter_traffic_is_lazy() -> None:
+    """Expectation: taking a prefix of a huge run does not materialize the whole trace."""
+    config = replace(normal_traffic(), number_of_waves=1_000_000)
+
+    first_events = list(islice(iter_traffic(config), 10))
+
+    assert len(first_events) == 10
+    assert first_events == generate_traffic(replace(config, number_of_waves=1))[:10]
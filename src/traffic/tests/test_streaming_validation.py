@@ -0,0 +1,80 @@
+"""Tests the incremental validator and validated streaming CSV export."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic, iter_traffic_chunks
+from traffic.io.csv_export import export_chunks_to_csv, generate_and_export_csv
+from traffic.validate import StreamingValidator, iter_validated
+
+
+def test_chunked_validation_accepts_generated_stream() -> None:
+    """Expectation: feeding iter_traffic_chunks chunk by chunk validates cleanly."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    validator = StreamingValidator(config)
+    for chunk in iter_traffic_chunks(config, chunk_size=7):
+        validator.update(chunk)
+    validator.finalize()
+
+    assert validator.total_count == len(generate_traffic(config))
+
+
+def test_ordering_is_enforced_across_chunk_boundaries() -> None:
+    """Expectation: each chunk is sorted, but a later chunk starting earlier is rejected."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    events = generate_traffic(config)
+    validator = StreamingValidator(config)
+    validator.update(events[len(events) // 2 :])
+
+    with pytest.raises(ValueError, match="not sorted by packet_start_us"):
+        validator.update(events[: len(events) // 2])
+
+
+def test_finalize_reports_coverage_and_ratio_failures() -> None:
+    """Expectation: a missing sender and a wrong control ratio surface only at finalize."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    events = [event for event in generate_traffic(config) if event.sender_id != 0]
+    validator = StreamingValidator(config)
+    validator.update(events)
+    with pytest.raises(ValueError, match="Sender coverage mismatch for wave 0"):
+        validator.finalize()
+
+    validator = StreamingValidator(replace(config, control_packet_every_n=2))
+    validator.update(generate_traffic(config))
+    with pytest.raises(ValueError, match="Control ratio out of bounds"):
+        validator.finalize()
+
+    with pytest.raises(ValueError, match="Generated traffic is empty"):
+        StreamingValidator(config).finalize()
+
+
+def test_streamed_export_matches_in_memory_export(tmp_path: Path) -> None:
+    """Expectation: stream=True writes the same bytes as the whole-batch export path."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    streamed = generate_and_export_csv(
+        config=config, output_dir=tmp_path / "streamed", stream=True, chunk_size=5
+    )
+    in_memory = generate_and_export_csv(config=config, output_dir=tmp_path / "in_memory")
+
+    assert streamed.read_bytes() == in_memory.read_bytes()
+
+
+def test_failed_streaming_validation_removes_partial_file(tmp_path: Path) -> None:
+    """Expectation: a trace that fails validation mid-export leaves no file behind."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    bad_config = replace(config, senders_per_wave=config.senders_per_wave + 1)
+    output_path = tmp_path / "bad.csv"
+
+    with pytest.raises(ValueError, match="Sender coverage mismatch"):
+        export_chunks_to_csv(
+            iter_validated(iter_traffic_chunks(config, chunk_size=5), bad_config), output_path
+        )
+    assert not output_path.exists()
@@ -0,0 +1,145 @@
+"""Tests sweep designs, the resumable results table and the process-pool sweep runner."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic import sweep
+from traffic.config import normal_traffic
+from traffic.io.trace_cache import TraceCache
+from traffic.sweep import (
+    METRIC_COLUMNS,
+    RESULTS_FILENAME,
+    Range,
+    grid_design,
+    random_design,
+    resolve_point,
+    run_sweep,
+)
+
+
+def _base():
+    return replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=20_000)
+
+
+def test_grid_and_random_designs() -> None:
+    """Expectation: grid is the full product; random draws are seeded and within bounds."""
+    grid = grid_design({"senders_per_wave": [8, 16], "buffer_bytes": [10_000, 50_000, 90_000]})
+    space = {"wave_interval_us": Range(1_000, 4_000), "seed": [1, 2, 3], "buffer_bytes": (1, 9)}
+    first = random_design(space, 20, seed=5)
+    second = random_design(space, 20, seed=5)
+
+    assert len(grid) == 6 and grid[0] == {"senders_per_wave": 8, "buffer_bytes": 10_000}
+    assert first == second
+    assert all(1_000 <= point["wave_interval_us"] <= 4_000 for point in first)
+    assert {point["seed"] for point in first} <= {1, 2, 3}
+    assert {point["buffer_bytes"] for point in first} == {1, 9}
+    with pytest.raises(ValueError, match="low must be <= high"):
+        Range(5, 1)
+
+
+def test_points_split_into_traffic_and_link_settings() -> None:
+    """Expectation: TrafficConfig and FifoConfig fields are routed; anything else is rejected."""
+    config, link = resolve_point(_base(), {"senders_per_wave": 4, "buffer_bytes": 1_234})
+
+    assert config.senders_per_wave == 4 and link.buffer_bytes == 1_234
+    with pytest.raises(ValueError, match="Unknown sweep parameter 'bogus'"):
+        resolve_point(_base(), {"bogus": 1})
+
+
+def test_sweep_writes_one_row_per_point_and_resumes(tmp_path: Path, monkeypatch) -> None:
+    """Expectation: a rerun finds every point in the table and runs nothing again."""
+    points = grid_design({"senders_per_wave": [4, 8], "buffer_bytes": [20_000, 80_000]})
+
+    rows = run_sweep(points, base=_base(), sweep_dir=tmp_path, trace_format="binary")
+
+    assert len(rows) == 4 and set(METRIC_COLUMNS) <= set(rows[0])
+    assert all(Path(row["trace_path"]).exists() for row in rows)
+    low, high = (
+        float(row["drop_ratio"])
+        for row in rows
+        if row["senders_per_wave"] == "8" and row["buffer_bytes"] in ("20000", "80000")
+    )
+    assert low >= high
+
+    def fail(*args, **kwargs):
+        raise AssertionError("finished point was run again")
+
+    monkeypatch.setattr(sweep, "run_point", fail)
+    assert len(run_sweep(points, base=_base(), sweep_dir=tmp_path, trace_format="binary")) == 4
+
+
+
+def test_points_sharing_traffic_generate_it_once(tmp_path: Path) -> None:
+    """Expectation: a sweep over link settings only generates and caches its traffic once."""
+    cache = TraceCache(tmp_path / "cache")
+    points = grid_design({"buffer_bytes": [20_000, 40_000, 80_000]})
+
+    rows = run_sweep(points, base=_base(), sweep_dir=tmp_path, cache=cache)
+
+    assert len(rows) == 3 and len({row["trace_path"] for row in rows}) == 1
+    assert (cache.stats.misses, cache.stats.hits) == (1, 2)
+    assert [path.suffix for path in cache.entries()] == [".trbin"]
+
+
+def test_entry_evicted_by_another_worker_is_regenerated(tmp_path: Path, monkeypatch) -> None:
+    """Expectation: a cache entry deleted before it is opened falls back to generating."""
+    config, link = resolve_point(_base(), {"buffer_bytes": 40_000})
+    expected = sweep.run_point(config, link, tmp_path / "plain", "none")
+
+    def evicted(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(sweep, "read_binary_trace", evicted)
+    metrics = sweep.run_point(config, link, tmp_path, "none", TraceCache(tmp_path / "cache"))
+
+    assert metrics["delay_p99_us"] == expected["delay_p99_us"]
+    assert metrics["packets"] == expected["packets"]
+
+def test_interrupted_row_is_discarded_and_rerun(tmp_path: Path) -> None:
+    """Expectation: a half-written last row is cut off and only that point runs again."""
+    points = grid_design({"senders_per_wave": [4, 8]})
+    run_sweep(points, base=_base(), sweep_dir=tmp_path, trace_format="none")
+    results_path = tmp_path / RESULTS_FILENAME
+    content = results_path.read_text()
+    results_path.write_text(content[: content.rstrip("\n").rfind("\n") + 1] + "deadbeef,8,12")
+
+    rows = run_sweep(points, base=_base(), sweep_dir=tmp_path, trace_format="none")
+
+    assert sorted(row["senders_per_wave"] for row in rows) == ["4", "8"]
+    assert len(results_path.read_text().splitlines()) == 3
+
+
+def test_resume_checks_the_header_of_the_results_table(tmp_path: Path) -> None:
+    """Expectation: a header-only table is resumed; a header for other parameters is refused."""
+    points = grid_design({"senders_per_wave": [4]})
+    results_path = tmp_path / RESULTS_FILENAME
+    results_path.write_text(",".join(["point_id", "senders_per_wave", *METRIC_COLUMNS]) + "\n")
+
+    rows = run_sweep(points, base=_base(), sweep_dir=tmp_path, trace_format="none")
+
+    assert len(rows) == 1 and len(results_path.read_text().splitlines()) == 2
+    results_path.write_text(",".join(["point_id", "seed", *METRIC_COLUMNS]) + "\n")
+    with pytest.raises(ValueError, match="this sweep needs"):
+        run_sweep(points, base=_base(), sweep_dir=tmp_path, trace_format="none")
+
+
+def test_process_pool_sweep_matches_sequential(tmp_path: Path) -> None:
+    """Expectation: jobs > 1 gives the same metrics as running points in-process."""
+    points = grid_design({"buffer_bytes": [30_000, 60_000, 120_000]})
+
+    sequential = run_sweep(points, base=_base(), sweep_dir=tmp_path / "seq", trace_format="none")
+    pooled = run_sweep(
+        points, base=_base(), sweep_dir=tmp_path / "pool", jobs=2, trace_format="none"
+    )
+
+    def by_id(rows):
+        return {row["point_id"]: (row["drop_ratio"], row["delay_p99_us"]) for row in rows}
+
+    assert by_id(pooled) == by_id(sequential)
@@ -0,0 +1,110 @@
+"""Tests the content-addressed trace cache and collision-free trace naming."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.config import ScenarioName, normal_traffic
+from traffic.io import trace_cache
+from traffic.io.binary_trace import generate_and_export_binary
+from traffic.io.csv_export import build_trace_path, generate_and_export_csv
+from traffic.io.trace_cache import TraceCache, trace_cache_key
+
+
+def test_second_request_is_a_hit_and_skips_regeneration(tmp_path: Path) -> None:
+    """Expectation: the same config is generated once and then served from disk."""
+    cache = TraceCache(tmp_path)
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+
+    first = cache.get_or_create(config)
+    second = cache.get_or_create(config)
+
+    assert (first.hit, second.hit) == (False, True)
+    assert first.path == second.path and second.path.exists()
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+def test_configs_differing_only_in_packetization_do_not_collide(tmp_path: Path) -> None:
+    """Expectation: packet_size_bytes / control_packet_every_n changes give distinct traces."""
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+    variants = [
+        config,
+        replace(config, packet_size_bytes=1_000),
+        replace(config, control_packet_every_n=7),
+    ]
+
+    cache_paths = {TraceCache(tmp_path).path_for(variant) for variant in variants}
+    named_paths = {
+        build_trace_path(
+            config=variant, scenario_name=ScenarioName.NORMAL_TRAFFIC, output_dir=tmp_path
+        )
+        for variant in variants
+    }
+
+    assert len(cache_paths) == len(variants)
+    assert len(named_paths) == len(variants)
+
+
+def test_generator_version_is_part_of_the_key(monkeypatch) -> None:
+    """Expectation: bumping GENERATOR_VERSION invalidates every cached trace."""
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+    before = trace_cache_key(config)
+
+    monkeypatch.setattr(trace_cache, "GENERATOR_VERSION", "next")
+
+    assert trace_cache_key(config) != before
+
+
+def test_least_recently_used_trace_is_evicted_first(tmp_path: Path) -> None:
+    """Expectation: once over budget, the entry not touched longest is removed."""
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+    configs = [replace(config, seed=seed) for seed in (1, 2, 3)]
+    probe = TraceCache(tmp_path / "probe").get_or_create(configs[0]).path
+    cache = TraceCache(tmp_path / "cache", max_bytes=int(probe.stat().st_size * 2.5))
+
+    first = cache.get_or_create(configs[0]).path
+    second = cache.get_or_create(configs[1]).path
+    os.utime(first, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(second, ns=(2_000_000_000, 2_000_000_000))
+    cache.get_or_create(configs[0])
+    third = cache.get_or_create(configs[2]).path
+
+    assert first.exists() and third.exists()
+    assert not second.exists()
+    assert cache.stats.evictions == 1
+
+
+def test_binary_format_is_cached_separately(tmp_path: Path) -> None:
+    """Expectation: CSV and binary traces of one config are distinct cache entries."""
+    cache = TraceCache(tmp_path)
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+
+    csv_entry = cache.get_or_create(config)
+    binary_entry = cache.get_or_create(config, trace_format="binary")
+
+    assert csv_entry.path != binary_entry.path
+    assert binary_entry.path.suffix == ".trbin" and not binary_entry.hit
+
+
+def test_exports_are_copied_out_of_the_cache(tmp_path: Path) -> None:
+    """Expectation: a repeated export is a cache hit with the same bytes as an uncached one."""
+    cache = TraceCache(tmp_path / "cache")
+    config = replace(normal_traffic(), number_of_waves=3, bytes_per_sender_per_wave=6_000)
+
+    for export in (generate_and_export_csv, generate_and_export_binary):
+        uncached = export(config=config, output_dir=tmp_path / "uncached")
+        first = export(config=config, output_dir=tmp_path / "first", cache=cache)
+        second = export(config=config, output_dir=tmp_path / "second", cache=cache)
+        assert first.read_bytes() == second.read_bytes() == uncached.read_bytes()
+
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+    with pytest.raises(ValueError, match="stream=True"):
+        generate_and_export_csv(config=config, output_dir=tmp_path, stream=True, cache=cache)
@@ -0,0 +1,129 @@
+"""Tests the vectorized validation suite on list and columnar inputs."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from traffic.columnar import TrafficBatch, wave_start_columns
+from traffic.config import normal_traffic
+from traffic.generator import generate_traffic, generate_waves, wave_schedule_kwargs
+from traffic.validate import (
+    validate_generated_traffic,
+    validate_packet_sample,
+    validate_schedule,
+)
+
+
+def _assert_both_forms_raise(events, config, message: str) -> None:
+    for form in (events, TrafficBatch.from_events(events)):
+        with pytest.raises(ValueError) as excinfo:
+            validate_generated_traffic(form, config)
+        assert str(excinfo.value) == message
+
+
+def test_generated_traffic_passes_in_both_forms() -> None:
+    """Expectation: a fresh event list and its batch both validate cleanly."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    events = generate_traffic(config)
+
+    validate_generated_traffic(events, config)
+    validate_generated_traffic(TrafficBatch.from_events(events), config)
+
+
+def test_missing_and_extra_waves_report_exact_ids() -> None:
+    """Expectation: dropping wave 1 and adding wave 9 yields the original wave mismatch text."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    events = [event for event in generate_traffic(config) if event.wave_id != 1]
+    events.append(replace(events[-1], wave_id=9))
+
+    _assert_both_forms_raise(events, config, "Wave mismatch. missing_waves=[1], extra_waves=[9]")
+
+
+def test_first_failing_wave_lists_missing_and_extra_senders() -> None:
+    """Expectation: the lowest failing wave is reported with its missing and extra senders."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    events = [
+        event
+        for event in generate_traffic(config)
+        if not (event.wave_id == 2 and event.sender_id == 3)
+    ]
+    events.append(replace(events[-1], wave_id=2, sender_id=config.senders_per_wave + 5))
+    events.append(replace(events[-1], wave_id=3, sender_id=config.senders_per_wave + 1))
+
+    _assert_both_forms_raise(
+        events,
+        config,
+        "Sender coverage mismatch for wave 2. "
+        f"missing_senders=[3], extra_senders=[{config.senders_per_wave + 5}]",
+    )
+
+
+def test_ordering_is_checked_before_coverage_and_ratio() -> None:
+    """Expectation: an unsorted list with a bad control ratio reports the ordering error."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    events = list(reversed(generate_traffic(config)))
+    config = replace(config, control_packet_every_n=2)
+
+    _assert_both_forms_raise(events, config, "Traffic events are not sorted by packet_start_us.")
+    _assert_both_forms_raise([], config, "Generated traffic is empty.")
+
+
+def test_schedule_validation_agrees_with_full_scan() -> None:
+    """Expectation: generated traces pass the full scan and both schedule-mode forms alike."""
+    for control_packet_every_n, bytes_per_sender_per_wave in ((10, 6_000), (7, 6_500), (3, 1)):
+        config = replace(
+            normal_traffic(),
+            number_of_waves=4,
+            control_packet_every_n=control_packet_every_n,
+            bytes_per_sender_per_wave=bytes_per_sender_per_wave,
+        )
+        schedule = generate_waves(config, range(config.number_of_waves))
+        events = generate_traffic(config)
+
+        validate_generated_traffic(events, config, tolerance=0.5)
+        validate_generated_traffic(events, config, mode="schedule")
+        validate_schedule(schedule, config)
+        validate_schedule(wave_start_columns(**wave_schedule_kwargs(config)), config)
+        validate_packet_sample(events, config, schedule, sample_size=len(events))
+
+
+def test_packet_sample_catches_per_packet_corruption() -> None:
+    """Expectation: a wrong tag, size or row count fails the sampled per-packet check."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_500)
+    schedule = generate_waves(config, range(config.number_of_waves))
+    events = generate_traffic(config)
+    last = len(events) - 1
+
+    retagged = events[:-1] + [replace(events[-1], priority_tag=config.control_priority_tag + 1)]
+    with pytest.raises(ValueError, match=f"Packet {last} priority_tag mismatch"):
+        validate_generated_traffic(retagged, config, mode="schedule")
+
+    resized = [replace(events[0], packet_size_bytes=1)] + events[1:]
+    with pytest.raises(ValueError, match="Packet 0 packet_size_bytes mismatch"):
+        validate_packet_sample(TrafficBatch.from_events(resized), config, schedule)
+
+    with pytest.raises(ValueError, match="Packet count mismatch. expected="):
+        validate_packet_sample(events[:-1], config, schedule)
+    with pytest.raises(ValueError, match="sample_size must be >= 0"):
+        validate_packet_sample(events, config, schedule, sample_size=-1)
+    with pytest.raises(ValueError, match="Unknown validation mode 'sampled'"):
+        validate_generated_traffic(events, config, mode="sampled")
+
+
+def test_schedule_validation_reports_duplicate_starts_per_wave() -> None:
+    """Expectation: a sender scheduled twice in a wave fails the per-wave packet count."""
+    config = replace(normal_traffic(), number_of_waves=4, bytes_per_sender_per_wave=6_000)
+    schedule = generate_waves(config, range(config.number_of_waves))
+    duplicate = next(start for start in schedule if start.wave_id == 1)
+    schedule = sorted(schedule + [duplicate], key=lambda start: start.sender_start_us)
+
+    with pytest.raises(ValueError, match="Packet count mismatch for wave 1"):
+        validate_schedule(schedule, config)
+    with pytest.raises(ValueError, match="Generated traffic is empty"):
+        validate_schedule(schedule, replace(config, bytes_per_sender_per_wave=0))
@@ -2,68 +2,167 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+from typing import Iterable, Iterator, Sequence, Tuple, Union
 
+import numpy as np
+
+from .columnar import (
+    BULK_CODE,
+    CONTROL_CODE,
+    TrafficBatch,
+    TrafficLike,
+    as_batch,
+    wave_start_columns,
+)
 from .config import TrafficConfig
-from .models.classifier import TrafficClass
-from .schema import TrafficEvents
+from .generator import wave_schedule_kwargs
+from .models.classifier import ClassifiedPacketBurst, TrafficClass
+from .models.incast_wave import WaveStart
+
+
+# (wave_id, sender_id, sender_start_us), as returned by columnar.wave_start_columns.
+ScheduleColumns = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+# full scans every packet; schedule checks the schedule in closed form plus a packet sample.
+VALIDATION_MODES = ("full", "schedule")
+DEFAULT_PACKET_SAMPLE_SIZE = 1_024
 
 
-def validate_non_empty(events: TrafficEvents) -> None:
+def validate_non_empty(events: TrafficLike) -> None:
     """Ensure generation produced at least one traffic event."""
-    if not events:
+    if len(events) == 0:
         raise ValueError("Generated traffic is empty.")
 
 
-def validate_timestamp_order(events: TrafficEvents) -> None:
+def _start_column(events: TrafficLike) -> np.ndarray:
+    if isinstance(events, TrafficBatch):
+        return events.packet_start_us
+    return np.fromiter(
+        (event.packet_start_us for event in events), dtype=np.int64, count=len(events)
+    )
+
+
+def _check_timestamp_order(packet_start_us: np.ndarray) -> None:
+    if np.any(packet_start_us[1:] < packet_start_us[:-1]):
+        raise ValueError("Traffic events are not sorted by packet_start_us.")
+
+
+def validate_timestamp_order(events: TrafficLike) -> None:
     """Ensure events are sorted by non-decreasing packet start time."""
-    previous_ts = events[0].packet_start_us
-    for event in events[1:]:
-        if event.packet_start_us < previous_ts:
-            raise ValueError("Traffic events are not sorted by packet_start_us.")
-        previous_ts = event.packet_start_us
+    _check_timestamp_order(_start_column(events))
 
 
-def validate_wave_sender_coverage(events: TrafficEvents, config: TrafficConfig) -> None:
-    """Ensure each wave includes all expected sender IDs exactly once or more."""
-    senders_by_wave: dict[int, set[int]] = defaultdict(set)
-    for event in events:
-        senders_by_wave[event.wave_id].add(event.sender_id)
+def _raise_for_coverage(
+    *,
+    present_waves: np.ndarray,
+    extra_waves: list[int],
+    covered: np.ndarray,
+    extra_senders_by_wave: dict[int, set[int]],
+) -> None:
+    """
+    Report the first coverage failure from per-slot state.
 
-    expected_senders = set(range(config.senders_per_wave))
-    expected_waves = set(range(config.number_of_waves))
+    present_waves is (number_of_waves,) and covered is (number_of_waves, senders_per_wave);
+    ids outside those ranges are carried as extras. The first failing wave in wave order is
+    the one described.
+    """
+    if not present_waves.all() or extra_waves:
+        missing_waves = np.flatnonzero(~present_waves).tolist()
+        raise ValueError(
+            f"Wave mismatch. missing_waves={missing_waves}, extra_waves={sorted(extra_waves)}"
+        )
 
-    actual_waves = set(senders_by_wave)
-    if actual_waves != expected_waves:
-        missing_waves = sorted(expected_waves - actual_waves)
-        extra_waves = sorted(actual_waves - expected_waves)
+    failing_waves = ~covered.all(axis=1)
+    failing_waves[list(extra_senders_by_wave)] = True
+    if failing_waves.any():
+        wave_id = int(np.argmax(failing_waves))
+        missing_senders = np.flatnonzero(~covered[wave_id]).tolist()
+        extra_senders = sorted(extra_senders_by_wave.get(wave_id, ()))
         raise ValueError(
-            f"Wave mismatch. missing_waves={missing_waves}, extra_waves={extra_waves}"
+            f"Sender coverage mismatch for wave {wave_id}. "
+            f"missing_senders={missing_senders}, extra_senders={extra_senders}"
         )
 
-    for wave_id in sorted(expected_waves):
-        actual_senders = senders_by_wave[wave_id]
-        if actual_senders != expected_senders:
-            missing_senders = sorted(expected_senders - actual_senders)
-            extra_senders = sorted(actual_senders - expected_senders)
-            raise ValueError(
-                f"Sender coverage mismatch for wave {wave_id}. "
-                f"missing_senders={missing_senders}, extra_senders={extra_senders}"
-            )
+
+def _mark_coverage(
+    wave_ids: np.ndarray,
+    sender_ids: np.ndarray,
+    *,
+    present_waves: np.ndarray,
+    extra_waves: set[int],
+    covered: np.ndarray,
+    extra_senders_by_wave: dict[int, set[int]],
+) -> None:
+    """Fold a chunk of (wave_id, sender_id) pairs into coverage state with bincount."""
+    number_of_waves, senders_per_wave = covered.shape
+    wave_ids = wave_ids.astype(np.int64, copy=False)
+    sender_ids = sender_ids.astype(np.int64, copy=False)
+
+    in_waves = wave_ids < number_of_waves
+    present_waves |= np.bincount(wave_ids[in_waves], minlength=number_of_waves) > 0
+    extra_waves.update(np.unique(wave_ids[~in_waves]).tolist())
+
+    in_slots = in_waves & (sender_ids < senders_per_wave)
+    covered |= (
+        np.bincount(
+            wave_ids[in_slots] * senders_per_wave + sender_ids[in_slots],
+            minlength=number_of_waves * senders_per_wave,
+        ).reshape(number_of_waves, senders_per_wave)
+        > 0
+    )
+
+    extra_slots = in_waves & ~in_slots
+    for wave_id, sender_id in zip(wave_ids[extra_slots].tolist(), sender_ids[extra_slots].tolist()):
+        extra_senders_by_wave.setdefault(wave_id, set()).add(sender_id)
+
+
+def _empty_coverage(config: TrafficConfig) -> dict:
+    return dict(
+        present_waves=np.zeros(config.number_of_waves, dtype=bool),
+        extra_waves=set(),
+        covered=np.zeros((config.number_of_waves, config.senders_per_wave), dtype=bool),
+        extra_senders_by_wave={},
+    )
+
+
+def _check_sender_coverage(
+    wave_ids: np.ndarray, sender_ids: np.ndarray, config: TrafficConfig
+) -> None:
+    coverage = _empty_coverage(config)
+    _mark_coverage(wave_ids, sender_ids, **coverage)
+    _raise_for_coverage(**coverage)
+
+
+def validate_wave_sender_coverage(events: TrafficLike, config: TrafficConfig) -> None:
+    """Ensure each wave includes all expected sender IDs exactly once or more."""
+    batch = as_batch(events)
+    _check_sender_coverage(batch.wave_id, batch.sender_id, config)
+
+
+def _check_tolerance(tolerance: float) -> None:
+    if tolerance < 0:
+        raise ValueError("tolerance must be >= 0")
 
 
 def validate_control_ratio(
-    events: TrafficEvents, config: TrafficConfig, tolerance: float = 0.01
+    events: TrafficLike, config: TrafficConfig, tolerance: float = 0.01
 ) -> None:
     """
     Out of all generated packets, some are marked CONTROL (high priority) and the rest are BULK.
     This check verifies that the share of CONTROL packets is what you configured.
     """
-    if tolerance < 0:
-        raise ValueError("tolerance must be >= 0")
+    _check_tolerance(tolerance)
+
+    if isinstance(events, TrafficBatch):
+        control_count = int(np.count_nonzero(events.is_control()))
+    else:
+        control_count = sum(1 for event in events if event.traffic_class == TrafficClass.CONTROL)
+    _check_control_ratio(control_count, len(events), config, tolerance)
 
-    control_count = sum(1 for event in events if event.traffic_class == TrafficClass.CONTROL)
-    total_count = len(events)
+
+def _check_control_ratio(
+    control_count: int, total_count: int, config: TrafficConfig, tolerance: float
+) -> None:
     actual_ratio = control_count / total_count
     expected_ratio = 1.0 / config.control_packet_every_n
 
@@ -74,9 +173,231 @@ def validate_control_ratio(
         )
 
 
-def validate_generated_traffic(events: TrafficEvents, config: TrafficConfig) -> None:
-    """Run the default validation suite and raise on first failed check."""
-    validate_non_empty(events)
-    validate_timestamp_order(events)
-    validate_wave_sender_coverage(events, config)
-    validate_control_ratio(events, config)
+def validate_generated_traffic(
+    events: TrafficLike, config: TrafficConfig, tolerance: float = 0.01, *, mode: str = "full"
+) -> None:
+    """
+    Run the default validation suite and raise on first failed check.
+
+    A list is converted to columns once; every check is then an array reduction over the
+    same batch, in the same order and with the same messages as the individual validators.
+
+    mode="schedule" instead runs validate_schedule on the config's wave schedule and
+    validate_packet_sample on the events, so the cost scales with senders x waves rather than
+    packet count. Sampled rows must follow the classification rule exactly, so tolerance only
+    applies in full mode.
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(
+            f"Unknown validation mode '{mode}'. Choose one of: {', '.join(VALIDATION_MODES)}"
+        )
+    _check_tolerance(tolerance)
+    if mode == "schedule":
+        schedule = wave_start_columns(**wave_schedule_kwargs(config))
+        validate_schedule(schedule, config)
+        validate_packet_sample(events, config, schedule)
+        return
+    batch = as_batch(events)
+    validate_non_empty(batch)
+    _check_timestamp_order(batch.packet_start_us)
+    _check_sender_coverage(batch.wave_id, batch.sender_id, config)
+    _check_control_ratio(int(np.count_nonzero(batch.is_control())), len(batch), config, tolerance)
+
+
+class StreamingValidator:
+    """
+    Incremental form of validate_generated_traffic for traffic that arrives in chunks.
+
+    State is O(number_of_waves x senders_per_wave) regardless of trace length. Ordering is
+    enforced across chunk boundaries as chunks arrive; coverage and control ratio are checked
+    by finalize(). Messages match the batch validators.
+    """
+
+    def __init__(self, config: TrafficConfig, tolerance: float = 0.01) -> None:
+        _check_tolerance(tolerance)
+        self.config = config
+        self.tolerance = tolerance
+        self.total_count = 0
+        self.control_count = 0
+        self._last_start_us: int | None = None
+        self._coverage = _empty_coverage(config)
+
+    def update(self, chunk: TrafficLike) -> None:
+        batch = as_batch(chunk)
+        if len(batch) == 0:
+            return
+
+        packet_start_us = batch.packet_start_us
+        if self._last_start_us is not None and int(packet_start_us[0]) < self._last_start_us:
+            raise ValueError("Traffic events are not sorted by packet_start_us.")
+        _check_timestamp_order(packet_start_us)
+        self._last_start_us = int(packet_start_us[-1])
+
+        _mark_coverage(batch.wave_id, batch.sender_id, **self._coverage)
+        self.total_count += len(batch)
+        self.control_count += int(np.count_nonzero(batch.is_control()))
+
+    def finalize(self) -> None:
+        if self.total_count == 0:
+            raise ValueError("Generated traffic is empty.")
+        _raise_for_coverage(**self._coverage)
+        _check_control_ratio(self.control_count, self.total_count, self.config, self.tolerance)
+
+
+def iter_validated(
+    chunks: Iterable[TrafficLike], config: TrafficConfig, tolerance: float = 0.01
+) -> Iterator[TrafficLike]:
+    """Pass chunks through unchanged while validating them; finalizes after the last one."""
+    validator = StreamingValidator(config, tolerance)
+    for chunk in chunks:
+        validator.update(chunk)
+        yield chunk
+    validator.finalize()
+
+
+def validate_bursts(
+    classified_bursts: list[ClassifiedPacketBurst], config: TrafficConfig, tolerance: float = 0.01
+) -> None:
+    """
+    Run the default validation suite on run-length bursts without expanding them.
+
+    Every packet in a burst shares its start time, wave and sender, so ordering and coverage
+    checks need one look per burst; CONTROL counts are carried on the classified burst.
+    """
+    _check_tolerance(tolerance)
+    bursts = [classified_burst.burst for classified_burst in classified_bursts]
+    total_count = sum(burst.packet_count for burst in bursts)
+    if total_count == 0:
+        raise ValueError("Generated traffic is empty.")
+
+    _check_timestamp_order(
+        np.fromiter((burst.packet_start_us for burst in bursts), dtype=np.int64, count=len(bursts))
+    )
+
+    non_empty = [burst for burst in bursts if burst.packet_count > 0]
+    _check_sender_coverage(
+        np.fromiter((burst.wave_id for burst in non_empty), dtype=np.int64, count=len(non_empty)),
+        np.fromiter(
+            (burst.sender_id for burst in non_empty), dtype=np.int64, count=len(non_empty)
+        ),
+        config,
+    )
+
+    control_count = sum(
+        classified_burst.control_packet_count for classified_burst in classified_bursts
+    )
+    _check_control_ratio(control_count, total_count, config, tolerance)
+
+
+def _schedule_columns(wave_starts: Union[Sequence[WaveStart], ScheduleColumns]) -> ScheduleColumns:
+    if isinstance(wave_starts, tuple):
+        return wave_starts
+    count = len(wave_starts)
+    return (
+        np.fromiter((start.wave_id for start in wave_starts), dtype=np.int64, count=count),
+        np.fromiter((start.sender_id for start in wave_starts), dtype=np.int64, count=count),
+        np.fromiter((start.sender_start_us for start in wave_starts), dtype=np.int64, count=count),
+    )
+
+
+def validate_schedule(
+    wave_starts: Union[Sequence[WaveStart], ScheduleColumns], config: TrafficConfig
+) -> None:
+    """
+    Validate the traffic a schedule will produce without packetizing it.
+
+    Every sender start expands to the same packets_per_sender packets at that start time, so
+    ordering, coverage and per-wave packet counts follow from the wave starts and TrafficConfig
+    in closed form. Cost is O(number_of_waves x senders_per_wave). Accepts a WaveStart list or
+    the column tuple from wave_start_columns. What only the packets can show (sizes, classes,
+    tags) is left to validate_packet_sample.
+    """
+    wave_ids, sender_ids, sender_start_us = _schedule_columns(wave_starts)
+
+    packets_per_sender = _packets_per_sender(config)
+    if int(wave_ids.shape[0]) * packets_per_sender == 0:
+        raise ValueError("Generated traffic is empty.")
+
+    _check_timestamp_order(sender_start_us)
+    _check_sender_coverage(wave_ids, sender_ids, config)
+
+    expected_wave_packets = config.senders_per_wave * packets_per_sender
+    wave_packets = (
+        np.bincount(wave_ids.astype(np.int64, copy=False), minlength=config.number_of_waves)
+        * packets_per_sender
+    )
+    mismatched_waves = np.flatnonzero(wave_packets != expected_wave_packets)
+    if mismatched_waves.size:
+        wave_id = int(mismatched_waves[0])
+        raise ValueError(
+            f"Packet count mismatch for wave {wave_id}. "
+            f"expected={expected_wave_packets}, actual={int(wave_packets[wave_id])}"
+        )
+
+
+def _packets_per_sender(config: TrafficConfig) -> int:
+    full_packets, remainder = divmod(config.bytes_per_sender_per_wave, config.packet_size_bytes)
+    return full_packets + (1 if remainder > 0 else 0)
+
+
+def validate_packet_sample(
+    events: TrafficLike,
+    config: TrafficConfig,
+    wave_starts: Union[Sequence[WaveStart], ScheduleColumns],
+    *,
+    sample_size: int = DEFAULT_PACKET_SAMPLE_SIZE,
+    seed: int = 0,
+) -> None:
+    """
+    Check sampled packets against the schedule they were generated from.
+
+    Traces list packets_per_sender rows per wave start, in schedule order, so row i belongs to
+    start i // packets_per_sender and has global packet index i. For the first and last rows
+    and sample_size random ones, wave, sender, start time, per-sender index, size, class and
+    priority tag must equal what that position implies, and the row must not start before the
+    previous one. The trace length must match the schedule exactly.
+    """
+    if sample_size < 0:
+        raise ValueError("sample_size must be >= 0")
+    batch = as_batch(events)
+    wave_ids, sender_ids, sender_start_us = _schedule_columns(wave_starts)
+    packets_per_sender = _packets_per_sender(config)
+    expected_count = int(wave_ids.shape[0]) * packets_per_sender
+    if len(batch) != expected_count:
+        raise ValueError(
+            f"Packet count mismatch. expected={expected_count}, actual={len(batch)}"
+        )
+    if expected_count == 0:
+        raise ValueError("Generated traffic is empty.")
+
+    rows = np.random.default_rng(seed).integers(0, expected_count, size=sample_size)
+    rows = np.unique(np.concatenate([rows, [0, expected_count - 1]]))
+    starts, packet_index = np.divmod(rows, packets_per_sender)
+    full_packets, remainder = divmod(config.bytes_per_sender_per_wave, config.packet_size_bytes)
+    is_control = rows % config.control_packet_every_n == 0
+    expected = {
+        "wave_id": wave_ids[starts],
+        "sender_id": sender_ids[starts],
+        "packet_start_us": sender_start_us[starts],
+        "packet_index_for_sender": packet_index,
+        "packet_size_bytes": np.where(
+            packet_index < full_packets, config.packet_size_bytes, remainder
+        ),
+        "traffic_class": np.where(is_control, CONTROL_CODE, BULK_CODE),
+        "priority_tag": np.where(
+            is_control, config.control_priority_tag, config.bulk_priority_tag
+        ),
+    }
+    for name, expected_values in expected.items():
+        actual_values = getattr(batch, name)[rows]
+        mismatched = np.flatnonzero(actual_values != expected_values)
+        if mismatched.size:
+            position = int(mismatched[0])
+            raise ValueError(
+                f"Packet {int(rows[position])} {name} mismatch. "
+                f"expected={expected_values[position]}, actual={actual_values[position]}"
+            )
+
+    previous = rows[rows > 0]
+    if np.any(batch.packet_start_us[previous] < batch.packet_start_us[previous - 1]):
+        raise ValueError("Traffic events are not sorted by packet_start_us.")